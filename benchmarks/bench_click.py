@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""End-to-end latency of the click sequence per input backend
+
+The recording backend always runs. Real backends (xtest, pyautogui) need
+a display and WILL move the pointer; pick them explicitly with -b.
+
+    python3 benchmarks/bench_click.py
+    python3 benchmarks/bench_click.py -b recording xtest pyautogui -n 5
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import argparse
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clicker.input_backend import (ClickTimings, PyAutoGUIBackend, RecordingBackend,  # noqa: E402
+                                   XTestBackend, perform_click)
+
+FACTORIES = {
+    'recording': RecordingBackend,
+    'xtest': XTestBackend,
+    'pyautogui': PyAutoGUIBackend,
+}
+
+
+def bench_backend(backend, timings, repeat, target):
+    samples = []
+    for _ in range(repeat):
+        samples.append(perform_click(backend, target[0], target[1], timings) * 1000)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-b', '--backends', nargs='+', default=['recording'],
+                        choices=sorted(FACTORIES))
+    parser.add_argument('-n', '--repeat', type=int, default=3)
+    parser.add_argument('--move-settle', type=float, default=0.3)
+    parser.add_argument('--click-settle', type=float, default=0.5)
+    parser.add_argument('--enter-settle', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    timings = ClickTimings(args.move_settle, args.click_settle, args.enter_settle)
+    print(f"{timings!r}, sleeps alone: {timings.total() * 1000:.0f} ms")
+    print(f"{'backend':<12}{'min ms':>10}{'median ms':>12}{'max ms':>10}{'overhead ms':>14}")
+    for name in args.backends:
+        try:
+            backend = FACTORIES[name]()
+        except Exception as e:
+            print(f"{name:<12}unavailable: {e}")
+            continue
+        try:
+            width, height = backend.size()
+            samples = bench_backend(backend, timings, args.repeat,
+                                    (width // 2, height // 2))
+        finally:
+            backend.close()
+        median = statistics.median(samples)
+        print(f"{name:<12}{min(samples):>10.1f}{median:>12.1f}{max(samples):>10.1f}"
+              f"{median - timings.total() * 1000:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Import-time budget check based on `python -X importtime`
+
+Runs each import in a fresh interpreter (from an empty temporary
+directory, so any file written at import time would be noticed), reports
+the cumulative import time and exits with status 1 when a module is over
+its budget or pulls in a heavy GUI dependency.
+
+    python3 benchmarks/bench_import.py
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cumulative import time budgets in milliseconds
+BUDGETS_MS = {
+    'clicker': 15.0,
+    'clicker.app': 150.0,
+}
+
+# Must only be imported once a real backend is chosen
+HEAVY_MODULES = ('pyautogui', 'pynput', 'tkinter', 'Xlib', 'numpy')
+
+
+def measure(module):
+    """Return (cumulative ms, heavy modules imported, files created)"""
+    code = (f"import sys, {module}\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE='1')
+    with tempfile.TemporaryDirectory() as cwd:
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                cwd=cwd, env=env, capture_output=True, text=True,
+                                check=True)
+        created = os.listdir(cwd)
+    cumulative = None
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative = int(fields[1]) / 1000.0
+    heavy = [m for m in result.stdout.strip().split(',') if m]
+    return cumulative, heavy, created
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+                        help='Runs per module; the median is compared to the budget')
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'module':<16}{'median ms':>12}{'budget ms':>12}  status")
+    for module, budget in BUDGETS_MS.items():
+        samples = []
+        problems = set()
+        for _ in range(args.repeat):
+            cumulative, heavy, created = measure(module)
+            samples.append(cumulative)
+            problems.update(f"imports {m}" for m in heavy)
+            problems.update(f"creates {f}" for f in created)
+        median = statistics.median(samples)
+        if median > budget:
+            problems.add("over budget")
+        failed = failed or bool(problems)
+        status = ', '.join(sorted(problems)) or 'ok'
+        print(f"{module:<16}{median:>12.1f}{budget:>12.1f}  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
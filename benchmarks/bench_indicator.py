@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Startup time and memory of the indicator process per renderer
+
+Starts indicator.py with each renderer, times it from spawn until the
+window is mapped (the process prints `ready`), reads VmRSS from /proc and
+asks it to quit. Needs a display (DISPLAY, e.g. Xvfb). Exits with status 1
+when the Shape overlay is over its budget.
+
+    python3 benchmarks/bench_indicator.py
+    xvfb-run python3 benchmarks/bench_indicator.py -n 10
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SCRIPT = os.path.join(ROOT, 'clicker', 'indicator.py')
+
+# Budgets of the Shape overlay: median startup and resident memory
+STARTUP_BUDGET_MS = 50.0
+RSS_BUDGET_MB = 20.0
+
+
+def rss_mb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def measure(renderer):
+    """Return (startup ms, RSS MB) of one indicator process"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, SCRIPT, '100', '100', '--renderer', renderer],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE)
+    try:
+        line = process.stdout.readline()
+        startup = (time.perf_counter() - start) * 1000
+        if line.strip() != b'ready':
+            process.wait(timeout=5)
+            error = process.stderr.read().decode().strip() or 'exited'
+            raise RuntimeError(error.splitlines()[-1])
+        rss = rss_mb(process.pid)
+        process.stdin.write(b'quit\n')
+        process.stdin.flush()
+        process.wait(timeout=5)
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    return startup, rss
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-r', '--renderers', nargs='+', default=['shape', 'tk'],
+                        choices=['shape', 'tk'])
+    parser.add_argument('-n', '--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if not os.environ.get('DISPLAY'):
+        print("No DISPLAY; run under Xvfb, e.g. xvfb-run python3 benchmarks/bench_indicator.py")
+        return 0
+    failed = False
+    print(f"{'renderer':<10}{'startup ms':>12}{'RSS MB':>10}  status")
+    for renderer in args.renderers:
+        try:
+            samples = [measure(renderer) for _ in range(args.repeat)]
+        except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"{renderer:<10}unavailable: {e}")
+            failed = failed or renderer == 'shape'
+            continue
+        startup = statistics.median(s[0] for s in samples)
+        rss = statistics.median(s[1] for s in samples)
+        problems = []
+        if renderer == 'shape':
+            if startup > STARTUP_BUDGET_MS:
+                problems.append(f"startup over {STARTUP_BUDGET_MS:.0f} ms")
+            if rss > RSS_BUDGET_MB:
+                problems.append(f"RSS over {RSS_BUDGET_MB:.0f} MB")
+        failed = failed or bool(problems)
+        print(f"{renderer:<10}{startup:>12.1f}{rss:>10.1f}  {', '.join(problems) or 'ok'}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Hot-path benchmark suite with JSON results and a regression check
+
+Runs headless. Every result is a cost (lower is better):
+
+- activity: cost per ActivityTracker.touch() under a synthetic 1 kHz stream,
+  and one idle-source sample draining a second of 1 kHz evdev motion
+- process: is_claude_running() with a full /proc scan and with one cached
+  PID, while dummy `sleep` processes grow the process table
+- indicator: start()/close() latency of the indicator process
+- render: cost per status-line frame and bytes written per frame
+- click: Clicker.click() end to end with a recording backend, zero settle delays
+
+    python3 benchmarks/bench_suite.py --json before.json
+    python3 benchmarks/bench_suite.py --compare before.json --threshold 0.25
+
+With --compare the exit status is 1 when a result got slower than the
+baseline by more than the threshold (a fraction: 0.25 = 25%).
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clicker.app import Clicker  # noqa: E402
+from clicker.config import Config  # noqa: E402
+from clicker.idle_source import EV_REL, INPUT_EVENT, EvdevIdleSource  # noqa: E402
+from clicker.indicator import Indicator  # noqa: E402
+from clicker.input_backend import ClickTimings, RecordingBackend  # noqa: E402
+from clicker.process_watcher import ProcessWatcher  # noqa: E402
+from clicker.renderer import StatusRenderer  # noqa: E402
+from clicker.scheduler import ActivityTracker, IdleScheduler  # noqa: E402
+from clicker.sim import SimIdleSource, SimIndicator, SimReadiness, SimWatcher  # noqa: E402
+
+# Results below this are timer noise; they never count as regressions
+NOISE_FLOOR = {'us': 0.5, 'ms': 0.05, '%': 0.05, 'bytes': 0}
+DEFAULT_THRESHOLD = 0.25
+PROCESS_TABLE_SIZES = (0, 100, 400)
+
+
+def per_call_us(func, number, repeat=5):
+    """Best of `repeat` runs of `number` calls, in microseconds per call"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+def result(value, unit):
+    return {'value': round(value, 4), 'unit': unit}
+
+
+def evdev_sample_ms(rounds):
+    """Best idle_time() with an evdev source holding one second of 1 kHz motion"""
+    # EV_REL motion followed by EV_SYN (type 0) as a mouse reports it; a FIFO
+    # cannot switch to monotonic timestamps, so they are wall-clock
+    sec = int(time.time()) - 1
+    second = b''.join(INPUT_EVENT.pack(sec, i * 1000, EV_REL, 0, 1)
+                      + INPUT_EVENT.pack(sec, i * 1000, 0, 0, 0) for i in range(1000))
+    best = float('inf')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'event0')
+        os.mkfifo(path)
+        source = EvdevIdleSource(paths=[path])
+        source.start()
+        writer = os.open(path, os.O_WRONLY)
+        tracker = ActivityTracker(sources=[source])
+        try:
+            for _ in range(rounds):
+                os.write(writer, second)
+                start = time.perf_counter()
+                tracker.idle_time()
+                best = min(best, time.perf_counter() - start)
+        finally:
+            os.close(writer)
+            source.stop()
+    return best * 1000
+
+
+def bench_activity(quick=False):
+    """touch() fed from a 1 kHz stream on a synthetic clock, and evdev sampling"""
+    events = 2000 if quick else 20000
+    now = [0.0]
+    tracker = ActivityTracker(clock=lambda: now[0])
+    touch = tracker.touch
+
+    def stream():
+        for i in range(events):
+            now[0] = i * 0.001
+            touch()
+    # Loop and clock overhead of the stream without the callback
+    def empty():
+        for i in range(events):
+            now[0] = i * 0.001
+    cost = max(per_call_us(stream, 1) - per_call_us(empty, 1), 0.0) / events
+    return {
+        'activity.touch': result(cost, 'us'),
+        # CPU share of one core spent in listener callbacks at 1000 events per second
+        'activity.cpu_at_1khz': result(cost * 1000 / 1e6 * 100, '%'),
+        # What the loop pays per deadline with the evdev source instead
+        'activity.evdev_sample': result(evdev_sample_ms(5 if quick else 20), 'ms'),
+    }
+
+
+def spawn_dummies(count, seconds='600'):
+    return [subprocess.Popen(['sleep', seconds], stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL) for _ in range(count)]
+
+
+def bench_process(quick=False):
+    """is_claude_running() while the process table grows"""
+    results = {}
+    number = 20 if quick else 100
+    sizes = PROCESS_TABLE_SIZES[:2] if quick else PROCESS_TABLE_SIZES
+    # The stand-in for Claude; the other dummies only grow the table
+    claude = spawn_dummies(1, '601')
+    dummies = []
+    try:
+        for size in sizes:
+            dummies.extend(spawn_dummies(size - len(dummies)))
+            # Nothing matches: every call walks /proc (Claude not running)
+            missing = Clicker(watcher=ProcessWatcher('bench-no-such-process',
+                                                     rescan_interval=0))
+            # Claude found: calls only re-check its cached PID
+            found = Clicker(watcher=ProcessWatcher(r'^sleep 601$', rescan_interval=3600))
+            deadline = time.monotonic() + 5
+            # The fresh child may not have exec'd `sleep` yet
+            while not found.watcher.scan() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            results[f'process.scan.{size}'] = result(
+                per_call_us(missing.is_claude_running, number) / 1000, 'ms')
+            results[f'process.cached.{size}'] = result(
+                per_call_us(found.is_claude_running, number), 'us')
+    finally:
+        for process in claude + dummies:
+            process.kill()
+            process.wait()
+    return results
+
+
+def bench_indicator(quick=False):
+    """Spawning and stopping the indicator process
+
+    Without a display close() is called right away and waits for the
+    interpreter to start, fail to open the window and exit.
+    """
+    starts, stops = [], []
+    for _ in range(2 if quick else 5):
+        indicator = Indicator(100, 100)
+        start = time.perf_counter()
+        indicator.start()
+        starts.append((time.perf_counter() - start) * 1000)
+        if os.environ.get('DISPLAY'):
+            # Let the window come up before asking it to quit
+            time.sleep(0.5)
+        start = time.perf_counter()
+        indicator.close()
+        if indicator.process is not None:
+            indicator.process.wait()
+        stops.append((time.perf_counter() - start) * 1000)
+    return {
+        'indicator.start': result(statistics.median(starts), 'ms'),
+        'indicator.stop': result(statistics.median(stops), 'ms'),
+    }
+
+
+def bench_render(quick=False):
+    """One waiting frame per call on a terminal-like stream"""
+    stream = io.StringIO()
+    renderer = StatusRenderer(stream=stream, enabled=True)
+    frames = [0]
+
+    def frame():
+        frames[0] += 1
+        renderer.waiting(frames[0] % 200 / 10, 20, 'running')
+    cost = per_call_us(frame, 500 if quick else 5000)
+    size = len(stream.getvalue().encode())
+    return {
+        'render.frame': result(cost, 'us'),
+        'render.bytes_per_frame': result(size / frames[0], 'bytes'),
+    }
+
+
+def bench_click(quick=False):
+    """Clicker.click() with fake backend, indicator and watcher, no sleeps"""
+    tracker = ActivityTracker()
+    config = Config(timings=ClickTimings(0, 0, 0), journal=None)
+    clicker = Clicker(config, tracker=tracker, scheduler=IdleScheduler(tracker, 20),
+                      watcher=SimWatcher(), backend=RecordingBackend(),
+                      idle_source=SimIdleSource(), indicator=SimIndicator(tracker.clock),
+                      renderer=StatusRenderer(enabled=False), readiness=SimReadiness(),
+                      sleep=lambda seconds: None)
+    clicker.setup()
+
+    def click():
+        clicker.click(20.0)
+        clicker.backend.calls.clear()
+    return {'click.sequence': result(per_call_us(click, 200 if quick else 2000), 'us')}
+
+
+BENCHMARKS = {
+    'activity': bench_activity,
+    'process': bench_process,
+    'indicator': bench_indicator,
+    'render': bench_render,
+    'click': bench_click,
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(names, quick=False):
+    results = {}
+    for name in names:
+        results.update(BENCHMARKS[name](quick))
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Return (name, old, new) for every result slower than the threshold allows"""
+    regressions = []
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None or old['unit'] != new['unit']:
+            continue
+        floor = NOISE_FLOOR.get(new['unit'], 0)
+        if new['value'] > max(old['value'], floor) * (1 + threshold):
+            regressions.append((name, old['value'], new['value']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-b', '--benchmarks', nargs='+', default=list(BENCHMARKS),
+                        choices=sorted(BENCHMARKS), help='Benchmarks to run (default: all)')
+    parser.add_argument('--json', metavar='PATH', help='Write the results to PATH')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='Fail on regressions against an earlier --json file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Allowed slowdown as a fraction (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--quick', action='store_true', help='Fewer iterations')
+    args = parser.parse_args(argv)
+
+    current = run(args.benchmarks, args.quick)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print(f"{'benchmark':<28}{'value':>12}  unit" + ('    baseline' if baseline else ''))
+    for name, value in current['results'].items():
+        line = f"{name:<28}{value['value']:>12.3f}  {value['unit']:<5}"
+        if baseline and name in baseline['results']:
+            line += f"{baseline['results'][name]['value']:>11.3f}"
+        print(line)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(current, f, indent=2)
+            f.write('\n')
+    if baseline is None:
+        return 0
+    regressions = compare(baseline, current, args.threshold)
+    for name, old, new in regressions:
+        print(f"REGRESSION {name}: {old:.3f} -> {new:.3f} (+{(new / old - 1) * 100:.0f}%)"
+              if old else f"REGRESSION {name}: {old:.3f} -> {new:.3f}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""POWERJET Auto-Clicker
+
+Importing the package has no side effects: nothing is logged, no display
+connection is opened and heavy modules (pyautogui, pynput, tkinter,
+python-xlib) are only imported once a real backend is created.
+
+    from clicker import Clicker, Config
+    Clicker(Config(idle_timeout=10)).run()
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+# Public name -> submodule; resolved on first access
+_EXPORTS = {
+    'Config': 'config',
+    'ActivityTracker': 'scheduler',
+    'IdleScheduler': 'scheduler',
+    'Target': 'scheduler',
+    'TargetScheduler': 'scheduler',
+    'ProcessWatcher': 'process_watcher',
+    'Indicator': 'indicator',
+    'Clicker': 'app',
+    'MultiClicker': 'engine',
+    'main': 'app',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,6 @@
+"""Allow `python3 -m clicker`"""
+import sys
+
+from .app import main
+
+sys.exit(main())
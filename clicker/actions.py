@@ -0,0 +1,382 @@
+"""Programmable action sequences with condition waits
+
+A sequence is a list of steps, compiled and validated once at startup:
+
+    {"move": "target"}            pointer to the click point ("back" = where it was,
+                                  [X, Y] = absolute); "offset": [DX, DY] is added
+    "click" or {"click": 2}       left click, N times
+    {"key": "enter"}              one key (pyautogui / X keysym names)
+    {"type": "y"}                 one key press per character
+    {"sleep": 0.2}                fixed pause
+    {"wait": CONDITION, "timeout": 1.0, "poll": 0.02}
+
+A wait returns as soon as its condition holds and gives up after
+`timeout` seconds; the sequence then continues. Conditions:
+
+    pointer-at       the pointer reached the point of the last move
+    region-changed   the screen region ("region": [X, Y, W, H], or "size": [W, H]
+                     centred on the target) differs from how it looked right
+                     before the previous input step (needs Pillow)
+    cpu-up           Claude's process tree used "cpu" seconds of CPU (default
+                     0.02) since the previous input step
+
+Sequences are read from a JSON object of named sequences (`--actions`);
+the built-in ones are always available:
+
+    {"approve": [{"move": "target"}, {"wait": "pointer-at", "timeout": 0.3},
+                 "click", {"type": "1"}, {"move": "back"}]}
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import json
+import logging
+import os
+import time
+import zlib
+
+from .process_watcher import read_children, read_cpu_ticks
+
+logger = logging.getLogger(__name__)
+
+CONDITIONS = ('pointer-at', 'region-changed', 'cpu-up')
+DEFAULT_WAIT_TIMEOUT = 1.0
+DEFAULT_POLL = 0.02
+DEFAULT_REGION_SIZE = (300, 80)
+DEFAULT_CPU = 0.02
+TICKS_PER_SECOND = os.sysconf('SC_CLK_TCK')
+# Characters whose key name differs from the character
+TYPE_KEYS = {' ': 'space', '\n': 'enter', '\t': 'tab'}
+
+# Always available; --actions files may add to or replace them
+BUILTIN_SEQUENCES = {
+    # The classic sequence, but the move settle ends once the pointer is there
+    'enter': [{'move': 'target'}, {'wait': 'pointer-at', 'timeout': 0.3}, 'click',
+              {'sleep': 0.5}, {'key': 'enter'}, {'wait': 'cpu-up', 'timeout': 0.2},
+              {'move': 'back'}],
+    # Pick the first option of a Claude permission prompt
+    'press-1': [{'move': 'target'}, {'wait': 'pointer-at', 'timeout': 0.3}, 'click',
+                {'type': '1'}, {'wait': 'cpu-up', 'timeout': 0.5}, {'move': 'back'}],
+    # Answer a y/n question
+    'yes': [{'move': 'target'}, {'wait': 'pointer-at', 'timeout': 0.3}, 'click',
+            {'type': 'y'}, {'key': 'enter'}, {'wait': 'cpu-up', 'timeout': 0.5},
+            {'move': 'back'}],
+}
+
+
+def region_hash(region, grab=None):
+    """CRC32 of the pixels in (left, top, width, height)"""
+    if grab is None:
+        from .locator import grab_screen as grab
+    return zlib.crc32(grab(region).tobytes())
+
+
+def tree_ticks(pids, proc_root='/proc', limit=256):
+    """utime + stime of the processes and all their descendants, in clock ticks"""
+    total = 0
+    seen = set()
+    stack = list(pids)
+    while stack and len(seen) < limit:
+        pid = stack.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        total += read_cpu_ticks(proc_root, pid) or 0
+        stack.extend(read_children(proc_root, pid))
+    return total
+
+
+class ActionContext:
+    """What the steps of one run act on"""
+
+    def __init__(self, backend, point, sleep=time.sleep, clock=time.monotonic,
+                 pids=lambda: (), grab=None, proc_root='/proc'):
+        self.backend = backend
+        self.point = point
+        self.origin = backend.position()
+        self.moved_to = None
+        self.sleep = sleep
+        self.clock = clock
+        self.pids = pids
+        self.grab = grab
+        self.proc_root = proc_root
+        # Baselines taken before the input step a wait refers to
+        self.baselines = {}
+        # (condition, met, seconds) of every wait in this run
+        self.waits = []
+
+
+class Step:
+    """One compiled step; `baseline` waits are snapshotted before it runs"""
+
+    is_input = True
+
+    def __init__(self):
+        self.baseline = []
+
+    def run(self, ctx):
+        raise NotImplementedError
+
+
+class Move(Step):
+    def __init__(self, to, offset=(0, 0)):
+        super().__init__()
+        self.to = to
+        self.offset = offset
+
+    def run(self, ctx):
+        if self.to == 'target':
+            x, y = ctx.point
+        elif self.to == 'back':
+            x, y = ctx.origin
+        else:
+            x, y = self.to
+        point = (x + self.offset[0], y + self.offset[1])
+        ctx.backend.move(*point)
+        ctx.moved_to = point
+
+    def __repr__(self):
+        return f"Move({self.to!r}, {self.offset})"
+
+
+class Click(Step):
+    def __init__(self, count=1):
+        super().__init__()
+        self.count = count
+
+    def run(self, ctx):
+        for _ in range(self.count):
+            ctx.backend.click()
+
+    def __repr__(self):
+        return f"Click({self.count})"
+
+
+class Keys(Step):
+    def __init__(self, keys):
+        super().__init__()
+        self.keys = keys
+
+    def run(self, ctx):
+        for key in self.keys:
+            ctx.backend.press(key)
+
+    def __repr__(self):
+        return f"Keys({self.keys!r})"
+
+
+class Sleep(Step):
+    is_input = False
+
+    def __init__(self, seconds):
+        super().__init__()
+        self.seconds = seconds
+
+    def run(self, ctx):
+        ctx.sleep(self.seconds)
+
+    def __repr__(self):
+        return f"Sleep({self.seconds})"
+
+
+class Wait(Step):
+    """Poll a condition until it holds or the timeout passes"""
+
+    is_input = False
+
+    def __init__(self, condition, timeout=DEFAULT_WAIT_TIMEOUT, poll=DEFAULT_POLL,
+                 region=None, size=DEFAULT_REGION_SIZE, cpu=DEFAULT_CPU):
+        super().__init__()
+        self.condition = condition
+        self.timeout = timeout
+        self.poll = poll
+        self.region = region
+        self.size = size
+        self.cpu = cpu
+
+    def _region(self, ctx):
+        if self.region is not None:
+            return self.region
+        width, height = self.size
+        return (ctx.point[0] - width // 2, ctx.point[1] - height // 2, width, height)
+
+    def snapshot(self, ctx):
+        """Baseline for region-changed and cpu-up, taken before the input step"""
+        if self.condition == 'region-changed':
+            ctx.baselines[id(self)] = region_hash(self._region(ctx), ctx.grab)
+        elif self.condition == 'cpu-up':
+            ctx.baselines[id(self)] = tree_ticks(ctx.pids(), ctx.proc_root)
+
+    def met(self, ctx):
+        if self.condition == 'pointer-at':
+            return ctx.moved_to is None or tuple(ctx.backend.position()) == ctx.moved_to
+        baseline = ctx.baselines.get(id(self))
+        if self.condition == 'region-changed':
+            return baseline is not None and region_hash(self._region(ctx), ctx.grab) != baseline
+        ticks = tree_ticks(ctx.pids(), ctx.proc_root) - (baseline or 0)
+        return baseline is not None and ticks >= self.cpu * TICKS_PER_SECOND
+
+    def run(self, ctx):
+        start = ctx.clock()
+        deadline = start + self.timeout
+        while True:
+            met = self.met(ctx)
+            now = ctx.clock()
+            if met or now >= deadline:
+                break
+            ctx.sleep(min(self.poll, deadline - now))
+        ctx.waits.append((self.condition, met, now - start))
+        if not met:
+            logger.debug("Wait for %s timed out after %.2fs", self.condition, self.timeout)
+
+    def __repr__(self):
+        return f"Wait({self.condition!r}, timeout={self.timeout})"
+
+
+class ActionSequence:
+    """Compiled steps, run against the backend with the click point"""
+
+    def __init__(self, name, steps):
+        self.name = name
+        self.steps = steps
+
+    def run(self, backend, point, suppress=None, sleep=time.sleep, clock=time.perf_counter,
+            pids=lambda: (), grab=None):
+        """Run every step; return the context (elapsed seconds in `elapsed`)
+
+        Like perform_click(), FailSafeError from the backend stops the run.
+        """
+        start = clock()
+        ctx = ActionContext(backend, point, sleep=sleep, clock=clock, pids=pids, grab=grab)
+        if suppress is None:
+            self._run(ctx)
+        else:
+            with suppress():
+                self._run(ctx)
+        ctx.elapsed = clock() - start
+        return ctx
+
+    def _run(self, ctx):
+        for step in self.steps:
+            for wait in step.baseline:
+                wait.snapshot(ctx)
+            step.run(ctx)
+
+    def __repr__(self):
+        return f"ActionSequence({self.name!r}, {self.steps})"
+
+
+def _number(value, what, where):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"{where}: {what} must be a non-negative number, got {value!r}")
+    return float(value)
+
+
+def _pair(value, what, where):
+    if (not isinstance(value, (list, tuple)) or len(value) != 2
+            or not all(isinstance(v, int) and not isinstance(v, bool) for v in value)):
+        raise ValueError(f"{where}: {what} must be [X, Y] integers, got {value!r}")
+    return tuple(value)
+
+
+def _options(entry, allowed, where):
+    unknown = set(entry) - set(allowed)
+    if unknown:
+        raise ValueError(f"{where}: unknown keys {', '.join(sorted(unknown))}")
+
+
+def compile_step(entry, where):
+    """Build one Step from its JSON form; raises ValueError"""
+    if entry == 'click':
+        return Click()
+    if not isinstance(entry, dict):
+        raise ValueError(f"{where}: expected an object or \"click\", got {entry!r}")
+    if 'move' in entry:
+        _options(entry, ('move', 'offset'), where)
+        to = entry['move']
+        if to not in ('target', 'back'):
+            to = _pair(to, 'move', where)
+        return Move(to, _pair(entry.get('offset', [0, 0]), 'offset', where))
+    if 'click' in entry:
+        _options(entry, ('click',), where)
+        count = entry['click']
+        if isinstance(count, bool) or not isinstance(count, int) or not 1 <= count <= 3:
+            raise ValueError(f"{where}: click count must be 1, 2 or 3")
+        return Click(count)
+    if 'key' in entry:
+        _options(entry, ('key',), where)
+        key = entry['key']
+        if not isinstance(key, str) or not key:
+            raise ValueError(f"{where}: key must be a key name")
+        return Keys([key])
+    if 'type' in entry:
+        _options(entry, ('type',), where)
+        text = entry['type']
+        if not isinstance(text, str) or not text:
+            raise ValueError(f"{where}: type must be a non-empty string")
+        return Keys([TYPE_KEYS.get(char, char) for char in text])
+    if 'sleep' in entry:
+        _options(entry, ('sleep',), where)
+        return Sleep(_number(entry['sleep'], 'sleep', where))
+    if 'wait' in entry:
+        _options(entry, ('wait', 'timeout', 'poll', 'region', 'size', 'cpu'), where)
+        condition = entry['wait']
+        if condition not in CONDITIONS:
+            raise ValueError(f"{where}: unknown wait condition {condition!r} "
+                             f"(expected one of {', '.join(CONDITIONS)})")
+        region = entry.get('region')
+        if region is not None and (
+                not isinstance(region, list) or len(region) != 4
+                or not all(isinstance(v, int) and not isinstance(v, bool) for v in region)
+                or region[2] <= 0 or region[3] <= 0):
+            raise ValueError(f"{where}: region must be [X, Y, W, H] integers, got {region!r}")
+        poll = _number(entry.get('poll', DEFAULT_POLL), 'poll', where)
+        if poll == 0:
+            raise ValueError(f"{where}: poll must be positive")
+        return Wait(condition,
+                    timeout=_number(entry.get('timeout', DEFAULT_WAIT_TIMEOUT), 'timeout', where),
+                    poll=poll,
+                    region=tuple(region) if region else None,
+                    size=_pair(entry.get('size', list(DEFAULT_REGION_SIZE)), 'size', where),
+                    cpu=_number(entry.get('cpu', DEFAULT_CPU), 'cpu', where))
+    raise ValueError(f"{where}: expected one of move, click, key, type, sleep, wait")
+
+
+def compile_sequence(name, entries):
+    """Compile and validate a list of steps; raises ValueError"""
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"sequence {name!r}: expected a non-empty list of steps")
+    steps = [compile_step(entry, f"sequence {name!r} step {i}")
+             for i, entry in enumerate(entries, 1)]
+    # Baselines of change conditions are taken before the input step they follow
+    for i, step in enumerate(steps):
+        if isinstance(step, Wait) and step.condition in ('region-changed', 'cpu-up'):
+            inputs = [s for s in steps[:i] if s.is_input]
+            if not inputs:
+                raise ValueError(f"sequence {name!r} step {i + 1}: {step.condition} "
+                                 f"needs an input step before it")
+            inputs[-1].baseline.append(step)
+    return ActionSequence(name, steps)
+
+
+def load_sequences(path=None):
+    """Built-in sequences plus the ones in the JSON file at `path`, compiled"""
+    library = dict(BUILTIN_SEQUENCES)
+    if path:
+        with open(path) as f:
+            try:
+                entries = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"{path}: {e}") from None
+        if not isinstance(entries, dict) or not entries:
+            raise ValueError(f"{path}: expected an object of named sequences")
+        library.update(entries)
+    return {name: compile_sequence(name, steps) for name, steps in library.items()}
+
+
+def pick_sequence(library, name):
+    """Sequence by name; raises ValueError listing the known ones"""
+    try:
+        return library[name]
+    except KeyError:
+        raise ValueError(f"unknown action sequence {name!r} "
+                         f"(known: {', '.join(sorted(library))})") from None
@@ -0,0 +1,237 @@
+"""Adaptive idle timeout learned from the user's pauses
+
+Every time the user comes back after a quiet gap (the tracker's
+`on_resume` hook) the length of that pause is fed to a P² quantile
+estimator (Jain & Chlamtac, 1985): five markers, constant memory, no
+stored samples. The idle timeout is the configured percentile of the
+pauses, clamped to [minimum, maximum], so that only the longest pauses
+end in a click.
+
+A click cuts its pause short, so its true length is unknown. It counts
+once as a pause of `maximum` seconds: while fewer than (100 - percentile)%
+of pauses end in a click the estimate below the timeout is unaffected,
+otherwise the timeout grows. The user's return after such a click
+belongs to the same pause and is not counted again.
+
+The estimator state is a small JSON file, written atomically.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import bisect
+import json
+import logging
+import math
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+VERSION = 1
+DEFAULT_PERCENTILE = 90
+DEFAULT_MINIMUM = 5.0
+DEFAULT_MAXIMUM = 120.0
+DEFAULT_STATE = 'clicker.adaptive.json'
+# Pauses needed before the learned timeout replaces the configured one
+MIN_SAMPLES = 5
+
+
+class P2Quantile:
+    """Streaming estimate of the p-quantile (0 < p < 1) in constant memory"""
+
+    def __init__(self, p):
+        if not 0 < p < 1:
+            raise ValueError(f"quantile must be between 0 and 1, got {p}")
+        self.p = p
+        self.count = 0
+        # Marker heights, actual and desired marker positions (1-based)
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            bisect.insort(q, x)
+            return
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(q, x) - 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self):
+        """Current estimate, or None before the first sample"""
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            return self.heights[max(math.ceil(self.p * self.count) - 1, 0)]
+        return self.heights[2]
+
+    def to_dict(self):
+        return {'count': self.count, 'heights': self.heights,
+                'positions': self.positions, 'desired': self.desired}
+
+    @classmethod
+    def from_dict(cls, p, data):
+        estimator = cls(p)
+        count = int(data['count'])
+        heights = [float(v) for v in data['heights']]
+        positions = [int(v) for v in data['positions']]
+        desired = [float(v) for v in data['desired']]
+        if len(heights) != min(count, 5) or len(positions) != 5 or len(desired) != 5:
+            raise ValueError("inconsistent quantile markers")
+        estimator.count = count
+        estimator.heights = heights
+        estimator.positions = positions
+        estimator.desired = desired
+        return estimator
+
+
+class AdaptiveTimeout:
+    """Idle timeout at a percentile of the user's pauses, persisted to `path`"""
+
+    def __init__(self, percentile=DEFAULT_PERCENTILE, minimum=DEFAULT_MINIMUM,
+                 maximum=DEFAULT_MAXIMUM, path=None, min_samples=MIN_SAMPLES):
+        if minimum <= 0 or minimum > maximum:
+            raise ValueError(f"adaptive timeout range {minimum}..{maximum} is invalid")
+        self.percentile = percentile
+        self.minimum = minimum
+        self.maximum = maximum
+        self.path = path
+        self.min_samples = min_samples
+        self.estimator = P2Quantile(percentile / 100)
+        self.pauses = 0
+        self.clicked = 0
+        # Countdown start of the last click; a return after it is the same pause
+        self._censored = None
+        self._lock = threading.Lock()
+        self.dirty = False
+
+    def _add(self, seconds):
+        self.estimator.add(seconds)
+        self.dirty = True
+
+    def resumed(self, start, end):
+        """The user came back at `end` after being quiet since `start`"""
+        with self._lock:
+            if self._censored is not None and abs(start - self._censored) < 1e-6:
+                self._censored = None
+                return
+            self.pauses += 1
+            self._add(end - start)
+
+    def click(self, start, restart):
+        """A click ended the pause that began at `start`; the countdown restarted at `restart`"""
+        with self._lock:
+            if self._censored is None or abs(start - self._censored) >= 1e-6:
+                # First click of this pause: it lasted at least the timeout
+                self.pauses += 1
+                self.clicked += 1
+                self._add(self.maximum)
+            self._censored = restart
+
+    def estimate(self):
+        """Raw percentile of the pauses seen so far, or None"""
+        return self.estimator.value()
+
+    def timeout(self):
+        """Clamped timeout in seconds, or None while still learning"""
+        if self.estimator.count < self.min_samples:
+            return None
+        value = min(max(self.estimate(), self.minimum), self.maximum)
+        return round(value, 1)
+
+    def label(self):
+        """Short text for the status line"""
+        if self.estimator.count < self.min_samples:
+            return f"| learning {self.estimator.count}/{self.min_samples}"
+        return f"| auto p{self.percentile:g} of {self.pauses}"
+
+    def summary(self):
+        """State for `clicker ctl status`"""
+        estimate = self.estimate()
+        return {
+            'percentile': self.percentile,
+            'pauses': self.pauses,
+            'clicked': self.clicked,
+            'estimate': None if estimate is None else round(estimate, 1),
+            'timeout': self.timeout(),
+            'min': self.minimum,
+            'max': self.maximum,
+        }
+
+    def to_dict(self):
+        return {
+            'version': VERSION,
+            'percentile': self.percentile,
+            'pauses': self.pauses,
+            'clicked': self.clicked,
+            'estimator': self.estimator.to_dict(),
+        }
+
+    def save(self):
+        """Write the state atomically; no-op without a path"""
+        if self.path is None:
+            return
+        with self._lock:
+            data = self.to_dict()
+            self.dirty = False
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+            f.write('\n')
+        os.replace(tmp, self.path)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """State from `path` if it exists; raises ValueError if it is unreadable
+
+        A file learned for another percentile is ignored.
+        """
+        adaptive = cls(path=path, **kwargs)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return adaptive
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: {e}")
+        try:
+            if data['version'] != VERSION:
+                raise ValueError(f"unsupported version {data['version']}")
+            if data['percentile'] != adaptive.percentile:
+                logger.info("Adaptive state %s is for p%s, starting over", path,
+                            data['percentile'])
+                return adaptive
+            adaptive.estimator = P2Quantile.from_dict(adaptive.percentile / 100,
+                                                      data['estimator'])
+            adaptive.pauses = int(data['pauses'])
+            adaptive.clicked = int(data['clicked'])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path} is not a clicker adaptive state: {e}")
+        return adaptive
@@ -0,0 +1,619 @@
+"""Clicker main loop and command-line entry point
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import logging
+import os
+import sys
+import time
+
+from .adaptive import AdaptiveTimeout
+from .config import Config, parse_args
+from .control import CommandQueue, ControlServer
+from .idle_source import create_idle_source
+from .indicator import Indicator
+from .input_backend import FailSafeError, create_backend, perform_click
+from .journal import Journal
+from .log_setup import setup_logging, shutdown_logging
+from .metrics import NULL_METRICS, ClickerMetrics, create_exporters
+from .process_watcher import ProcessWatcher
+from .readiness import create_readiness
+from .renderer import StatusRenderer, banner_lines
+from .scheduler import ActivityTracker, IdleScheduler
+from .topology import create_topology
+
+logger = logging.getLogger(__name__)
+
+# Least time between two writes of the adaptive state file
+ADAPTIVE_SAVE_INTERVAL = 60.0
+
+
+class Clicker:
+    """Click the target whenever the user is idle and Claude is running
+
+    Every component can be passed in; the ones left out are created from
+    the config, the display-bound ones only in setup().
+    """
+
+    def __init__(self, config=None, tracker=None, scheduler=None, watcher=None,
+                 backend=None, idle_source=None, indicator=None, renderer=None,
+                 locator=None, readiness=None, journal=None, metrics=None, sleep=None,
+                 topology=None, adaptive=None, actions=None, verifier=None):
+        self.config = config or Config()
+        self.tracker = tracker or ActivityTracker()
+        self.scheduler = scheduler or IdleScheduler(self.tracker, self.config.idle_timeout)
+        self.watcher = watcher or ProcessWatcher(pattern=self.config.match,
+                                                 rescan_interval=self.config.rescan)
+        self.backend = backend
+        self.idle_source = idle_source
+        self.indicator = indicator
+        self.renderer = renderer or StatusRenderer()
+        self.locator = locator
+        self.readiness = readiness
+        self.journal = journal
+        self.metrics = metrics or NULL_METRICS
+        # A custom sleep (simulation) also measures click latency on the tracker's clock
+        self.sleep = sleep or time.sleep
+        self.timer = self.tracker.clock if sleep else time.perf_counter
+        self.adaptive = adaptive
+        # Compiled ActionSequence run instead of perform_click()
+        self.actions = actions
+        self.verifier = verifier
+        # Set by `clicker ctl set-timeout`: keep learning, stop applying
+        self.adaptive_override = False
+        self.adaptive_saved = None
+        if (journal is not None or adaptive is not None) and self.tracker.on_resume is None:
+            self.tracker.on_resume = self.on_resume
+        self.topology = topology
+        # X display the backend, idle source, topology and indicator connect to
+        self.display_name = self.config.display
+        self.screen = None
+        # (monitor, corner, (x, y)) the target is resolved from on every layout change
+        self.placement = self.config.target
+        self.target = None
+        self.claude_running = False
+        self.claude_busy = False
+        self.clicks = 0
+        self.started = time.time()
+        # Filled by the control server thread, run by step() on this thread
+        self.commands = CommandQueue(interrupt=self.scheduler.interrupt)
+
+    @property
+    def idle_timeout(self):
+        return self.scheduler.idle_timeout
+
+    def setup(self):
+        """Connect to the display and start the helpers"""
+        config = self.config
+        if self.backend is None:
+            self.backend = create_backend(config.backend, self.display_name)
+        if self.topology is None:
+            self.topology = create_topology(self.backend, self.display_name)
+        screen_width, screen_height = self.screen = self.topology.size
+        logger.info("Monitors: %s", ', '.join(map(repr, self.topology.monitors)))
+        self.setup_targets()
+        self.apply_adaptive()
+        target_x, target_y = self.target
+
+        # Display startup information with Powerjet logo
+        self.renderer.banner(banner_lines(self.idle_timeout, screen_width, screen_height,
+                                          target_x, target_y, config.log_target))
+
+        logger.info("Screen size: %sx%s", screen_width, screen_height)
+        logger.info("Target position: %s, %s", target_x, target_y)
+        logger.info("Idle timeout: %s seconds", self.idle_timeout)
+        if self.actions is None:
+            logger.info("Input backend: %s, %r", self.backend.name, config.timings)
+        else:
+            logger.info("Input backend: %s, actions: %r", self.backend.name, self.actions)
+
+        # Visual indicator runs in the background and stays alive between clicks
+        if self.indicator is None and config.indicator:
+            self.indicator = Indicator(target_x, target_y, renderer=config.overlay,
+                                       display=self.display_name)
+        if self.indicator and self.indicator.start():
+            logger.info("Visual indicator started")
+
+        # Sampled once per deadline check instead of a callback per input event
+        if self.idle_source is None:
+            self.idle_source = create_idle_source(config.idle_source,
+                                                  display_name=self.display_name)
+        if self.idle_source not in self.tracker.sources:
+            self.tracker.sources.append(self.idle_source)
+        logger.info("Idle source: %s", self.idle_source.name)
+
+        if self.verifier is None and config.verify:
+            from .verify import ClickVerifier
+            self.verifier = ClickVerifier(size=config.verify_size,
+                                          threshold=config.verify_threshold,
+                                          delay=config.verify_delay,
+                                          max_backoff=config.verify_max_backoff,
+                                          grab=self.grab)
+            logger.info("Verifying clicks in a %sx%s region", *config.verify_size)
+
+        self.setup_readiness()
+        self.update_running()
+
+    def setup_targets(self):
+        """Set the click position, and the locator if a target image is configured"""
+        config = self.config
+        screen_width, screen_height = self.screen
+        self.place_targets()
+        if self.locator is None and config.target_image:
+            from .locator import TemplateLocator
+            region = config.search_region or (0, 0, screen_width, screen_height)
+            self.locator = TemplateLocator(config.target_image, region,
+                                           scale=config.match_scale,
+                                           threshold=config.match_threshold, grab=self.grab)
+            logger.info("Locating %s in region %s", config.target_image, region)
+
+    def grab(self, region):
+        """Screenshot of (x, y, width, height) on the clicked display"""
+        from .locator import grab_screen
+        return grab_screen(region, display=self.display_name)
+
+    def place_targets(self):
+        """Resolve the click position against the current monitor layout"""
+        monitor, corner, position = self.placement
+        self.target = self.topology.resolve(position, monitor, corner)
+
+    def check_layout(self):
+        """Follow a monitor change: re-resolve the target and move the indicator"""
+        try:
+            changed = self.topology.poll()
+        except Exception as e:
+            logger.debug("Display layout check failed: %s", e)
+            return False
+        if not changed:
+            return False
+        self.screen = self.topology.size
+        logger.info("Display layout changed: %s", ', '.join(map(repr, self.topology.monitors)))
+        previous = self.target
+        self.place_targets()
+        if self.target != previous:
+            logger.info("Target moved to %s, %s", *self.target)
+            if self.indicator:
+                self.indicator.move(*self.target)
+        return True
+
+    def setup_readiness(self):
+        """Sampled only when the idle deadline is reached, never per tick"""
+        config = self.config
+        if self.readiness is None:
+            self.readiness = create_readiness(config.readiness, self.watcher,
+                                              transcript_dir=config.transcript_dir,
+                                              cpu_threshold=config.cpu_threshold,
+                                              cpu_window=config.cpu_window,
+                                              quiet=config.transcript_quiet)
+        logger.info("Readiness: %s", ', '.join(part.name for part in self.readiness.parts)
+                    or 'off')
+
+    def is_claude_running(self):
+        try:
+            return self.watcher.is_running()
+        except Exception:
+            return False
+
+    def claude_pids(self):
+        """PIDs of the Claude processes being clicked for"""
+        return self.watcher.pids
+
+    def check_running(self):
+        """is_claude_running(), timed only when metrics are enabled"""
+        metrics = self.metrics
+        if not metrics.enabled:
+            return self.is_claude_running()
+        start = time.perf_counter()
+        running = self.is_claude_running()
+        metrics.scans.observe(time.perf_counter() - start)
+        metrics.claude_running.set(int(running))
+        return running
+
+    def update_running(self):
+        """Refresh claude_running and journal when the process appears or goes away"""
+        running = self.check_running()
+        if running != self.claude_running:
+            self.record('process-found' if running else 'process-lost',
+                        target=self.target_index())
+        self.claude_running = running
+        return running
+
+    def is_claude_ready(self):
+        """True when Claude looks blocked on input rather than working"""
+        try:
+            return self.readiness is None or self.readiness.ready()
+        except Exception as e:
+            logger.debug("Readiness check failed: %s", e)
+            return True
+
+    def target_index(self):
+        """Target number stored in journal records"""
+        return 0
+
+    def record(self, event, idle=0.0, latency=0.0, target=0):
+        """Append an event to the journal, if one is open"""
+        if self.journal is not None:
+            self.journal.append(event, idle, latency, target)
+
+    def on_resume(self, gap, tracker=None):
+        """The user came back after `gap` seconds of quiet (on `tracker`'s display)"""
+        self.record('activity', idle=gap)
+        if self.adaptive is not None:
+            end = (tracker or self.tracker).last_activity
+            self.adaptive.resumed(end - gap, end)
+
+    def apply_adaptive(self):
+        """Switch to the learned timeout and save the state now and then"""
+        adaptive = self.adaptive
+        if adaptive is None:
+            return
+        timeout = adaptive.timeout()
+        if timeout is not None and not self.adaptive_override and timeout != self.idle_timeout:
+            self.scheduler.set_timeout(timeout)
+            logger.info("Adaptive idle timeout: %s seconds (p%s of %s pauses)", timeout,
+                        adaptive.percentile, adaptive.pauses)
+        now = self.scheduler.clock()
+        if adaptive.dirty and (self.adaptive_saved is None
+                               or now - self.adaptive_saved >= ADAPTIVE_SAVE_INTERVAL):
+            self.save_adaptive()
+            self.adaptive_saved = now
+
+    def save_adaptive(self):
+        try:
+            self.adaptive.save()
+        except OSError as e:
+            logger.warning("Could not save adaptive state: %s", e)
+
+    def show_waiting(self, idle_time):
+        """Redraw the waiting status line"""
+        if not self.claude_running:
+            status, state = 'not found', 'waiting, Claude not found'
+        elif self.claude_busy:
+            status, state = 'busy', 'waiting, Claude busy'
+        else:
+            status, state = 'running', 'waiting'
+        self.renderer.waiting(idle_time, self.idle_timeout, status,
+                              paused=self.scheduler.paused,
+                              mode=self.adaptive.label() if self.adaptive else '')
+        logger.debug("Waiting. Idle: %.0fs, Claude: %s", idle_time, status,
+                     extra={'state': state, 'idle': idle_time})
+
+    def locate_target(self):
+        """Return the point to click, following the target image if configured"""
+        if self.locator is None:
+            return self.target
+        target = self.locator.locate()
+        logger.debug("Target search took %.1f ms", self.locator.last_duration * 1000)
+        if target is not None and target != self.target:
+            logger.info("Target moved to %s, %s", *target)
+            self.target = target
+            if self.indicator:
+                self.indicator.move(*target)
+        return target
+
+    def click(self, idle_time):
+        """Run the click sequence; return False if it was skipped"""
+        # rearm() may select the next target: keep this one's timeout and tracker
+        tracker, timeout = self.tracker, self.idle_timeout
+        # Start of the pause this click ends, for the adaptive timeout
+        pause_start = tracker.last_activity
+        verifier = self.verifier
+        key = self.target_index()
+        effective = True
+        # Hide visual indicator before clicking
+        exclude = None
+        if self.indicator:
+            self.indicator.hide()
+            if self.locator is not None or verifier is not None:
+                # hide() only queues the command; wait until it reached the X server
+                sync = getattr(self.indicator, 'sync', None)
+                if sync is not None:
+                    sync()
+                # and keep the window out of the hashes in case it is still drawn
+                box = getattr(self.indicator, 'box', None)
+                exclude = box() if box is not None else None
+        try:
+            target = self.locate_target()
+            if target is None:
+                logger.info("Target image not visible. Skipping click.")
+                self.renderer.message("⚠ Target image not found on screen, waiting...")
+                return False
+            if verifier is not None:
+                before = verifier.capture(target, exclude)
+                if verifier.unchanged(before, key):
+                    # The last click changed nothing and neither did anything since
+                    verifier.skip(key)
+                    self.record('skipped', idle=idle_time, target=key)
+                    self.metrics.skipped.inc()
+                    logger.info("Target region unchanged since the last ineffective click. "
+                                "Skipping click.")
+                    self.renderer.message("⚠ Last click had no effect, waiting for a change...")
+                    return False
+            if self.actions is None:
+                latency = perform_click(self.backend, target[0], target[1],
+                                        self.config.timings, suppress=self.tracker.suppress,
+                                        sleep=self.sleep, clock=self.timer)
+            else:
+                latency = self.actions.run(self.backend, target, suppress=self.tracker.suppress,
+                                           sleep=self.sleep, clock=self.timer,
+                                           pids=self.claude_pids, grab=self.grab).elapsed
+            if verifier is not None:
+                self.sleep(verifier.delay)
+                effective = verifier.check(before, verifier.capture(target, exclude), key)
+        except FailSafeError:
+            logger.warning("Fail-safe triggered: mouse was at a screen corner. Skipping click.")
+            self.record('fail-safe', idle=idle_time, target=self.target_index())
+            self.metrics.fail_safes.inc()
+            self.renderer.message("⚠ Fail-safe: move mouse away from corner and wait...")
+            return False
+        finally:
+            # Show visual indicator again after clicking
+            if self.indicator:
+                self.indicator.show()
+            self.rearm()
+            if verifier is not None:
+                self.back_off(verifier.backoff(timeout, key))
+
+        self.clicks += 1
+        if self.adaptive is not None:
+            self.adaptive.click(pause_start, tracker.last_activity)
+        self.record('click', idle=idle_time, latency=latency, target=key)
+        self.metrics.clicks.inc()
+        self.metrics.click_latency.observe(latency)
+        if not effective:
+            self.record('ineffective', idle=idle_time, latency=latency, target=key)
+            self.metrics.ineffective.inc()
+            logger.warning("Click changed nothing on screen (%s times in a row)",
+                           verifier.state(key).failures)
+            self.renderer.message("⚠ Click had no visible effect, backing off...")
+            return True
+        self.renderer.clicked(idle_time)
+        logger.debug("Clicked! Idle: %.0fs, Claude: running, took %.0f ms",
+                     idle_time, latency * 1000)
+        return True
+
+    def back_off(self, delay):
+        """Wait `delay` seconds (None = the idle timeout) before the next attempt"""
+        if delay is not None:
+            self.scheduler.defer(delay)
+            logger.info("Next click attempt in %.0f seconds", delay)
+
+    def rearm(self):
+        """Restart the idle countdown after a click attempt"""
+        self.tracker.reset()
+
+    def status(self):
+        """Snapshot of the in-memory state for `clicker ctl status`"""
+        now = self.scheduler.clock()
+        deadline = self.next_deadline()
+        if not self.claude_running:
+            claude = 'not found'
+        else:
+            claude = 'busy' if self.claude_busy else 'running'
+        return {
+            'state': 'paused' if self.scheduler.paused else 'running',
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 1),
+            'idle': round(now - self.tracker.last_activity, 1),
+            'idle_timeout': self.idle_timeout,
+            'next_click_in': None if self.scheduler.paused else round(max(deadline - now, 0), 1),
+            'claude': claude,
+            'clicks': self.clicks,
+            'target': list(self.target) if self.target else None,
+            'monitors': [monitor.name for monitor in self.topology.monitors]
+            if self.topology else [],
+            'adaptive': self.adaptive.summary() if self.adaptive else None,
+            'backend': getattr(self.backend, 'name', None),
+            'idle_source': getattr(self.idle_source, 'name', None),
+        }
+
+    def next_deadline(self):
+        """Deadline for status(); must not change scheduler state"""
+        return self.scheduler.deadline()
+
+    def execute(self, name, args):
+        """Run a control command on the main loop; returns extra reply fields"""
+        return getattr(self, 'do_' + name.replace('-', '_'))(*args)
+
+    def do_pause(self):
+        self.scheduler.pause()
+        logger.info("Paused")
+
+    def do_resume(self):
+        self.scheduler.resume()
+        logger.info("Resumed")
+
+    def do_set_timeout(self, seconds):
+        if not 0 < seconds < float('inf'):
+            raise ValueError("timeout must be a positive number of seconds")
+        self.scheduler.set_timeout(seconds)
+        logger.info("Idle timeout set to %s seconds", seconds)
+        if self.adaptive is not None and not self.adaptive_override:
+            self.adaptive_override = True
+            logger.info("Adaptive timeout still learning but no longer applied")
+        return {'idle_timeout': seconds}
+
+    def do_click_now(self):
+        return {'clicked': self.click(self.tracker.idle_time())}
+
+    def do_retarget(self, x, y):
+        width, height = self.screen
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"{x}, {y} is outside the {width}x{height} screen")
+        # An explicit position replaces the image locator and the monitor placement
+        self.locator = None
+        self.placement = (None, None, (x, y))
+        self.target = (x, y)
+        if self.indicator:
+            self.indicator.move(x, y)
+        logger.info("Target moved to %s, %s", x, y)
+        return {'target': [x, y]}
+
+    def publish_progress(self):
+        """Hand the countdown to the indicator ring; False if it draws none"""
+        if getattr(self.indicator, 'progress', None) is None:
+            return False
+        deadline = float('inf') if self.scheduler.paused else self.next_deadline()
+        self.indicator.publish(self.tracker.last_activity, deadline)
+        return True
+
+    def step(self):
+        """Sleep until the next deadline or status refresh and act on it"""
+        self.commands.run_pending(self.execute)
+        self.check_layout()
+        self.apply_adaptive()
+        ring = self.publish_progress()
+        # Without a terminal or a countdown ring there is nothing to refresh
+        refresh = self.config.refresh
+        refresh = refresh if refresh > 0 and (self.renderer.enabled or ring) else None
+
+        idle_time = self.scheduler.wait_until_idle(max_wait=refresh)
+        if idle_time is None:
+            if not self.scheduler.stopped:
+                self.show_waiting(self.tracker.idle_time())
+            return
+
+        self.metrics.ticks.inc()
+        self.metrics.tick_lateness.observe(self.scheduler.lateness)
+        self.update_running()
+        self.claude_busy = self.claude_running and not self.is_claude_ready()
+        if self.claude_busy:
+            # Claude is still working: the click would only interrupt it
+            self.metrics.busy.inc()
+            self.scheduler.defer(self.config.ready_retry)
+            self.show_waiting(idle_time)
+        elif self.claude_running:
+            self.click(idle_time)
+        else:
+            # Idle but nothing to click: look again after the next rescan
+            self.metrics.not_found.inc()
+            self.scheduler.defer(self.config.rescan)
+            self.show_waiting(idle_time)
+
+    def run(self):
+        """Set up and loop until stop() is called"""
+        if self.target is None:
+            self.setup()
+        while not self.scheduler.stopped:
+            self.step()
+
+    def stop(self):
+        self.scheduler.stop()
+
+    def close(self):
+        """Stop the indicator and release display connections"""
+        if self.indicator:
+            self.indicator.close()
+        if self.readiness is not None:
+            self.readiness.close()
+        if self.idle_source is not None:
+            self.idle_source.stop()
+        if self.backend is not None:
+            self.backend.close()
+        if self.topology is not None:
+            self.topology.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.adaptive is not None and self.adaptive.dirty:
+            self.save_adaptive()
+
+
+# Subcommand -> module with a main(argv, prog) function
+COMMANDS = {
+    'stats': 'stats',
+    'ctl': 'control',
+    'sim': 'sim',
+    'run': 'pty_proxy',
+    'soak': 'soak',
+}
+
+
+def run_command(name, argv):
+    """Run a `clicker <name> ...` subcommand"""
+    from importlib import import_module
+    module = import_module(f'.{COMMANDS[name]}', __package__)
+    return module.main(argv, prog=f'clicker {name}')
+
+
+def main(argv=None):
+    """Command-line entry point; returns the exit status"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in COMMANDS:
+        return run_command(argv[0], argv[1:])
+    config = parse_args(argv)
+    targets = None
+    if config.targets:
+        from .engine import MultiClicker, load_targets
+        try:
+            targets = load_targets(config.targets, config)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+    adaptive = None
+    if config.adaptive:
+        try:
+            adaptive = AdaptiveTimeout.load(config.adaptive_state,
+                                            percentile=config.adaptive_percentile,
+                                            minimum=config.adaptive_min,
+                                            maximum=config.adaptive_max)
+        except (OSError, ValueError) as e:
+            print(f"Error: adaptive state: {e}", file=sys.stderr)
+            return 2
+    actions = None
+    if config.actions or config.sequence or any(t.sequence for t in targets or ()):
+        from .actions import load_sequences, pick_sequence
+        try:
+            library = load_sequences(config.actions)
+            if config.sequence:
+                actions = pick_sequence(library, config.sequence)
+            for target in targets or ():
+                if target.sequence:
+                    target.actions = pick_sequence(library, target.sequence)
+        except (OSError, ValueError) as e:
+            print(f"Error: actions: {e}", file=sys.stderr)
+            return 2
+    journal = None
+    if config.journal:
+        try:
+            journal = Journal(config.journal, capacity=config.journal_size)
+        except (OSError, ValueError) as e:
+            print(f"Error: journal: {e}", file=sys.stderr)
+            return 2
+    log_listener = setup_logging(config.log_level, config.log_sink, config.log_file,
+                                 use_queue=not config.log_sync)
+    metrics = None
+    exporters = []
+    if config.metrics_port is not None or config.metrics_textfile:
+        metrics = ClickerMetrics()
+        exporters = create_exporters(metrics, config.metrics_port, config.metrics_textfile,
+                                     config.metrics_interval)
+    if targets:
+        clicker = MultiClicker(config, targets, journal=journal, metrics=metrics,
+                               adaptive=adaptive, actions=actions)
+    else:
+        clicker = Clicker(config, journal=journal, metrics=metrics, adaptive=adaptive,
+                          actions=actions)
+    control = None
+    if config.control_socket:
+        control = ControlServer(config.control_socket, clicker.status, clicker.commands.submit)
+    try:
+        for exporter in exporters:
+            exporter.start()
+        if control:
+            control.start()
+        clicker.run()
+    except KeyboardInterrupt:
+        clicker.renderer.line("Stopped by user (Ctrl+C)")
+        logger.info("Stopped by user (Ctrl+C)")
+    except Exception as e:
+        clicker.renderer.line(f"Error: {e}")
+        logger.error("Exception: %s", e, exc_info=True)
+        return 1
+    finally:
+        if control:
+            control.close()
+        clicker.close()
+        for exporter in exporters:
+            exporter.close()
+        shutdown_logging(log_listener)
+    return 0
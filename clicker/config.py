@@ -0,0 +1,324 @@
+"""Clicker configuration and command-line parsing
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import argparse
+import re
+
+from .adaptive import DEFAULT_MAXIMUM, DEFAULT_MINIMUM, DEFAULT_PERCENTILE, DEFAULT_STATE
+from .idle_source import IDLE_SOURCES
+from .indicator import RENDERERS
+from .input_backend import BACKENDS, ClickTimings
+from .control import default_socket_path
+from .journal import DEFAULT_CAPACITY
+from .log_setup import LEVELS, SINKS
+from .readiness import DEFAULT_TRANSCRIPT_DIR, READINESS_MODES
+from .topology import parse_position
+
+DEFAULT_IDLE_TIMEOUT = 20
+# 400 px left of the right edge, 100 px above the bottom of the whole screen
+DEFAULT_TARGET = (None, None, (-400, -100))
+
+
+class Config:
+    """All settings of one clicker run, with the command-line defaults"""
+
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT, match='claude', rescan=10.0,
+                 refresh=1.0, log_level='DEBUG', log_sink='file', log_file='clicker.log',
+                 log_sync=False, backend='auto', timings=None, idle_source='auto',
+                 indicator=True, overlay='auto', target=None, target_image=None,
+                 search_region=None, match_scale=4, match_threshold=0.8, readiness='both', cpu_threshold=0.03,
+                 cpu_window=5.0, transcript_dir=DEFAULT_TRANSCRIPT_DIR, transcript_quiet=10.0,
+                 ready_retry=2.0, targets=None, journal=None,
+                 journal_size=DEFAULT_CAPACITY, metrics_port=None, metrics_textfile=None,
+                 metrics_interval=15.0, control_socket=None, adaptive=False,
+                 adaptive_percentile=DEFAULT_PERCENTILE, adaptive_min=DEFAULT_MINIMUM,
+                 adaptive_max=DEFAULT_MAXIMUM, adaptive_state=DEFAULT_STATE, actions=None,
+                 sequence=None, verify=False, verify_size=(300, 80), verify_threshold=3,
+                 verify_delay=0.3, verify_max_backoff=600.0, display=None):
+        self.idle_timeout = idle_timeout
+        self.match = match
+        self.rescan = rescan
+        self.refresh = refresh
+        self.log_level = log_level
+        self.log_sink = log_sink
+        self.log_file = log_file
+        self.log_sync = log_sync
+        self.backend = backend
+        self.timings = timings or ClickTimings()
+        self.idle_source = idle_source
+        self.indicator = indicator
+        self.overlay = overlay
+        # (monitor, corner, (x, y)) as returned by parse_position()
+        self.target = target or DEFAULT_TARGET
+        self.target_image = target_image
+        self.search_region = search_region
+        self.match_scale = match_scale
+        self.match_threshold = match_threshold
+        self.readiness = readiness
+        self.cpu_threshold = cpu_threshold
+        self.cpu_window = cpu_window
+        self.transcript_dir = transcript_dir
+        self.transcript_quiet = transcript_quiet
+        self.ready_retry = ready_retry
+        self.targets = targets
+        self.journal = journal
+        self.journal_size = journal_size
+        self.metrics_port = metrics_port
+        self.metrics_textfile = metrics_textfile
+        self.metrics_interval = metrics_interval
+        self.control_socket = control_socket
+        self.adaptive = adaptive
+        self.adaptive_percentile = adaptive_percentile
+        self.adaptive_min = adaptive_min
+        self.adaptive_max = adaptive_max
+        self.adaptive_state = adaptive_state
+        # JSON file of named action sequences and the one to run (None = classic click)
+        self.actions = actions
+        self.sequence = sequence
+        self.verify = verify
+        self.verify_size = verify_size
+        self.verify_threshold = verify_threshold
+        self.verify_delay = verify_delay
+        self.verify_max_backoff = verify_max_backoff
+        # X display to click on, None = $DISPLAY
+        self.display = display
+
+    @property
+    def log_target(self):
+        """Where the log goes, for the banner"""
+        return self.log_file if self.log_sink == 'file' else self.log_sink
+
+    @classmethod
+    def from_args(cls, args):
+        """Build a Config from parsed command-line arguments"""
+        return cls(
+            idle_timeout=args.fast if args.fast is not None else DEFAULT_IDLE_TIMEOUT,
+            match=args.match,
+            rescan=args.rescan,
+            refresh=args.refresh,
+            log_level=args.log_level,
+            log_sink=args.log_sink,
+            log_file=args.log_file,
+            log_sync=args.log_sync,
+            backend=args.backend,
+            timings=ClickTimings(args.move_settle, args.click_settle, args.enter_settle),
+            idle_source=args.idle_source,
+            indicator=not args.no_indicator,
+            overlay=args.overlay,
+            target=args.target,
+            target_image=args.target_image,
+            search_region=args.search_region,
+            match_scale=args.match_scale,
+            match_threshold=args.match_threshold,
+            readiness=args.readiness,
+            cpu_threshold=args.cpu_threshold,
+            cpu_window=args.cpu_window,
+            transcript_dir=args.transcript_dir,
+            transcript_quiet=args.transcript_quiet,
+            ready_retry=args.ready_retry,
+            targets=args.targets,
+            journal=args.journal,
+            journal_size=args.journal_size,
+            metrics_port=args.metrics_port,
+            metrics_textfile=args.metrics_textfile,
+            metrics_interval=args.metrics_interval,
+            control_socket=args.control_socket,
+            adaptive=args.adaptive,
+            adaptive_percentile=args.adaptive_percentile,
+            adaptive_min=args.adaptive_min,
+            adaptive_max=args.adaptive_max,
+            adaptive_state=args.adaptive_state,
+            actions=args.actions,
+            sequence=args.sequence,
+            verify=args.verify,
+            verify_size=args.verify_size,
+            verify_threshold=args.verify_threshold,
+            verify_delay=args.verify_delay,
+            verify_max_backoff=args.verify_max_backoff,
+            display=args.display,
+        )
+
+
+def parse_target(text):
+    """argparse type for --target"""
+    try:
+        return parse_position(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_pattern(text):
+    """argparse type for --match: the text, if it compiles as a regex"""
+    try:
+        re.compile(text)
+    except re.error as e:
+        raise argparse.ArgumentTypeError(f"bad regex {text!r}: {e}")
+    return text
+
+
+def parse_percentile(text):
+    """argparse type for --adaptive-percentile"""
+    try:
+        value = float(text)
+    except ValueError:
+        value = 0.0
+    if not 0 < value < 100:
+        raise argparse.ArgumentTypeError(f"expected a percentile between 0 and 100, got {text!r}")
+    return value
+
+
+def parse_region(text):
+    """Parse 'X,Y,WIDTH,HEIGHT' into a tuple of ints"""
+    try:
+        region = tuple(int(v) for v in text.split(','))
+    except ValueError:
+        region = ()
+    if len(region) != 4 or region[2] <= 0 or region[3] <= 0:
+        raise argparse.ArgumentTypeError(f"expected X,Y,WIDTH,HEIGHT, got {text!r}")
+    return region
+
+
+def parse_size(text):
+    """Parse 'WIDTH,HEIGHT' into a tuple of ints"""
+    try:
+        size = tuple(int(v) for v in text.split(','))
+    except ValueError:
+        size = ()
+    if len(size) != 2 or size[0] < 17 or size[1] < 16:
+        raise argparse.ArgumentTypeError(f"expected WIDTH,HEIGHT of at least 17,16, got {text!r}")
+    return size
+
+
+def build_parser(prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Auto-clicker for Claude on idle',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Usage examples:
+  %(prog)s          - run with idle time = 20 seconds (default)
+  %(prog)s -f       - run with idle time = 1 second (fast mode)
+  %(prog)s -f 10    - run with idle time = 10 seconds (custom value)
+  %(prog)s stats    - clicks per hour and latency from the event journal
+  %(prog)s ctl status - query a clicker started with --control-socket
+  %(prog)s sim run  - replay a day of input through the loop offline
+  %(prog)s run -- claude - answer Claude's prompts on its terminal, no mouse
+  %(prog)s soak     - thousands of click cycles offline, fail on resource leaks
+    ''')
+
+    parser.add_argument('-f', '--fast', nargs='?', const=1, type=int, metavar='SECONDS',
+                        help='Fast mode. Without value = 1 sec, with value = specified time')
+    parser.add_argument('--match', type=parse_pattern, default='claude', metavar='PATTERN',
+                        help='Regex matched against process command lines (default: claude)')
+    parser.add_argument('--rescan', type=float, default=10.0, metavar='SECONDS',
+                        help='Interval between full /proc rescans (default: 10)')
+    parser.add_argument('--refresh', type=float, default=1.0, metavar='SECONDS',
+                        help='Status line refresh interval, 0 = only on deadlines (default: 1)')
+    parser.add_argument('--log-level', choices=LEVELS, default='DEBUG',
+                        help='Minimum level written to the log (default: DEBUG)')
+    parser.add_argument('--log-sink', choices=SINKS, default='file',
+                        help='Where log records go (default: file)')
+    parser.add_argument('--log-file', default='clicker.log', metavar='PATH',
+                        help='Log file for the "file" sink (default: clicker.log)')
+    parser.add_argument('--log-sync', action='store_true',
+                        help='Write log records on the main thread instead of a background queue')
+    parser.add_argument('--display', metavar='NAME',
+                        help='X display to click on, e.g. :1 (default: $DISPLAY); a --targets '
+                             'file can name one per session')
+    parser.add_argument('--backend', choices=BACKENDS, default='auto',
+                        help='Input backend: XTEST via python-xlib, pyautogui, or auto (default)')
+    parser.add_argument('--move-settle', type=float, default=0.3, metavar='SECONDS',
+                        help='Pause after moving to the target (default: 0.3)')
+    parser.add_argument('--click-settle', type=float, default=0.5, metavar='SECONDS',
+                        help='Pause between click and Enter (default: 0.5)')
+    parser.add_argument('--enter-settle', type=float, default=0.2, metavar='SECONDS',
+                        help='Pause after Enter before moving back (default: 0.2)')
+    parser.add_argument('--idle-source', choices=IDLE_SOURCES, default='auto',
+                        help='How user activity is detected: X server idle counter, '
+                             '/dev/input events or pynput listeners (default: auto)')
+    parser.add_argument('--no-indicator', action='store_true',
+                        help='Do not show the visual click-position indicator')
+    parser.add_argument('--overlay', choices=RENDERERS, default='auto',
+                        help='Indicator renderer: X Shape window with countdown ring, or Tk '
+                             '(default: auto, Shape with Tk fallback)')
+    parser.add_argument('--target', type=parse_target, metavar='[MONITOR:]X,Y',
+                        help='Click position; negative values count from the right/bottom edge, '
+                             'MONITOR is an output name or "primary", X,Y may be a corner with '
+                             'offsets, e.g. primary:bottom-right,400,100 (default: -400,-100)')
+    parser.add_argument('--actions', metavar='FILE',
+                        help='JSON file of named action sequences (see docs/USAGE.md)')
+    parser.add_argument('--sequence', metavar='NAME',
+                        help='Action sequence to run instead of click + Enter: one from '
+                             '--actions or a built-in (enter, press-1, yes)')
+    parser.add_argument('--target-image', metavar='PATH',
+                        help='Click where this image (e.g. a screenshot of the prompt) is '
+                             'found on screen instead of the fixed position; needs NumPy')
+    parser.add_argument('--search-region', type=parse_region, metavar='X,Y,W,H',
+                        help='Screen region searched for --target-image (default: whole screen)')
+    parser.add_argument('--match-scale', type=int, default=4, metavar='N',
+                        help='Downscale factor used for matching (default: 4)')
+    parser.add_argument('--match-threshold', type=float, default=0.8, metavar='SCORE',
+                        help='Minimum correlation score for a match, 0..1 (default: 0.8)')
+    parser.add_argument('--verify', action='store_true',
+                        help='Compare the screen around the target before and after each '
+                             'click; back off when clicks change nothing (needs NumPy, Pillow)')
+    parser.add_argument('--verify-size', type=parse_size, default=(300, 80), metavar='W,H',
+                        help='Region around the target that is compared (default: 300,80)')
+    parser.add_argument('--verify-threshold', type=int, default=3, metavar='BITS',
+                        help='Hash bits that may differ for an unchanged region (default: 3)')
+    parser.add_argument('--verify-delay', type=float, default=0.3, metavar='SECONDS',
+                        help='Time for the screen to react before the second grab (default: 0.3)')
+    parser.add_argument('--verify-max-backoff', type=float, default=600.0, metavar='SECONDS',
+                        help='Longest wait after repeated ineffective clicks (default: 600)')
+    parser.add_argument('--targets', metavar='FILE',
+                        help='JSON list of Claude sessions to supervise from one process '
+                             '(see docs/USAGE.md)')
+    parser.add_argument('--journal', metavar='PATH',
+                        help='Write the binary event journal read by `clicker stats` '
+                             'to PATH, e.g. clicker.journal (default: off)')
+    parser.add_argument('--journal-size', type=int, default=DEFAULT_CAPACITY, metavar='RECORDS',
+                        help=f'Records kept before the oldest are overwritten, for a new '
+                             f'journal (default: {DEFAULT_CAPACITY})')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics')
+    parser.add_argument('--metrics-textfile', metavar='PATH',
+                        help='Write Prometheus metrics to a node-exporter textfile')
+    parser.add_argument('--metrics-interval', type=float, default=15.0, metavar='SECONDS',
+                        help='How often the textfile is rewritten (default: 15)')
+    parser.add_argument('--control-socket', nargs='?', const=default_socket_path(),
+                        metavar='PATH',
+                        help='Accept `clicker ctl` commands on a Unix socket '
+                             f'(default path: {default_socket_path()})')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Learn the idle timeout from the pauses between your activity '
+                             '(-f is used until enough pauses were seen)')
+    parser.add_argument('--adaptive-percentile', type=parse_percentile,
+                        default=DEFAULT_PERCENTILE, metavar='P',
+                        help=f'Timeout = this percentile of your pauses (default: {DEFAULT_PERCENTILE})')
+    parser.add_argument('--adaptive-min', type=float, default=DEFAULT_MINIMUM, metavar='SECONDS',
+                        help=f'Shortest adaptive timeout (default: {DEFAULT_MINIMUM:g})')
+    parser.add_argument('--adaptive-max', type=float, default=DEFAULT_MAXIMUM, metavar='SECONDS',
+                        help=f'Longest adaptive timeout (default: {DEFAULT_MAXIMUM:g})')
+    parser.add_argument('--adaptive-state', default=DEFAULT_STATE, metavar='PATH',
+                        help=f'File the learned pauses are kept in (default: {DEFAULT_STATE})')
+    parser.add_argument('--readiness', choices=READINESS_MODES, default='both',
+                        help='Only click when Claude looks idle: low CPU, no transcript '
+                             'writes, both (default) or off')
+    parser.add_argument('--cpu-threshold', type=float, default=0.03, metavar='CPUS',
+                        help='CPU usage below which Claude counts as waiting (default: 0.03)')
+    parser.add_argument('--cpu-window', type=float, default=5.0, metavar='SECONDS',
+                        help='How long CPU usage must stay low (default: 5)')
+    parser.add_argument('--transcript-dir', default=DEFAULT_TRANSCRIPT_DIR, metavar='PATH',
+                        help=f'Session transcripts watched with inotify (default: {DEFAULT_TRANSCRIPT_DIR})')
+    parser.add_argument('--transcript-quiet', type=float, default=10.0, metavar='SECONDS',
+                        help='Time without transcript writes before Claude counts as waiting '
+                             '(default: 10)')
+    parser.add_argument('--ready-retry', type=float, default=2.0, metavar='SECONDS',
+                        help='Delay before checking again while Claude is busy (default: 2)')
+    return parser
+
+
+def parse_args(argv=None, prog=None):
+    """Parse command-line arguments into a Config"""
+    return Config.from_args(build_parser(prog).parse_args(argv))
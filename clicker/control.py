@@ -0,0 +1,275 @@
+"""Unix-socket control plane for a running clicker, and its client
+
+The daemon listens on a Unix domain socket (mode 0600). A request is one
+line, either words or a JSON object:
+
+    status
+    set-timeout 30
+    {"command": "retarget", "args": [800, 600]}
+
+Every request gets exactly one JSON line back: {"ok": true, ...} or
+{"ok": false, "error": "..."}. `status` is answered from in-memory state
+by the server thread; the other commands are queued to the main loop,
+which runs them between deadlines, so the indicator, idle source and
+display connection stay as they are.
+
+    clicker ctl status
+    clicker ctl set-timeout 45
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import queue
+import socket
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Command -> argument types
+COMMANDS = {
+    'status': (),
+    'pause': (),
+    'resume': (),
+    'set-timeout': (float,),
+    'click-now': (),
+    'retarget': (int, int),
+}
+REPLY_TIMEOUT = 10.0
+MAX_REQUEST = 4096
+
+
+def default_socket_path():
+    """$XDG_RUNTIME_DIR/clicker.sock, or a per-user path in /tmp"""
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime:
+        return os.path.join(runtime, 'clicker.sock')
+    return f'/tmp/clicker-{os.getuid()}.sock'
+
+
+def parse_request(line):
+    """Return (command, args) from a request line; raises ValueError"""
+    line = line.strip()
+    if line.startswith('{'):
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("request must be an object")
+        name, args = request.get('command'), request.get('args', [])
+        if not isinstance(name, str):
+            raise ValueError("command must be a string")
+        if not isinstance(args, list):
+            raise ValueError("args must be a list")
+    else:
+        name, *args = line.split() or ['']
+    types = COMMANDS.get(name)
+    if types is None:
+        raise ValueError(f"unknown command {name!r}, expected one of: {', '.join(COMMANDS)}")
+    if len(args) != len(types):
+        raise ValueError(f"{name} takes {len(types)} argument(s), got {len(args)}")
+    try:
+        values = [kind(arg) for kind, arg in zip(types, args)]
+    except (TypeError, ValueError):
+        raise ValueError(f"bad arguments for {name}: {args}") from None
+    # nan would spin the loop and inf stop clicking for good
+    if not all(math.isfinite(value) for value in values):
+        raise ValueError(f"bad arguments for {name}: {args} (must be finite)")
+    return name, values
+
+
+class CommandQueue:
+    """Hand commands from the server thread to the main loop and wait for the reply"""
+
+    def __init__(self, interrupt=None):
+        self._queue = queue.SimpleQueue()
+        self.interrupt = interrupt
+
+    def submit(self, name, args, timeout=REPLY_TIMEOUT):
+        done = threading.Event()
+        slot = {}
+        self._queue.put((name, args, slot, done))
+        if self.interrupt is not None:
+            self.interrupt()
+        if not done.wait(timeout):
+            return {'ok': False, 'error': 'timed out waiting for the main loop'}
+        return slot['reply']
+
+    def run_pending(self, execute):
+        """Run queued commands with execute(name, args) on the calling thread"""
+        while True:
+            try:
+                name, args, slot, done = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                result = execute(name, args)
+                slot['reply'] = dict({'ok': True}, **(result or {}))
+            except Exception as e:
+                slot['reply'] = {'ok': False, 'error': str(e)}
+            done.set()
+
+
+class ControlServer:
+    """Accept control connections on a Unix socket in a daemon thread
+
+    `status` is answered with status() directly; everything else goes
+    through submit(name, args).
+    """
+
+    def __init__(self, path, status, submit):
+        self.path = path
+        self.status = status
+        self.submit = submit
+        self._sock = None
+        self._thread = None
+
+    def _remove_stale(self):
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)
+        else:
+            raise OSError(f"another clicker is listening on {self.path}")
+        finally:
+            probe.close()
+
+    def start(self):
+        self._remove_stale()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        sock.listen(4)
+        self._sock = sock
+        self._thread = threading.Thread(target=self._serve, args=(sock,), name='control',
+                                        daemon=True)
+        self._thread.start()
+        logger.info("Control socket: %s", self.path)
+
+    def _serve(self, sock):
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                return
+            with conn:
+                conn.settimeout(REPLY_TIMEOUT)
+                try:
+                    self._handle(conn)
+                except (OSError, UnicodeDecodeError) as e:
+                    logger.debug("Control connection failed: %s", e)
+
+    def _handle(self, conn):
+        reader = conn.makefile('r', encoding='utf-8', newline='\n')
+        while True:
+            # Bounded read: an endless line must not grow the buffer
+            line = reader.readline(MAX_REQUEST + 1)
+            if not line:
+                break
+            if len(line) > MAX_REQUEST:
+                # Skip the rest of the line in pieces of the same size
+                while line and not line.endswith('\n'):
+                    line = reader.readline(MAX_REQUEST + 1)
+                reply = {'ok': False, 'error': 'request too long'}
+            elif not line.strip():
+                continue
+            else:
+                # One bad request must not take the control thread down
+                try:
+                    reply = self.handle_line(line)
+                except Exception as e:
+                    logger.exception("Control request failed: %s", line.strip())
+                    reply = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            conn.sendall(json.dumps(reply).encode() + b'\n')
+
+    def handle_line(self, line):
+        try:
+            name, args = parse_request(line)
+        except ValueError as e:
+            return {'ok': False, 'error': str(e)}
+        logger.info("Control command: %s %s", name, ' '.join(map(str, args)))
+        if name == 'status':
+            return dict({'ok': True}, **self.status())
+        return self.submit(name, args)
+
+    def close(self):
+        if self._sock is not None:
+            # shutdown() wakes the thread blocked in accept()
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+            self._thread.join(timeout=REPLY_TIMEOUT)
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+def request(path, line, timeout=REPLY_TIMEOUT):
+    """Send one request line and return the decoded reply"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(line.encode() + b'\n')
+        with sock.makefile('r', encoding='utf-8') as reader:
+            reply = reader.readline()
+    if not reply:
+        raise OSError("connection closed without a reply")
+    return json.loads(reply)
+
+
+def format_reply(reply):
+    """Human-readable lines for a reply"""
+    if not reply.get('ok'):
+        return [f"Error: {reply.get('error')}"]
+    fields = {k: v for k, v in reply.items() if k != 'ok'}
+    if not fields:
+        return ['ok']
+    lines = []
+    for key, value in fields.items():
+        if isinstance(value, list):
+            lines.append(f"{key}:")
+            lines.extend(f"  {json.dumps(item)}" for item in value)
+        else:
+            lines.append(f"{key}: {value}")
+    return lines
+
+
+def build_parser(prog=None):
+    parser = argparse.ArgumentParser(prog=prog,
+                                     description='Control a clicker started with --control-socket')
+    parser.add_argument('--socket', default=default_socket_path(), metavar='PATH',
+                        help=f'Control socket (default: {default_socket_path()})')
+    parser.add_argument('--json', action='store_true', help='Print the raw JSON reply')
+    parser.add_argument('command', choices=COMMANDS)
+    parser.add_argument('args', nargs='*')
+    return parser
+
+
+def main(argv=None, prog=None):
+    """Entry point of `clicker ctl`; returns the exit status"""
+    args = build_parser(prog).parse_args(argv)
+    line = ' '.join([args.command] + args.args)
+    try:
+        parse_request(line)
+        reply = request(args.socket, line)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(reply))
+    else:
+        for text in format_reply(reply):
+            print(text)
+    return 0 if reply.get('ok') else 1
@@ -0,0 +1,66 @@
+"""X displays serviced by one multi-target clicker
+
+A session in the `--targets` file may live on another X display, e.g.
+an Xvfb or Xephyr desktop (`"display": ":2"`). Every display gets its
+own input connection, idle counter, monitor layout, activity tracker
+and indicator; the event loop, the deadline heap, the /proc process
+watcher, the journal and the metrics stay shared. Idle time is counted
+per display, so typing on one desktop does not postpone the clicks on
+another.
+
+Only the X server knows which display input went to, so extra displays
+always use XTEST for input and the MIT-SCREEN-SAVER idle counter.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import logging
+import time
+
+from .idle_source import create_idle_source
+from .input_backend import create_backend
+from .scheduler import ActivityTracker
+from .topology import create_topology
+
+logger = logging.getLogger(__name__)
+
+
+class Display:
+    """Connections and user activity of one X display"""
+
+    def __init__(self, name, backend, topology, idle_source, tracker, indicator=None):
+        self.name = name
+        self.backend = backend
+        self.topology = topology
+        self.idle_source = idle_source
+        self.tracker = tracker
+        self.indicator = indicator
+        # Where the indicator was last put
+        self.point = None
+
+    def close(self):
+        """Stop the indicator and close every connection"""
+        if self.indicator:
+            self.indicator.close()
+        if self.idle_source is not None:
+            self.idle_source.stop()
+        self.backend.close()
+        self.topology.close()
+
+    def __repr__(self):
+        return f"Display({self.name!r}, {self.topology.size[0]}x{self.topology.size[1]})"
+
+
+def open_display(name, clock=time.monotonic):
+    """Connect to X display `name`; raises if XTEST or MIT-SCREEN-SAVER is missing"""
+    backend = create_backend('xtest', name)
+    topology = create_topology(backend, name)
+    try:
+        idle_source = create_idle_source('xscreensaver', display_name=name, clock=clock)
+    except Exception:
+        topology.close()
+        backend.close()
+        raise
+    tracker = ActivityTracker(clock=clock, sources=[idle_source])
+    display = Display(name, backend, topology, idle_source, tracker)
+    logger.info("Display %s: %s", name, ', '.join(map(repr, topology.monitors)))
+    return display
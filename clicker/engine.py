@@ -0,0 +1,368 @@
+"""One daemon supervising several Claude sessions
+
+Every session is a `Target` with its own position (or template locator),
+process pattern and idle timeout. The process watcher and transcript
+watch exist once per daemon; the activity tracker, idle source, input
+backend, monitor layout and indicator once per X display (see
+displays.py). The next due target is taken from a TargetScheduler heap.
+
+Targets are read from a JSON file:
+
+    [
+      {"name": "left", "position": [500, -100], "match": "claude.*project-a"},
+      {"name": "laptop", "position": "eDP-1:bottom-right,400,100", "match": "claude.*c"},
+      {"name": "right", "image": "prompt.png", "region": [960, 0, 960, 1080],
+       "match": "claude.*project-b", "idle_timeout": 30, "sequence": "press-1"},
+      {"name": "xvfb", "display": ":2", "match": "claude.*project-c"}
+    ]
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import functools
+import json
+import logging
+import os
+import re
+
+from .app import Clicker
+from .displays import Display, open_display
+from .process_watcher import ProcessWatcher
+from .readiness import create_readiness, open_transcript
+from .scheduler import ActivityTracker, Target, TargetScheduler
+from .topology import parse_position
+
+logger = logging.getLogger(__name__)
+
+TARGET_KEYS = ('name', 'position', 'monitor', 'match', 'idle_timeout', 'image', 'region',
+               'sequence', 'display')
+
+
+def integers(value, count):
+    """True if `value` is a JSON list of `count` integers"""
+    return (isinstance(value, (list, tuple)) and len(value) == count
+            and all(isinstance(v, int) and not isinstance(v, bool) for v in value))
+
+
+def parse_target(entry, index, config):
+    """Build a Target from one JSON object, filling gaps from the config"""
+    if not isinstance(entry, dict):
+        raise ValueError(f"target {index}: expected an object, got {entry!r}")
+    unknown = set(entry) - set(TARGET_KEYS)
+    if unknown:
+        raise ValueError(f"target {index}: unknown keys {', '.join(sorted(unknown))}")
+    position = entry.get('position', (-400, -100))
+    monitor, corner = entry.get('monitor'), None
+    if isinstance(position, str):
+        try:
+            spec_monitor, corner, position = parse_position(position)
+        except ValueError as e:
+            raise ValueError(f"target {index}: {e}") from None
+        monitor = spec_monitor or monitor
+    region = entry.get('region')
+    if not integers(position, 2) or (region is not None and not integers(region, 4)):
+        raise ValueError(f"target {index}: position is [X, Y], region is [X, Y, W, H]")
+    idle_timeout = entry.get('idle_timeout', config.idle_timeout)
+    if (isinstance(idle_timeout, bool) or not isinstance(idle_timeout, (int, float))
+            or not 0 < idle_timeout < float('inf')):
+        raise ValueError(f"target {index}: idle_timeout must be a positive number of seconds")
+    match = entry.get('match', config.match)
+    try:
+        re.compile(match)
+    except (re.error, TypeError) as e:
+        raise ValueError(f"target {index}: bad match pattern {match!r}: {e}") from None
+    display = entry.get('display')
+    if display is not None and (not isinstance(display, str) or ':' not in display):
+        raise ValueError(f"target {index}: display is an X display name like ':1'")
+    return Target(entry.get('name', f"target{index}"),
+                  position=position,
+                  monitor=monitor,
+                  corner=corner,
+                  match=match,
+                  idle_timeout=float(idle_timeout),
+                  image=entry.get('image'),
+                  region=tuple(region) if region else None,
+                  sequence=entry.get('sequence'),
+                  display=display)
+
+
+def load_targets(path, config):
+    """Read the JSON targets file; raises ValueError on bad content"""
+    with open(path) as f:
+        try:
+            entries = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty list of targets")
+    targets = [parse_target(entry, i, config) for i, entry in enumerate(entries, 1)]
+    names = [t.name for t in targets]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{path}: target names must be unique")
+    return targets
+
+
+class MultiClicker(Clicker):
+    """Clicker for several targets in one process
+
+    Reuses the single-target loop: whichever target the scheduler fired
+    is selected into `target`/`locator`, and its display into
+    `backend`/`tracker`/`topology`/`indicator`, before the click.
+    """
+
+    def __init__(self, config, targets, tracker=None, scheduler=None, watcher=None,
+                 displays=None, **kwargs):
+        tracker = tracker or ActivityTracker()
+        scheduler = scheduler or TargetScheduler(tracker, targets)
+        # One /proc walk matches every session's pattern
+        watcher = watcher or ProcessWatcher(pattern=[t.match for t in scheduler.targets],
+                                            rescan_interval=config.rescan)
+        super().__init__(config, tracker=tracker, scheduler=scheduler, watcher=watcher,
+                         **kwargs)
+        self.targets = scheduler.targets
+        # Sequence of targets without their own
+        self.default_actions = self.actions
+        # Display name -> Display; setup() adds the default one
+        self.displays = dict(displays or {})
+        self.display_name = self.default_display()
+
+    @property
+    def current(self):
+        """The target that fired last, or the next one due"""
+        return self.scheduler.current or self.scheduler.peek()[0]
+
+    def default_display(self):
+        """Display of the inherited connections; targets without one are on it
+
+        When no target is on $DISPLAY, the first named display takes its
+        place so no connection is opened to an unused display.
+        """
+        default = self.display_name or os.environ.get('DISPLAY')
+        named = [target.display for target in self.targets if target.display]
+        if named and len(named) == len(self.targets) and default not in named:
+            default = named[0]
+        for target in self.targets:
+            target.display = target.display or default
+        return default
+
+    def open_displays(self):
+        """Connect to every other display a target is on"""
+        for target in self.targets:
+            name = target.display
+            if name != self.display_name and name not in self.displays:
+                self.displays[name] = open_display(name, clock=self.tracker.clock)
+
+    def setup(self):
+        self.open_displays()
+        super().setup()
+        default = Display(self.display_name, self.backend, self.topology, self.idle_source,
+                          self.tracker, self.indicator)
+        default.point = self.target
+        self.displays[self.display_name] = default
+        for name, display in self.displays.items():
+            if display.indicator is None and name != self.display_name and self.config.indicator:
+                from .indicator import Indicator
+                point = next(t.point for t in self.targets if t.display == name)
+                display.indicator = Indicator(*point, renderer=self.config.overlay, display=name)
+                display.indicator.start()
+                display.point = point
+        self.hook_resume()
+        for target in self.targets:
+            self.scheduler.track(target, self.displays[target.display].tracker)
+        if len(self.displays) > 1:
+            logger.info("Displays: %s", ', '.join(map(repr, self.displays.values())))
+        self.select(self.current)
+
+    def hook_resume(self):
+        """Report returns of the user on every display to the journal and estimator"""
+        if self.journal is None and self.adaptive is None:
+            return
+        for display in self.displays.values():
+            tracker = display.tracker
+            if tracker.on_resume is None or tracker.on_resume == self.on_resume:
+                # self.tracker follows the selected display; bind this one's
+                tracker.on_resume = functools.partial(self.on_resume, tracker=tracker)
+
+    def grab(self, region):
+        from .locator import grab_screen
+        return grab_screen(region, display=self.current.display)
+
+    def display_of(self, target):
+        """Display `target` is on; the inherited connections until setup() ran"""
+        return self.displays.get(target.display)
+
+    def use_display(self, display):
+        """Point the single-display fields at `display`"""
+        self.backend = display.backend
+        self.topology = display.topology
+        self.idle_source = display.idle_source
+        self.tracker = display.tracker
+        self.indicator = display.indicator
+        self.screen = display.topology.size
+
+    def place_targets(self):
+        for target in self.targets:
+            display = self.display_of(target)
+            topology = display.topology if display is not None else self.topology
+            target.point = topology.resolve(target.position, target.monitor, target.corner)
+        self.target = self.current.point
+
+    def check_layout(self):
+        """Follow monitor changes on every display"""
+        changed = False
+        for display in self.displays.values():
+            try:
+                if display.topology.poll():
+                    changed = True
+                    logger.info("Display %s layout changed: %s", display.name,
+                                ', '.join(map(repr, display.topology.monitors)))
+            except Exception as e:
+                logger.debug("Display %s layout check failed: %s", display.name, e)
+        if changed:
+            self.place_targets()
+            self.select(self.current)
+        return changed
+
+    def setup_targets(self):
+        screen_width, screen_height = self.screen
+        self.place_targets()
+        for target in self.targets:
+            if target.locator is None and target.image:
+                from .locator import TemplateLocator
+                display = self.display_of(target)
+                width, height = display.topology.size if display else (screen_width,
+                                                                       screen_height)
+                region = target.region or (0, 0, width, height)
+                # self.grab() shoots the display of the target being located
+                target.locator = TemplateLocator(target.image, region,
+                                                 scale=self.config.match_scale,
+                                                 threshold=self.config.match_threshold,
+                                                 grab=self.grab)
+            logger.info("Target %s at %s, %s, match %r, idle timeout %ss", target.name,
+                        *target.point, target.match, target.idle_timeout)
+
+    def setup_readiness(self):
+        config = self.config
+        mode = config.readiness
+        # One inotify watch for all sessions; CPU is sampled per session
+        transcript = None
+        if mode in ('transcript', 'both'):
+            transcript = open_transcript(config.transcript_dir, config.transcript_quiet)
+            if transcript is None:
+                mode = 'cpu' if mode == 'both' else 'off'
+        for target in self.targets:
+            if target.readiness is None:
+                target.readiness = create_readiness(mode, self.watcher,
+                                                    cpu_threshold=config.cpu_threshold,
+                                                    cpu_window=config.cpu_window,
+                                                    pattern=target.match,
+                                                    transcript=transcript)
+        logger.info("Readiness: %s", ', '.join(
+            part.name for part in self.targets[0].readiness.parts) or 'off')
+
+    def is_claude_running(self):
+        try:
+            return self.watcher.is_running(self.current.match)
+        except Exception:
+            return False
+
+    def claude_pids(self):
+        return self.watcher.pids_for(self.current.match)
+
+    def update_running(self):
+        target = self.current
+        running = self.check_running()
+        if running != target.running:
+            self.record('process-found' if running else 'process-lost',
+                        target=self.target_index())
+        self.claude_running = target.running = running
+        return running
+
+    def target_index(self):
+        return self.targets.index(self.current)
+
+    def is_claude_ready(self):
+        readiness = self.current.readiness
+        try:
+            return readiness is None or readiness.ready()
+        except Exception as e:
+            logger.debug("Readiness check failed: %s", e)
+            return True
+
+    def select(self, target):
+        """Point the single-target fields, display and indicator at `target`"""
+        display = self.display_of(target)
+        if display is None:
+            if self.indicator and target.point != self.target:
+                self.indicator.move(*target.point)
+        else:
+            self.use_display(display)
+            if display.indicator and target.point != display.point:
+                display.indicator.move(*target.point)
+            display.point = target.point
+        self.locator = target.locator
+        self.actions = target.actions or self.default_actions
+        self.target = target.point
+
+    def locate_target(self):
+        target = self.current
+        self.select(target)
+        point = super().locate_target()
+        target.point = self.target
+        display = self.display_of(target)
+        if display is not None:
+            display.point = self.target
+        return point
+
+    def click(self, idle_time):
+        target = self.current
+        # Hide the indicator and suppress activity on the target's own display
+        self.select(target)
+        clicked = super().click(idle_time)
+        if clicked:
+            target.clicks += 1
+            logger.info("Clicked target %s", target.name)
+        return clicked
+
+    def rearm(self):
+        # Other sessions keep their countdown; only this one starts over
+        self.scheduler.rearm(self.current)
+        self.select(self.scheduler.peek()[0])
+
+    def next_deadline(self):
+        # Called from the control thread: compute it without touching the heap
+        return min(self.scheduler.due(target) for target in self.targets)
+
+    def status(self):
+        status = super().status()
+        now = self.scheduler.clock()
+        status['targets'] = [{
+            'name': target.name,
+            'target': list(target.point),
+            'match': target.match,
+            'display': target.display,
+            'idle_timeout': target.idle_timeout,
+            'running': target.running,
+            'clicks': target.clicks,
+            'next_click_in': round(max(self.scheduler.due(target) - now, 0), 1),
+        } for target in self.targets]
+        return status
+
+    def do_retarget(self, x, y):
+        reply = super().do_retarget(x, y)
+        target = self.current
+        target.point = target.position = (x, y)
+        target.monitor = target.corner = None
+        target.locator = None
+        return dict(reply, name=target.name)
+
+    def close(self):
+        for target in self.targets:
+            if target.readiness is not None:
+                target.readiness.close()
+        default = self.displays.pop(self.display_name, None)
+        if default is not None:
+            self.use_display(default)
+        for display in self.displays.values():
+            display.close()
+        self.displays.clear()
+        super().close()
@@ -0,0 +1,189 @@
+"""Sources of "when was the user last active"
+
+Instead of running a Python callback for every pointer motion event, the
+scheduler samples an idle source once per deadline check:
+
+- `XScreenSaverIdleSource` asks the X server for its own idle counter
+- `EvdevIdleSource` drains pending /dev/input events and keeps the newest
+  timestamp
+- `PynputIdleSource` keeps the pynput listeners as a fallback
+
+Every source returns the monotonic time of the last input, or None.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import glob
+import logging
+import os
+import struct
+import time
+
+logger = logging.getLogger(__name__)
+
+IDLE_SOURCES = ('auto', 'xscreensaver', 'evdev', 'pynput')
+
+# struct input_event: struct timeval, __u16 type, __u16 code, __s32 value
+INPUT_EVENT = struct.Struct('llHHi')
+EV_KEY, EV_REL, EV_ABS = 1, 2, 3
+# _IOW('E', 0xa0, int): switch event timestamps to CLOCK_MONOTONIC
+EVIOCSCLOCKID = 0x400445a0
+
+
+class IdleSource:
+    """Interface every idle source implements"""
+
+    name = 'base'
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def last_activity(self):
+        """Monotonic time of the last user input, or None if unknown"""
+        raise NotImplementedError
+
+
+class XScreenSaverIdleSource(IdleSource):
+    """Read the X server's idle counter via XScreenSaverQueryInfo"""
+
+    name = 'xscreensaver'
+
+    def __init__(self, display_name=None, clock=time.monotonic):
+        from Xlib import display
+
+        self.clock = clock
+        self.display = display.Display(display_name)
+        if not self.display.has_extension('MIT-SCREEN-SAVER'):
+            self.display.close()
+            raise RuntimeError("X server has no MIT-SCREEN-SAVER extension")
+        self.root = self.display.screen().root
+
+    def idle_ms(self):
+        return self.root.screensaver_query_info().idle
+
+    def last_activity(self):
+        return self.clock() - self.idle_ms() / 1000.0
+
+    def stop(self):
+        self.display.close()
+
+
+class EvdevIdleSource(IdleSource):
+    """Drain pending evdev events at sample time and keep the newest timestamp"""
+
+    name = 'evdev'
+
+    def __init__(self, paths=None, clock=time.monotonic):
+        self.clock = clock
+        self.paths = paths if paths is not None else sorted(glob.glob('/dev/input/event*'))
+        self._fds = {}
+        self._last = None
+
+    def start(self):
+        for path in self.paths:
+            try:
+                fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            except OSError as e:
+                logger.debug("Cannot open %s: %s", path, e)
+                continue
+            self._fds[fd] = self._use_monotonic(fd)
+        if not self._fds:
+            raise RuntimeError("No readable /dev/input/event* devices")
+
+    @staticmethod
+    def _use_monotonic(fd):
+        """Ask the kernel for monotonic timestamps; False if unsupported"""
+        import fcntl
+        try:
+            fcntl.ioctl(fd, EVIOCSCLOCKID, struct.pack('i', time.CLOCK_MONOTONIC))
+            return True
+        except OSError:
+            return False
+
+    def _drain(self, fd, monotonic):
+        newest = None
+        while True:
+            try:
+                data = os.read(fd, INPUT_EVENT.size * 64)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            usable = len(data) - len(data) % INPUT_EVENT.size
+            for sec, usec, ev_type, _, _ in INPUT_EVENT.iter_unpack(data[:usable]):
+                if ev_type in (EV_KEY, EV_REL, EV_ABS):
+                    newest = sec + usec / 1e6
+        if newest is not None and not monotonic:
+            newest -= time.time() - self.clock()
+        return newest
+
+    def last_activity(self):
+        for fd, monotonic in self._fds.items():
+            newest = self._drain(fd, monotonic)
+            if newest is not None and (self._last is None or newest > self._last):
+                self._last = newest
+        return self._last
+
+    def stop(self):
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = {}
+
+
+class PynputIdleSource(IdleSource):
+    """Fallback: pynput listeners storing a timestamp on every event"""
+
+    name = 'pynput'
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._last = None
+        self._listeners = []
+
+    def touch(self, *args):
+        self._last = self.clock()
+
+    def start(self):
+        from pynput import keyboard, mouse
+
+        self._listeners = [
+            mouse.Listener(on_move=self.touch, on_click=self.touch, on_scroll=self.touch),
+            keyboard.Listener(on_press=self.touch),
+        ]
+        for listener in self._listeners:
+            listener.start()
+
+    def last_activity(self):
+        return self._last
+
+    def stop(self):
+        for listener in self._listeners:
+            listener.stop()
+        self._listeners = []
+
+
+def create_idle_source(name='auto', display_name=None, clock=time.monotonic):
+    """Create and start an idle source; 'auto' tries them cheapest first"""
+    candidates = {
+        'xscreensaver': lambda: XScreenSaverIdleSource(display_name, clock=clock),
+        'evdev': lambda: EvdevIdleSource(clock=clock),
+        'pynput': lambda: PynputIdleSource(clock=clock),
+    }
+    if name == 'auto':
+        order = ['xscreensaver', 'evdev', 'pynput']
+    elif name in candidates:
+        order = [name]
+    else:
+        raise ValueError(f"Unknown idle source: {name}")
+    for candidate in order:
+        try:
+            source = candidates[candidate]()
+            source.start()
+            return source
+        except Exception as e:
+            if name != 'auto':
+                raise
+            logger.info("Idle source %s unavailable: %s", candidate, e)
+    raise RuntimeError("No idle source available")
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""Visual indicator showing target click position
+
+Runs as a long-lived process controlled through commands on stdin, one
+per line: `hide`, `show`, `move X Y`, `countdown`, `sync` and `quit`. End of input
+also quits, so the indicator never outlives the clicker that started it. `sync` is
+answered with `synced` on stdout once everything before it reached the X server.
+
+Two renderers: a bare Xlib window cut to shape with the X Shape extension
+(small and quick to start, draws a countdown ring) and the Tk window as
+fallback. The ring follows `ProgressSegment`, a few bytes of shared memory
+the clicker rewrites only when the countdown changes; the overlay computes
+each frame itself while a countdown runs and sleeps on its input while
+none does, so `countdown` wakes it when one starts.
+
+    indicator.py X Y [--renderer auto|shape|tk] [--progress PATH]
+"""
+import logging
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+COMMANDS = {'hide': 0, 'show': 0, 'move': 2, 'countdown': 0, 'sync': 0, 'quit': 0}
+RENDERERS = ('auto', 'shape', 'tk')
+
+# sequence, start and deadline of the countdown on the CLOCK_MONOTONIC time line
+PROGRESS = struct.Struct('<Qdd')
+RING_STEPS = 60
+FRAME_INTERVAL = 0.1
+# Indicator diameter; the window adds a 5 px margin on each side
+SIZE = 30
+SYNC_TIMEOUT = 0.5
+
+
+def parse_command(line):
+    """Parse a command line into (name, args); return None if invalid"""
+    parts = line.split()
+    if not parts or parts[0] not in COMMANDS:
+        return None
+    name, args = parts[0], parts[1:]
+    if len(args) != COMMANDS[name]:
+        return None
+    try:
+        return name, tuple(int(a) for a in args)
+    except ValueError:
+        return None
+
+
+def read_commands(fd, buffer):
+    """Commands completed by the data now readable on fd; None at end of input"""
+    data = os.read(fd, 4096)
+    if not data:
+        return None
+    buffer.extend(data)
+    commands = []
+    while b'\n' in buffer:
+        line, _, rest = bytes(buffer).partition(b'\n')
+        buffer[:] = rest
+        command = parse_command(line.decode('utf-8', 'replace'))
+        if command:
+            commands.append(command)
+    return commands
+
+
+class ProgressSegment:
+    """Idle countdown shared between the clicker and the indicator process
+
+    The writer bumps the sequence number to odd, writes and bumps it to
+    even again; a reader retries while it is odd or changed (seqlock).
+    """
+
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.writable = writable
+        fd = os.open(path, os.O_RDWR if writable else os.O_RDONLY)
+        try:
+            self._map = mmap.mmap(fd, PROGRESS.size,
+                                  access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        self._sequence = PROGRESS.unpack_from(self._map)[0]
+
+    @classmethod
+    def create(cls):
+        """New segment in /dev/shm (or the temp directory), removed by close()"""
+        import tempfile
+        directory = '/dev/shm' if os.path.isdir('/dev/shm') else None
+        fd, path = tempfile.mkstemp(prefix='clicker-progress-', dir=directory)
+        try:
+            os.ftruncate(fd, PROGRESS.size)
+        finally:
+            os.close(fd)
+        return cls(path, writable=True)
+
+    def publish(self, start, deadline):
+        """Countdown runs from `start` to `deadline` (monotonic); inf hides the ring"""
+        self._sequence += 1
+        struct.pack_into('<Q', self._map, 0, self._sequence)
+        PROGRESS.pack_into(self._map, 0, self._sequence, start, deadline)
+        self._sequence += 1
+        struct.pack_into('<Q', self._map, 0, self._sequence)
+
+    def read(self):
+        """(start, deadline), or None if nothing was published yet"""
+        for _ in range(100):
+            sequence, start, deadline = PROGRESS.unpack_from(self._map)
+            if sequence % 2 == 0 and struct.unpack_from('<Q', self._map)[0] == sequence:
+                return (start, deadline) if sequence else None
+        return None
+
+    def fraction(self, now):
+        """Share of the countdown elapsed at `now`, or None without a countdown"""
+        countdown = self.read()
+        if countdown is None:
+            return None
+        start, deadline = countdown
+        if deadline == float('inf') or deadline <= start:
+            return None
+        return min(max((now - start) / (deadline - start), 0.0), 1.0)
+
+    def close(self):
+        self._map.close()
+        if self.writable:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+def create_shape_indicator(x, y, size=SIZE, commands=None, progress=None):
+    """Draw the indicator on a bare Xlib window shaped with the Shape extension
+
+    Raises RuntimeError when the X server has no Shape extension, Xlib
+    errors when there is no display.
+    """
+    import select
+    from Xlib import X, display
+    from Xlib.ext import shape
+
+    disp = display.Display()
+    if not disp.has_extension('SHAPE'):
+        disp.close()
+        raise RuntimeError("X server has no Shape extension")
+    screen = disp.screen()
+    red = screen.default_colormap.alloc_named_color('red').pixel
+    white = screen.white_pixel
+
+    window_size = size + 10
+    margin = 5
+    center = window_size // 2
+    window = screen.root.create_window(
+        x - center, y - center, window_size, window_size, 0, screen.root_depth,
+        X.InputOutput, X.CopyFromParent, background_pixel=white,
+        override_redirect=True, event_mask=X.ExposureMask)
+    # Empty input shape: the pointer and clicks go to the window below
+    window.shape_rectangles(shape.SO.Set, shape.SK.Input, X.Unsorted, 0, 0, [])
+    gc = window.create_gc(foreground=red, line_width=2)
+    mask = window.create_pixmap(window_size, window_size, 1)
+    mask_gc = mask.create_gc(foreground=0)
+    state = {'step': 0, 'visible': True}
+
+    def ring(drawable, gc, step):
+        # Pie clockwise from 12 o'clock; the circle covers all but its outer band
+        if step:
+            drawable.fill_arc(gc, 0, 0, window_size, window_size,
+                              90 * 64, -360 * 64 * step // RING_STEPS)
+
+    def reshape(step):
+        mask_gc.change(foreground=0)
+        mask.fill_rectangle(mask_gc, 0, 0, window_size, window_size)
+        mask_gc.change(foreground=1)
+        mask.fill_arc(mask_gc, margin - 1, margin - 1, window_size - 2 * margin + 2,
+                      window_size - 2 * margin + 2, 0, 360 * 64)
+        ring(mask, mask_gc, step)
+        window.shape_mask(shape.SO.Set, shape.SK.Bounding, 0, 0, mask)
+
+    def draw():
+        gc.change(foreground=red)
+        ring(window, gc, state['step'])
+        inner = window_size - 2 * margin
+        gc.change(foreground=white)
+        window.fill_arc(gc, margin, margin, inner, inner, 0, 360 * 64)
+        gc.change(foreground=red)
+        window.arc(gc, margin, margin, inner, inner, 0, 360 * 64)
+        window.line(gc, center, margin, center, window_size - margin)
+        window.line(gc, margin, center, window_size - margin, center)
+
+    def execute(command):
+        name, args = command
+        if name == 'hide':
+            window.unmap()
+            state['visible'] = False
+        elif name == 'show':
+            window.map()
+            window.configure(stack_mode=X.Above)
+            state['visible'] = True
+        elif name == 'move':
+            window.configure(x=args[0] - center, y=args[1] - center)
+        elif name == 'sync':
+            disp.sync()
+            print('synced', flush=True)
+        elif name == 'quit':
+            return False
+        return True
+
+    reshape(0)
+    window.map()
+    disp.sync()
+    print('ready', flush=True)
+
+    fds = [disp.fileno()] + ([commands] if commands is not None else [])
+    buffer = bytearray()
+    running = True
+    # Look at the segment once; then wake per frame only while a countdown runs
+    timeout = FRAME_INTERVAL if progress is not None else None
+    while running:
+        readable, _, _ = select.select(fds, [], [], timeout)
+        while disp.pending_events():
+            event = disp.next_event()
+            if event.type == X.Expose and event.count == 0:
+                draw()
+        if commands in readable:
+            received = read_commands(commands, buffer)
+            running = received is not None and all(execute(c) for c in received)
+        timeout = None
+        if progress is not None and state['visible']:
+            fraction = progress.fraction(time.monotonic())
+            step = 0 if fraction is None else int(fraction * RING_STEPS)
+            if step != state['step']:
+                state['step'] = step
+                reshape(step)
+                draw()
+            if fraction is not None:
+                timeout = FRAME_INTERVAL
+        disp.flush()
+    disp.close()
+
+
+def create_indicator(x, y, size=SIZE, commands=None):
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.overrideredirect(True)
+    root.attributes('-topmost', True)
+    root.attributes('-alpha', 0.6)
+
+    window_size = size + 10
+
+    def place(x, y):
+        root.geometry(f"{window_size}x{window_size}+{x - window_size//2}+{y - window_size//2}")
+
+    place(x, y)
+
+    canvas = tk.Canvas(root, width=window_size, height=window_size,
+                      bg='black', highlightthickness=0)
+    canvas.pack()
+
+    # Draw white circle with red outline
+    margin = 5
+    canvas.create_oval(margin, margin, window_size-margin, window_size-margin,
+                      fill='white', outline='red', width=2)
+
+    # Add crosshair
+    center = window_size // 2
+    canvas.create_line(center, margin, center, window_size-margin, fill='red', width=1)
+    canvas.create_line(margin, center, window_size-margin, center, fill='red', width=1)
+
+    if commands is not None:
+        buffer = bytearray()
+
+        def execute(command):
+            name, args = command
+            if name == 'hide':
+                root.withdraw()
+            elif name == 'show':
+                root.deiconify()
+                root.attributes('-topmost', True)
+            elif name == 'move':
+                place(*args)
+            elif name == 'sync':
+                root.update_idletasks()
+                print('synced', flush=True)
+            elif name == 'quit':
+                root.destroy()
+
+        def on_readable(fd, mask):
+            received = read_commands(fd, buffer)
+            if received is None:
+                root.destroy()
+                return
+            for command in received:
+                execute(command)
+
+        # Event-driven: Tk wakes up only when the pipe has data
+        root.createfilehandler(commands, tk.READABLE, on_readable)
+
+    root.update()
+    print('ready', flush=True)
+    root.mainloop()
+
+
+class Indicator:
+    """Handle to a persistent indicator process"""
+
+    def __init__(self, x, y, script=None, renderer='auto', display=None):
+        self.x = x
+        self.y = y
+        # X display to draw on, None = $DISPLAY
+        self.display = display
+        self.script = script or os.path.abspath(__file__)
+        self.renderer = renderer
+        self.process = None
+        self.restarts = 0
+        # Countdown ring for the shape renderer, created on first start
+        self.progress = None
+        # A countdown was published last; the overlay is drawing frames
+        self.counting = False
+        # (start, deadline) last written to the segment
+        self.published = None
+        # Unread output of the process and the sync requests sent/answered
+        self.replies = bytearray()
+        self.syncs = self.synced = 0
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Start the indicator process unless it is already running"""
+        if self.alive():
+            return True
+        if not os.path.exists(self.script):
+            return False
+        if self.process is not None:
+            self.restarts += 1
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+        command = [sys.executable, self.script, str(self.x), str(self.y),
+                   '--renderer', self.renderer]
+        if self.renderer != 'tk':
+            if self.progress is None:
+                try:
+                    self.progress = ProgressSegment.create()
+                    self.published = None
+                except OSError as e:
+                    logger.warning("No countdown ring: %s", e)
+            if self.progress is not None:
+                command += ['--progress', self.progress.path]
+        self.replies.clear()
+        self.syncs = self.synced = 0
+        try:
+            self.process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=dict(os.environ, DISPLAY=self.display) if self.display else None
+            )
+            logger.debug("Visual indicator started")
+            return True
+        except Exception as e:
+            logger.warning("Could not start indicator: %s", e)
+            self.process = None
+            return False
+
+    def send(self, command):
+        """Send one command, restarting the process only if it died"""
+        if not self.alive() and not self.start():
+            return False
+        try:
+            self.process.stdin.write(command.encode() + b'\n')
+            self.process.stdin.flush()
+            return True
+        except (BrokenPipeError, OSError) as e:
+            logger.warning("Could not send %r to indicator: %s", command, e)
+            return False
+
+    def hide(self):
+        return self.send('hide')
+
+    def show(self):
+        return self.send('show')
+
+    def move(self, x, y):
+        self.x, self.y = x, y
+        return self.send(f'move {x} {y}')
+
+    def box(self):
+        """Screen rectangle (left, top, width, height) the indicator window covers"""
+        window_size = SIZE + 10
+        return (self.x - window_size // 2, self.y - window_size // 2,
+                window_size, window_size)
+
+    def sync(self, timeout=SYNC_TIMEOUT):
+        """Wait until the process carried out every command sent so far
+
+        Returns False if it did not answer within `timeout` seconds.
+        """
+        import select
+        if not self.send('sync'):
+            return False
+        self.syncs += 1
+        fd = self.process.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        while self.synced < self.syncs:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                logger.debug("Indicator did not confirm within %.1fs", timeout)
+                return False
+            data = os.read(fd, 4096)
+            if not data:
+                return False
+            self.replies.extend(data)
+            while b'\n' in self.replies:
+                line, _, rest = bytes(self.replies).partition(b'\n')
+                self.replies[:] = rest
+                if line.strip() == b'synced':
+                    self.synced += 1
+        return True
+
+    def publish(self, start, deadline):
+        """Set the countdown drawn by the ring
+
+        The segment is only rewritten when the countdown changed, and only
+        the start of a countdown after none is sent to the process, which
+        sleeps on its input in between.
+        """
+        if self.progress is None or (start, deadline) == self.published:
+            return
+        self.published = (start, deadline)
+        self.progress.publish(start, deadline)
+        counting = start < deadline < float('inf')
+        if counting and not self.counting:
+            self.send('countdown')
+        self.counting = counting
+
+    def close(self):
+        """Ask the indicator to quit and wait for it"""
+        if self.progress is not None:
+            self.progress.close()
+            self.progress = None
+        if not self.alive():
+            return
+        try:
+            self.process.stdin.write(b'quit\n')
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except Exception:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=1)
+            except Exception as e:
+                logger.warning("Could not stop indicator: %s", e)
+        logger.debug("Visual indicator stopped")
+
+
+def main(argv):
+    """Indicator process: indicator.py X Y [--renderer R] [--progress PATH]"""
+    if len(argv) < 2 or len(argv) % 2:
+        return 1
+    x, y = int(argv[0]), int(argv[1])
+    options = dict(zip(argv[2::2], argv[3::2]))
+    renderer = options.get('--renderer', 'auto')
+    commands = sys.stdin.fileno()
+    if renderer != 'tk':
+        progress = None
+        if '--progress' in options:
+            try:
+                progress = ProgressSegment(options['--progress'])
+            except (OSError, ValueError) as e:
+                print(f"No countdown ring: {e}", file=sys.stderr)
+        try:
+            create_shape_indicator(x, y, commands=commands, progress=progress)
+            return 0
+        except Exception as e:
+            if renderer == 'shape':
+                print(f"Shape overlay failed: {e}", file=sys.stderr)
+                return 1
+    create_indicator(x, y, commands=commands)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,244 @@
+"""Pluggable input backends for the click sequence
+
+`XTestBackend` injects events straight into the X server through the
+XTEST extension (python-xlib) with no hidden delays. `PyAutoGUIBackend`
+is the fallback and has pyautogui's implicit `PAUSE` switched off.
+`RecordingBackend` records calls for tests and benchmarks. All waiting
+between steps is explicit, see `ClickTimings`.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('auto', 'xtest', 'pyautogui')
+
+
+class FailSafeError(Exception):
+    """Pointer is in a screen corner; the user wants the clicker to back off"""
+
+
+class ClickTimings:
+    """Settle delays (seconds) used by the click sequence"""
+
+    def __init__(self, move_settle=0.3, click_settle=0.5, enter_settle=0.2):
+        self.move_settle = move_settle
+        self.click_settle = click_settle
+        self.enter_settle = enter_settle
+
+    def total(self):
+        return self.move_settle + self.click_settle + self.enter_settle
+
+    def __repr__(self):
+        return (f"ClickTimings(move_settle={self.move_settle}, "
+                f"click_settle={self.click_settle}, enter_settle={self.enter_settle})")
+
+
+class InputBackend:
+    """Interface every input backend implements"""
+
+    name = 'base'
+
+    def size(self):
+        raise NotImplementedError
+
+    def position(self):
+        raise NotImplementedError
+
+    def move(self, x, y):
+        raise NotImplementedError
+
+    def click(self):
+        raise NotImplementedError
+
+    def press(self, key):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def fail_safe_check(self):
+        """Raise FailSafeError if the pointer sits in a screen corner"""
+        width, height = self.size()
+        if self.position() in ((0, 0), (0, height - 1), (width - 1, 0),
+                               (width - 1, height - 1)):
+            raise FailSafeError("Pointer is in a screen corner")
+
+
+class XTestBackend(InputBackend):
+    """Inject events directly through the X server's XTEST extension"""
+
+    name = 'xtest'
+
+    # pyautogui key names that differ from X keysym names
+    KEYSYMS = {'enter': 'Return', 'esc': 'Escape', 'space': 'space', 'tab': 'Tab'}
+
+    def __init__(self, display_name=None):
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+
+        self._X = X
+        self._XK = XK
+        self._xtest = xtest
+        self.display = display.Display(display_name)
+        if not self.display.has_extension('XTEST'):
+            self.display.close()
+            raise RuntimeError("X server has no XTEST extension")
+        self.root = self.display.screen().root
+
+    def size(self):
+        screen = self.display.screen()
+        return screen.width_in_pixels, screen.height_in_pixels
+
+    def position(self):
+        pointer = self.root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def _fake(self, event_type, detail=0, **kwargs):
+        self._xtest.fake_input(self.display, event_type, detail, **kwargs)
+
+    def move(self, x, y):
+        self.fail_safe_check()
+        self._fake(self._X.MotionNotify, x=x, y=y)
+        self.display.sync()
+
+    def click(self):
+        self.fail_safe_check()
+        self._fake(self._X.ButtonPress, 1)
+        self._fake(self._X.ButtonRelease, 1)
+        self.display.sync()
+
+    def keysym(self, key):
+        keysym = self._XK.string_to_keysym(self.KEYSYMS.get(key, key))
+        if not keysym and len(key) == 1 and ' ' <= key <= '\xff':
+            # Latin-1 characters are their own keysyms ('?' is named 'question')
+            keysym = ord(key)
+        return keysym
+
+    def press(self, key):
+        self.fail_safe_check()
+        keysym = self.keysym(key)
+        keycode = self.display.keysym_to_keycode(keysym)
+        if not keycode:
+            raise ValueError(f"No keycode for key {key!r}")
+        # Capitals and most symbols are on the shifted level of their key
+        shift = None
+        if (self.display.keycode_to_keysym(keycode, 0) != keysym
+                and self.display.keycode_to_keysym(keycode, 1) == keysym):
+            shift = self.display.keysym_to_keycode(self._XK.XK_Shift_L)
+        if shift:
+            self._fake(self._X.KeyPress, shift)
+        self._fake(self._X.KeyPress, keycode)
+        self._fake(self._X.KeyRelease, keycode)
+        if shift:
+            self._fake(self._X.KeyRelease, shift)
+        self.display.sync()
+
+    def close(self):
+        self.display.close()
+
+
+class PyAutoGUIBackend(InputBackend):
+    """pyautogui with its implicit per-call PAUSE disabled"""
+
+    name = 'pyautogui'
+
+    def __init__(self, pause=0.0):
+        import pyautogui
+
+        self._pyautogui = pyautogui
+        pyautogui.PAUSE = pause
+
+    def _call(self, func, *args):
+        try:
+            return func(*args)
+        except self._pyautogui.FailSafeException as e:
+            raise FailSafeError(str(e)) from e
+
+    def size(self):
+        return tuple(self._pyautogui.size())
+
+    def position(self):
+        return tuple(self._pyautogui.position())
+
+    def move(self, x, y):
+        self._call(self._pyautogui.moveTo, x, y)
+
+    def click(self):
+        self._call(self._pyautogui.click)
+
+    def press(self, key):
+        self._call(self._pyautogui.press, key)
+
+
+class RecordingBackend(InputBackend):
+    """Fake backend that records every call instead of touching the display"""
+
+    name = 'recording'
+
+    def __init__(self, size=(1920, 1080), position=(100, 100), clock=time.monotonic):
+        self._size = size
+        self.pointer = position
+        self.clock = clock
+        self.calls = []
+
+    def _record(self, *call):
+        self.calls.append((self.clock(),) + call)
+
+    def size(self):
+        return self._size
+
+    def position(self):
+        return self.pointer
+
+    def move(self, x, y):
+        self.fail_safe_check()
+        self._record('move', x, y)
+        self.pointer = (x, y)
+
+    def click(self):
+        self.fail_safe_check()
+        self._record('click')
+
+    def press(self, key):
+        self.fail_safe_check()
+        self._record('press', key)
+
+    def actions(self):
+        """Recorded calls without timestamps"""
+        return [call[1:] for call in self.calls]
+
+
+def create_backend(name='auto', display_name=None):
+    """Create the requested backend; 'auto' prefers XTEST"""
+    if name in ('auto', 'xtest'):
+        try:
+            return XTestBackend(display_name)
+        except Exception as e:
+            if name == 'xtest':
+                raise
+            logger.info("XTEST backend unavailable (%s), falling back to pyautogui", e)
+    if name in ('auto', 'pyautogui'):
+        return PyAutoGUIBackend()
+    raise ValueError(f"Unknown input backend: {name}")
+
+
+def perform_click(backend, x, y, timings, suppress=None, sleep=time.sleep,
+                  clock=time.perf_counter):
+    """Move, click, press Enter and move back; return the elapsed seconds"""
+    start = clock()
+    prev_x, prev_y = backend.position()
+    backend.move(x, y)
+    sleep(timings.move_settle)
+    backend.click()
+    sleep(timings.click_settle)
+    backend.press('enter')
+    sleep(timings.enter_settle)
+    if suppress is None:
+        backend.move(prev_x, prev_y)
+    else:
+        with suppress():
+            backend.move(prev_x, prev_y)
+    return clock() - start
@@ -0,0 +1,98 @@
+"""Append-only binary event journal in a memory-mapped ring file
+
+Every record has the same size, so appending is one struct.pack_into()
+into the mapping and the file never grows past its capacity: once full,
+the oldest records are overwritten. The header keeps the total number of
+records ever written; readers use it to find the oldest slot.
+
+Layout (little-endian):
+
+    header  64 bytes: magic, version, record size, capacity, count
+    record  20 bytes: time (f8, Unix seconds), event (u1), pad (u1),
+                      target (u2), idle seconds (f4), latency seconds (f4)
+
+`clicker stats` reads the file with NumPy (see stats.py); writing needs
+only the standard library.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+
+MAGIC = b'CLKJ'
+VERSION = 1
+HEADER = struct.Struct('<4sIIIQQ')
+HEADER_SIZE = 64
+RECORD = struct.Struct('<dBxHff')
+COUNT_OFFSET = 24
+DEFAULT_CAPACITY = 1 << 20
+
+# Event type codes stored in the journal; the index is the code
+EVENTS = ('none', 'click', 'fail-safe', 'process-found', 'process-lost', 'activity',
+          'ineffective', 'skipped')
+
+
+class Journal:
+    """Fixed-size ring of event records backed by a memory-mapped file"""
+
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        try:
+            if os.fstat(fd).st_size < HEADER_SIZE:
+                # New file: sparse, so only written records take disk space
+                os.ftruncate(fd, HEADER_SIZE + capacity * RECORD.size)
+                os.pwrite(fd, HEADER.pack(MAGIC, VERSION, RECORD.size, 0, capacity, 0), 0)
+            self._map = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+        magic, version, record_size, _, capacity, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._map.close()
+            raise ValueError(f"{path} is not a clicker journal")
+        if len(self._map) < HEADER_SIZE + capacity * RECORD.size:
+            self._map.close()
+            raise ValueError(f"{path} is truncated")
+        self.capacity = capacity
+        self.count = count
+
+    def append(self, event, idle=0.0, latency=0.0, target=0, timestamp=None):
+        """Write one record; `event` is a name from EVENTS"""
+        code = EVENTS.index(event)
+        if timestamp is None:
+            timestamp = self.clock()
+        with self._lock:
+            slot = self.count % self.capacity
+            RECORD.pack_into(self._map, HEADER_SIZE + slot * RECORD.size,
+                             timestamp, code, target, idle, latency)
+            # Publish the record only after it is complete
+            self.count += 1
+            struct.pack_into('<Q', self._map, COUNT_OFFSET, self.count)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+
+
+def read_header(path):
+    """Return (capacity, count) of a journal file"""
+    with open(path, 'rb') as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a clicker journal")
+    magic, version, record_size, _, capacity, count = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a clicker journal")
+    return capacity, count
@@ -0,0 +1,192 @@
+"""Find the real click target on screen by template matching
+
+Only a configurable region of interest is captured. It is converted to
+grayscale, downscaled by block averaging and searched for a reference
+image with normalized cross-correlation; the correlation is computed
+with FFTs and the window norms with integral images, so memory stays
+proportional to the region, not to region x template. The last hit is
+cached and verified with a single window comparison; the full search
+only runs when the cached spot no longer matches.
+
+Requires NumPy, and Pillow to load images and grab the screen.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import logging
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def to_gray(image):
+    """Return a float32 grayscale array from a PIL image or an array"""
+    if hasattr(image, 'convert'):
+        image = image.convert('L')
+    array = np.asarray(image, dtype=np.float32)
+    if array.ndim == 3:
+        # ITU-R 601 luma, ignoring any alpha channel
+        array = array[..., :3] @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    return array
+
+
+def downscale(gray, factor):
+    """Shrink by averaging factor x factor blocks"""
+    if factor <= 1:
+        return gray
+    h = gray.shape[0] - gray.shape[0] % factor
+    w = gray.shape[1] - gray.shape[1] % factor
+    return gray[:h, :w].reshape(h // factor, factor, w // factor, factor).mean(axis=(1, 3))
+
+
+def fast_length(n):
+    """Smallest 2^a * 3^b * 5^c >= n, a size NumPy's FFT handles quickly"""
+    best = 1
+    while best < n:
+        best *= 2
+    three = 1
+    while three < best:
+        five = three
+        while five < best:
+            length = five
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            five *= 5
+        three *= 3
+    return best
+
+
+class Template:
+    """Zero-mean template prepared once for repeated matching"""
+
+    def __init__(self, gray):
+        self.shape = gray.shape
+        self.zero_mean = gray - gray.mean()
+        self.norm = float(np.sqrt((self.zero_mean ** 2).sum()))
+        if self.norm == 0:
+            raise ValueError("Template image has no contrast")
+        # FFT size -> conjugate spectrum of the template
+        self._spectra = {}
+
+    def _spectrum(self, size):
+        spectrum = self._spectra.get(size)
+        if spectrum is None:
+            spectrum = np.conj(np.fft.rfft2(self.zero_mean, size))
+            self._spectra = {size: spectrum}
+        return spectrum
+
+    def correlate(self, image):
+        """Sum of window x zero-mean template for every window position"""
+        th, tw = self.shape
+        rows, cols = image.shape[0] - th + 1, image.shape[1] - tw + 1
+        # Circular correlation equals the linear one where windows do not wrap
+        size = (fast_length(image.shape[0]), fast_length(image.shape[1]))
+        product = np.fft.rfft2(image, size) * self._spectrum(size)
+        return np.fft.irfft2(product, size)[:rows, :cols]
+
+    def scores(self, image):
+        """Normalized cross-correlation for every window position"""
+        th, tw = self.shape
+        if image.shape[0] < th or image.shape[1] < tw:
+            return np.zeros((0, 0), dtype=np.float32)
+        numerator = self.correlate(image)
+        # Window variance from integral images of the image and its square
+        n = th * tw
+        sums = self._box_sums(image)
+        squares = self._box_sums(image * image)
+        variance = np.maximum(squares - sums * sums / n, 0)
+        denominator = np.sqrt(variance) * self.norm
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(denominator > 1e-6, numerator / denominator, 0)
+        return scores
+
+    def score_at(self, image, row, col):
+        """Normalized cross-correlation of a single window"""
+        th, tw = self.shape
+        window = image[row:row + th, col:col + tw]
+        if window.shape != self.shape:
+            return 0.0
+        centered = window - window.mean()
+        denominator = float(np.sqrt((centered ** 2).sum())) * self.norm
+        if denominator <= 1e-6:
+            return 0.0
+        return float((centered * self.zero_mean).sum() / denominator)
+
+    def _box_sums(self, image):
+        th, tw = self.shape
+        integral = np.zeros((image.shape[0] + 1, image.shape[1] + 1), dtype=np.float64)
+        integral[1:, 1:] = image.cumsum(0).cumsum(1)
+        return (integral[th:, tw:] - integral[:-th, tw:]
+                - integral[th:, :-tw] + integral[:-th, :-tw])
+
+
+def grab_screen(region, display=None):
+    """Capture (left, top, width, height) of the screen with Pillow
+
+    `display` is an X display name, None = $DISPLAY.
+    """
+    from PIL import ImageGrab
+
+    left, top, width, height = region
+    return ImageGrab.grab(bbox=(left, top, left + width, top + height), xdisplay=display)
+
+
+class TemplateLocator:
+    """Locate a reference image inside a screen region"""
+
+    def __init__(self, template, region, scale=4, threshold=0.8, offset=(0, 0),
+                 grab=grab_screen):
+        if isinstance(template, str):
+            from PIL import Image
+            template = Image.open(template)
+        self.region = tuple(region)
+        self.scale = scale
+        self.threshold = threshold
+        self.offset = offset
+        self.grab = grab
+        gray = to_gray(template)
+        self.template_size = gray.shape
+        self.template = Template(downscale(gray, scale))
+        self.cached = None
+        self.full_searches = 0
+        self.cache_hits = 0
+        self.last_duration = 0.0
+
+    def _to_screen(self, row, col):
+        th, tw = self.template_size
+        x = self.region[0] + col * self.scale + tw // 2 + self.offset[0]
+        y = self.region[1] + row * self.scale + th // 2 + self.offset[1]
+        return x, y
+
+    def search(self, small):
+        """Full search; return ((row, col), score) of the best window"""
+        self.full_searches += 1
+        scores = self.template.scores(small)
+        if scores.size == 0:
+            return None, 0.0
+        index = np.unravel_index(int(np.argmax(scores)), scores.shape)
+        return (int(index[0]), int(index[1])), float(scores[index])
+
+    def locate(self, frame=None):
+        """Return the screen point to click, or None if the image is not visible"""
+        start = time.perf_counter()
+        if frame is None:
+            frame = self.grab(self.region)
+        small = downscale(to_gray(frame), self.scale)
+
+        if self.cached is not None:
+            if self.template.score_at(small, *self.cached) >= self.threshold:
+                self.cache_hits += 1
+                self.last_duration = time.perf_counter() - start
+                return self._to_screen(*self.cached)
+
+        position, score = self.search(small)
+        self.last_duration = time.perf_counter() - start
+        if position is None or score < self.threshold:
+            logger.debug("Target image not found (best score %.2f)", score)
+            self.cached = None
+            return None
+        self.cached = position
+        return self._to_screen(*position)
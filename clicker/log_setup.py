@@ -0,0 +1,144 @@
+"""Logging pipeline for the clicker
+
+Records are put on a queue by the main loop and written by a background
+listener, so formatting to disk and log rotation never block a tick.
+Runs of identical state records (e.g. "waiting") are collapsed into a
+single summary line before they reach the sink.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, SysLogHandler
+
+LOG_FORMAT = '%(asctime)s %(levelname)s: %(message)s'
+LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+SINKS = ('file', 'stderr', 'syslog', 'none')
+
+
+class CoalescingHandler(logging.Handler):
+    """Collapse runs of identical state records into one summary record
+
+    A record takes part in coalescing when it carries a `state` attribute
+    (passed via `extra`); an optional `idle` attribute is summarised as a
+    range. Any other record, a different state, `max_run` repeats or a
+    flush ends the run.
+    """
+
+    def __init__(self, target, max_run=600):
+        super().__init__()
+        self.target = target
+        self.max_run = max_run
+        self._state = None
+        self._first = None
+        self._count = 0
+        self._idle_min = self._idle_max = None
+
+    def emit(self, record):
+        state = getattr(record, 'state', None)
+        if state is not None and state == self._state:
+            self._count += 1
+            self._track_idle(record)
+            if self._count >= self.max_run:
+                self.flush_run()
+            return
+        self.flush_run()
+        if state is None:
+            self.target.handle(record)
+            return
+        self._state = state
+        self._first = record
+        self._count = 1
+        self._track_idle(record)
+
+    def _track_idle(self, record):
+        idle = getattr(record, 'idle', None)
+        if idle is None:
+            return
+        if self._idle_min is None or idle < self._idle_min:
+            self._idle_min = idle
+        if self._idle_max is None or idle > self._idle_max:
+            self._idle_max = idle
+
+    def summary(self):
+        """Return the summary record for the current run"""
+        if self._count == 1:
+            return self._first
+        record = logging.makeLogRecord(self._first.__dict__)
+        if self._idle_min is None:
+            record.msg = '%d× %s'
+            record.args = (self._count, self._state)
+        else:
+            record.msg = '%d× %s, idle %.0f–%.0fs'
+            record.args = (self._count, self._state, self._idle_min, self._idle_max)
+        return record
+
+    def flush_run(self):
+        """Emit the pending run, if any"""
+        if not self._count:
+            return
+        record = self.summary()
+        self._state = self._first = None
+        self._count = 0
+        self._idle_min = self._idle_max = None
+        self.target.handle(record)
+
+    def flush(self):
+        self.flush_run()
+        self.target.flush()
+
+    def close(self):
+        self.flush()
+        self.target.close()
+        super().close()
+
+
+def make_sink(sink, path='clicker.log'):
+    """Create the handler that finally writes records"""
+    if sink == 'file':
+        # Max ~10000 lines, ~1MB per file
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=1024 * 1024,  # 1 MB (~10000 lines)
+            backupCount=2,          # Keep 2 backup files
+            encoding='utf-8'
+        )
+    elif sink == 'stderr':
+        handler = logging.StreamHandler(sys.stderr)
+    elif sink == 'syslog':
+        handler = SysLogHandler(address='/dev/log')
+    elif sink == 'none':
+        handler = logging.NullHandler()
+    else:
+        raise ValueError(f"Unknown log sink: {sink}")
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+def setup_logging(level='DEBUG', sink='file', path='clicker.log', use_queue=True,
+                  logger=None):
+    """Configure logging; return the background listener (or None)"""
+    logger = logger or logging.getLogger()
+    logger.setLevel(level)
+    handler = CoalescingHandler(make_sink(sink, path))
+    if not use_queue:
+        logger.addHandler(handler)
+        return None
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+
+def shutdown_logging(listener, logger=None):
+    """Drain the queue and close every handler"""
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    logger = logger or logging.getLogger()
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
@@ -0,0 +1,275 @@
+"""Hot-path instrumentation in Prometheus text format
+
+`ClickerMetrics` bundles the counters and histograms updated by the main
+loop. With metrics disabled the loop gets `NULL_METRICS`, whose members
+do nothing and whose `enabled` flag lets callers skip taking timestamps,
+so the disabled cost is an attribute lookup and a no-op call.
+
+The registry is exported by a localhost HTTP listener (`/metrics`) or a
+node-exporter textfile rewritten atomically in the background.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import logging
+import os
+import threading
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+LATENESS_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+SCAN_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+CLICK_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        yield self.name, self.value
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    """Cumulative-bucket histogram; buckets are upper bounds in seconds"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help, buckets):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield f'{self.name}_bucket{{le="{format_value(float(bound))}"}}', total
+        yield f'{self.name}_sum', self.sum
+        yield f'{self.name}_count', self.count
+
+
+class Registry:
+    """Ordered collection of metrics rendered together"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help):
+        return self.add(Counter(name, help))
+
+    def gauge(self, name, help):
+        return self.add(Gauge(name, help))
+
+    def histogram(self, name, help, buckets):
+        return self.add(Histogram(name, help, buckets))
+
+    def render(self):
+        """Prometheus text exposition format 0.0.4"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(f'{name} {format_value(value)}' for name, value in metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+class ClickerMetrics:
+    """Everything the clicker loop measures"""
+
+    enabled = True
+
+    def __init__(self, registry=None):
+        self.registry = registry = registry or Registry()
+        self.ticks = registry.counter(
+            'clicker_ticks_total', 'Idle deadlines reached')
+        self.tick_lateness = registry.histogram(
+            'clicker_tick_lateness_seconds', 'How late the loop woke up after the idle deadline',
+            LATENESS_BUCKETS)
+        self.scans = registry.histogram(
+            'clicker_process_check_seconds', 'Cost of checking whether Claude is running',
+            SCAN_BUCKETS)
+        self.clicks = registry.counter(
+            'clicker_clicks_total', 'Click sequences performed')
+        self.click_latency = registry.histogram(
+            'clicker_click_seconds', 'Duration of the click sequence including settle delays',
+            CLICK_BUCKETS)
+        self.fail_safes = registry.counter(
+            'clicker_fail_safe_total', 'Clicks skipped because the pointer was in a corner')
+        self.ineffective = registry.counter(
+            'clicker_ineffective_clicks_total', 'Clicks that changed nothing around the target')
+        self.skipped = registry.counter(
+            'clicker_skipped_clicks_total',
+            'Clicks skipped because the target region had not changed since an ineffective one')
+        self.busy = registry.counter(
+            'clicker_busy_total', 'Clicks deferred because Claude was still working')
+        self.not_found = registry.counter(
+            'clicker_not_found_total', 'Deadlines reached without a Claude process')
+        self.claude_running = registry.gauge(
+            'clicker_claude_running', 'Whether Claude was running at the last check')
+
+    def render(self):
+        return self.registry.render()
+
+
+class NullMetric:
+    """Accepts every metric call and does nothing"""
+
+    def inc(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+class NullMetrics:
+    """Disabled metrics: same members as ClickerMetrics, all no-ops"""
+
+    enabled = False
+
+    def __getattr__(self, name):
+        # Cache the shared no-op so later lookups are plain attribute hits
+        setattr(self, name, NULL_METRIC)
+        return NULL_METRIC
+
+    def render(self):
+        return ''
+
+
+NULL_METRIC = NullMetric()
+NULL_METRICS = NullMetrics()
+
+
+class MetricsServer:
+    """Serve /metrics over HTTP from a daemon thread"""
+
+    def __init__(self, metrics, port, host='127.0.0.1'):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("metrics: " + format, *args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='metrics-http', daemon=True)
+        self._thread.start()
+        logger.info("Metrics on http://%s:%s/metrics", self.host, self.port)
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class TextfileExporter:
+    """Rewrite a node-exporter textfile every `interval` seconds"""
+
+    def __init__(self, metrics, path, interval=15.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def write(self):
+        # Write and rename so node-exporter never reads a partial file
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            f.write(self.metrics.render())
+        os.replace(tmp, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning("Cannot write metrics to %s: %s", self.path, e)
+
+    def start(self):
+        self.write()
+        self._thread = threading.Thread(target=self._run, name='metrics-textfile', daemon=True)
+        self._thread.start()
+        logger.info("Metrics written to %s every %ss", self.path, self.interval)
+
+    def close(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning("Cannot write metrics to %s: %s", self.path, e)
+
+
+def create_exporters(metrics, port=None, textfile=None, interval=15.0):
+    """Exporters for the configured outputs, not yet started"""
+    exporters = []
+    if port is not None:
+        exporters.append(MetricsServer(metrics, port))
+    if textfile:
+        exporters.append(TextfileExporter(metrics, textfile, interval))
+    return exporters
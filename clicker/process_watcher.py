@@ -0,0 +1,160 @@
+"""In-process watcher for the Claude process
+
+Replaces the per-tick `pgrep -f claude` fork with a /proc scan whose
+result is cached. Cached PIDs are re-checked cheaply through
+/proc/<pid>/stat; the full scan only runs on a slower cadence or when
+every cached process has gone away.
+
+One watcher can serve several patterns: each /proc walk matches every
+command line against all of them, so N sessions still cost one scan.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import os
+import re
+import time
+
+
+def read_cmdline(proc_root, pid):
+    """Return the command line of a process as one string, or None"""
+    try:
+        with open(os.path.join(proc_root, str(pid), 'cmdline'), 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None
+    return raw.replace(b'\0', b' ').decode('utf-8', 'replace').strip()
+
+
+def read_stat(proc_root, pid):
+    """Return (state, starttime) from /proc/<pid>/stat, or None if gone"""
+    try:
+        with open(os.path.join(proc_root, str(pid), 'stat'), 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None
+    # comm may contain spaces and parentheses, so split after the last ')'
+    fields = raw[raw.rfind(b')') + 2:].split()
+    if len(fields) < 20:
+        return None
+    return fields[0].decode('ascii', 'replace'), int(fields[19])
+
+
+def read_cpu_ticks(proc_root, pid):
+    """Return utime + stime of a process in clock ticks, or None if gone"""
+    try:
+        with open(os.path.join(proc_root, str(pid), 'stat'), 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None
+    fields = raw[raw.rfind(b')') + 2:].split()
+    if len(fields) < 13:
+        return None
+    return int(fields[11]) + int(fields[12])
+
+
+def read_children(proc_root, pid):
+    """Return the PIDs of direct children (needs /proc/<pid>/task/*/children)"""
+    children = []
+    try:
+        tids = os.listdir(os.path.join(proc_root, str(pid), 'task'))
+    except OSError:
+        return children
+    for tid in tids:
+        try:
+            with open(os.path.join(proc_root, str(pid), 'task', tid, 'children'), 'rb') as f:
+                children.extend(int(c) for c in f.read().split())
+        except OSError:
+            continue
+    return children
+
+
+class ProcessWatcher:
+    """Track processes whose command line matches a pattern
+
+    `pattern` is a regex or a list of regexes; is_running() and pids_for()
+    can then be asked about one of them.
+    """
+
+    def __init__(self, pattern='claude', rescan_interval=10.0,
+                 proc_root='/proc', exclude_pids=None, clock=time.monotonic):
+        self.pattern = pattern
+        self.patterns = [pattern] if isinstance(pattern, str) else list(dict.fromkeys(pattern))
+        self.rescan_interval = rescan_interval
+        self.proc_root = proc_root
+        self.exclude_pids = {os.getpid()}
+        if exclude_pids:
+            self.exclude_pids.update(exclude_pids)
+        self._regexes = [(p, re.compile(p)) for p in self.patterns]
+        self._clock = clock
+        self._pids = {}
+        self._matched = {}
+        self._last_scan = None
+        self.scan_count = 0
+
+    @property
+    def pids(self):
+        """PIDs currently believed to be alive"""
+        return sorted(self._pids)
+
+    def pids_for(self, pattern):
+        """Cached PIDs whose command line matched `pattern`"""
+        return sorted(pid for pid in self._pids if pattern in self._matched.get(pid, ()))
+
+    def scan(self):
+        """Walk /proc once and cache every matching PID"""
+        found = {}
+        matched = {}
+        try:
+            entries = os.listdir(self.proc_root)
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            if pid in self.exclude_pids:
+                continue
+            cmdline = read_cmdline(self.proc_root, pid)
+            # Kernel threads have an empty command line
+            if not cmdline:
+                continue
+            patterns = tuple(p for p, regex in self._regexes if regex.search(cmdline))
+            if not patterns:
+                continue
+            stat = read_stat(self.proc_root, pid)
+            if stat is None or stat[0] == 'Z':
+                continue
+            found[pid] = stat[1]
+            matched[pid] = patterns
+        self._pids = found
+        self._matched = matched
+        self._last_scan = self._clock()
+        self.scan_count += 1
+        return self.pids
+
+    def _prune(self):
+        """Drop cached PIDs that exited, became zombies or were reused"""
+        for pid, starttime in list(self._pids.items()):
+            stat = read_stat(self.proc_root, pid)
+            if stat is None or stat[0] == 'Z' or stat[1] != starttime:
+                del self._pids[pid]
+                self._matched.pop(pid, None)
+
+    def _live_patterns(self):
+        return {p for patterns in self._matched.values() for p in patterns}
+
+    def is_running(self, pattern=None):
+        """Return True if a process matching `pattern` (default: any) is alive"""
+        due = (self._last_scan is None
+               or self._clock() - self._last_scan >= self.rescan_interval)
+        if due:
+            self.scan()
+        elif self._pids:
+            before = self._live_patterns()
+            self._prune()
+            # The last known process of a pattern went away: look for a replacement now
+            if self._live_patterns() != before:
+                self.scan()
+        if pattern is None:
+            return bool(self._pids)
+        return any(pattern in patterns for patterns in self._matched.values())
@@ -0,0 +1,335 @@
+"""`clicker run -- COMMAND`: answer prompts through a pseudo-terminal
+
+Instead of moving the pointer, the command (Claude) runs on a pty whose
+master end this process holds. Everything is relayed unchanged between
+the real terminal and the pty with os.read()/os.write() from one
+selector loop (epoll on Linux). The last `buffer` bytes of output are
+kept; once the output has been quiet for `settle` seconds they are
+stripped of escape sequences and matched against the prompt patterns.
+If one matches and the user typed nothing for `idle_timeout` seconds,
+the keystrokes are written to the pty. A burst of output identical to
+the previous one (a TUI redrawing on a timer) changes nothing; any other
+output restarts the countdown. No X display is needed, so it works over
+SSH and headless.
+
+    clicker run -- claude
+    clicker run -f 10 --pattern 'Allow\\?' --send 'y\\r' -- claude
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import argparse
+import fcntl
+import logging
+import os
+import re
+import selectors
+import signal
+import sys
+import termios
+import time
+import tty
+
+from .log_setup import setup_logging, shutdown_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATTERNS = (r'Do you want to', r'\(y/n\)', r'\[Y/n\]')
+DEFAULT_SEND = '\r'
+DEFAULT_BUFFER = 4096
+DEFAULT_SETTLE = 0.2
+READ_SIZE = 65536
+# CSI, OSC (ended by BEL or ST) and two-byte escape sequences
+ESCAPES = re.compile(rb'\x1b\[[0-?]*[ -/]*[@-~]|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)|\x1b[@-Z\\-_]')
+
+
+class OutputBuffer:
+    """The last `size` bytes of output, matched against prompt patterns"""
+
+    def __init__(self, patterns, size=DEFAULT_BUFFER):
+        self.patterns = [re.compile(p.encode() if isinstance(p, str) else p)
+                         for p in patterns]
+        self.size = size
+        self.data = bytearray()
+
+    def feed(self, chunk):
+        data = self.data
+        data += chunk
+        if len(data) > self.size:
+            del data[:len(data) - self.size]
+
+    def clear(self):
+        self.data.clear()
+
+    def text(self):
+        """Buffered output without escape sequences"""
+        return ESCAPES.sub(b'', bytes(self.data))
+
+    def match(self):
+        """The first pattern found in the buffer, or None"""
+        text = self.text()
+        for pattern in self.patterns:
+            if pattern.search(text):
+                return pattern.pattern.decode(errors='replace')
+        return None
+
+
+def write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def copy_winsize(src, dst):
+    """Give the pty the size of the real terminal; False if src is no terminal"""
+    try:
+        size = fcntl.ioctl(src, termios.TIOCGWINSZ, b'\0' * 8)
+        fcntl.ioctl(dst, termios.TIOCSWINSZ, size)
+        return True
+    except OSError:
+        return False
+
+
+class PtyProxy:
+    """Run a command on a pty and answer its prompts after an idle timeout"""
+
+    def __init__(self, command, patterns=DEFAULT_PATTERNS, send=DEFAULT_SEND,
+                 idle_timeout=20, settle=DEFAULT_SETTLE, buffer=DEFAULT_BUFFER,
+                 stdin=0, stdout=1, clock=time.monotonic):
+        self.command = list(command)
+        self.output = OutputBuffer(patterns, buffer)
+        self.send = send.encode() if isinstance(send, str) else send
+        self.idle_timeout = idle_timeout
+        self.settle = settle
+        self.stdin = stdin
+        self.stdout = stdout
+        self.clock = clock
+        self.pid = None
+        self.master = None
+        now = clock()
+        self.last_input = now
+        self.last_output = now
+        # Output arrived since the buffer was last matched
+        self.unmatched = False
+        # Output since the last match, and the burst before it
+        self.burst = bytearray()
+        self.last_burst = None
+        # When the prompt was recognized, None while not waiting
+        self.waiting_since = None
+        self.injections = []
+
+    def spawn(self):
+        """Start the command with the pty slave as its controlling terminal"""
+        master, slave = os.openpty()
+        copy_winsize(self.stdin, slave)
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(master)
+                os.setsid()
+                fcntl.ioctl(slave, termios.TIOCSCTTY, 0)
+                for fd in (0, 1, 2):
+                    os.dup2(slave, fd)
+                if slave > 2:
+                    os.close(slave)
+                os.execvp(self.command[0], self.command)
+            except OSError as e:
+                os.write(2, f"clicker run: {self.command[0]}: {e.strerror}\r\n".encode())
+            os._exit(127)
+        os.close(slave)
+        self.pid = pid
+        self.master = master
+
+    def deadline(self):
+        """When the keystrokes are due, None while no prompt is waiting"""
+        if self.waiting_since is None or self.unmatched:
+            return None
+        return max(self.waiting_since, self.last_input) + self.idle_timeout
+
+    def on_output(self, data):
+        if self.stdout is not None:
+            try:
+                write_all(self.stdout, data)
+            except OSError as e:
+                self.hang_up(e)
+        self.output.feed(data)
+        burst = self.burst
+        burst += data
+        if len(burst) > self.output.size:
+            del burst[:len(burst) - self.output.size]
+        self.last_output = self.clock()
+        self.unmatched = True
+
+    def on_input(self, data):
+        write_all(self.master, data)
+        self.last_input = self.clock()
+        # The user answers: only a fresh prompt counts again
+        self.output.clear()
+        self.last_burst = None
+        self.waiting_since = None
+
+    def hang_up(self, error):
+        """The real terminal is gone: stop relaying and hang up the command"""
+        if self.stdout is None:
+            return
+        logger.info("Terminal closed (%s), hanging up %s", error, self.command[0])
+        self.stdout = None
+        if self.pid is not None:
+            try:
+                os.kill(self.pid, signal.SIGHUP)
+            except ProcessLookupError:
+                pass
+
+    def check_prompt(self, now):
+        """Match the buffer once the output has been quiet for `settle` seconds"""
+        self.unmatched = False
+        burst, self.burst = bytes(self.burst), bytearray()
+        if burst == self.last_burst:
+            # The same screen redrawn: keep counting, and do not answer it twice
+            return
+        self.last_burst = burst
+        pattern = self.output.match()
+        if pattern is not None:
+            logger.debug("Prompt matched %r", pattern)
+            self.waiting_since = now
+        else:
+            self.waiting_since = None
+
+    def inject(self, now):
+        write_all(self.master, self.send)
+        latency = self.clock() - now
+        self.injections.append((now, latency))
+        logger.info("Sent %r to %s after %.0fs idle (%.3f ms)", self.send, self.command[0],
+                    now - max(self.waiting_since, self.last_input), latency * 1000)
+        self.output.clear()
+        self.waiting_since = None
+
+    def timeout(self, now):
+        """Seconds the selector may sleep"""
+        if self.unmatched:
+            return max(self.last_output + self.settle - now, 0)
+        deadline = self.deadline()
+        return None if deadline is None else max(deadline - now, 0)
+
+    def run(self):
+        """Relay until the command exits; returns its exit status"""
+        if self.pid is None:
+            self.spawn()
+        selector = selectors.DefaultSelector()
+        selector.register(self.master, selectors.EVENT_READ, 'output')
+        try:
+            selector.register(self.stdin, selectors.EVENT_READ, 'input')
+        except (OSError, ValueError):
+            # stdin closed or not selectable (e.g. a regular file)
+            pass
+        try:
+            while True:
+                now = self.clock()
+                if self.unmatched and now - self.last_output >= self.settle:
+                    self.check_prompt(now)
+                deadline = self.deadline()
+                if deadline is not None and now >= deadline:
+                    self.inject(now)
+                for key, _ in selector.select(self.timeout(now)):
+                    if key.data == 'output':
+                        try:
+                            data = os.read(self.master, READ_SIZE)
+                        except OSError:
+                            # EIO: the slave side was closed, the command exited
+                            data = b''
+                        if not data:
+                            return self.wait()
+                        self.on_output(data)
+                    else:
+                        try:
+                            data = os.read(self.stdin, READ_SIZE)
+                        except OSError as e:
+                            # EIO: the controlling terminal went away (SSH dropped)
+                            self.hang_up(e)
+                            data = b''
+                        if data:
+                            self.on_input(data)
+                        else:
+                            selector.unregister(self.stdin)
+        finally:
+            selector.close()
+            os.close(self.master)
+
+    def wait(self):
+        _, status = os.waitpid(self.pid, 0)
+        return os.waitstatus_to_exitcode(status)
+
+
+def build_parser(prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog, description='Run a command on a pseudo-terminal and answer its prompts '
+                               'when you are idle')
+    parser.add_argument('-f', '--idle-timeout', type=float, default=20, metavar='SECONDS',
+                        help='Idle time before a waiting prompt is answered (default: 20)')
+    parser.add_argument('--pattern', action='append', metavar='REGEX',
+                        help='Output that means the command waits for input; repeatable '
+                             f'(default: {", ".join(DEFAULT_PATTERNS)})')
+    parser.add_argument('--send', default=DEFAULT_SEND, metavar='KEYS',
+                        help='Keystrokes to send, with Python escapes (default: \\r, Enter)')
+    parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE, metavar='SECONDS',
+                        help='Quiet output time before the patterns are matched '
+                             f'(default: {DEFAULT_SETTLE})')
+    parser.add_argument('--buffer', type=int, default=DEFAULT_BUFFER, metavar='BYTES',
+                        help=f'Output kept for matching (default: {DEFAULT_BUFFER})')
+    parser.add_argument('--log-file', metavar='PATH',
+                        help='Log what was sent to PATH (the terminal belongs to the command)')
+    parser.add_argument('command', nargs=argparse.REMAINDER,
+                        help='Command to run, after --')
+    return parser
+
+
+def parse_keys(text):
+    """Keystrokes for --send: Python escapes decoded, any other character kept"""
+    return text.encode('latin-1', 'backslashreplace').decode('unicode_escape')
+
+
+def main(argv=None, prog=None):
+    """Entry point of `clicker run`; returns the command's exit status"""
+    parser = build_parser(prog)
+    args = parser.parse_args(argv)
+    command = args.command[1:] if args.command[:1] == ['--'] else args.command
+    if not command:
+        parser.error('no command given, e.g. clicker run -- claude')
+    try:
+        patterns = [re.compile(p) for p in args.pattern or DEFAULT_PATTERNS]
+        send = parse_keys(args.send)
+    except (re.error, UnicodeDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    listener = None
+    if args.log_file:
+        listener = setup_logging('INFO', 'file', args.log_file)
+    try:
+        return relay(command, patterns, send, args)
+    finally:
+        if listener is not None:
+            shutdown_logging(listener)
+
+
+def relay(command, patterns, send, args):
+    """Run the proxy on the real terminal, restoring its mode afterwards"""
+    proxy = PtyProxy(command, patterns=[p.pattern for p in patterns], send=send,
+                     idle_timeout=args.idle_timeout, settle=args.settle, buffer=args.buffer)
+    try:
+        proxy.spawn()
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    saved = None
+    if os.isatty(0):
+        saved = termios.tcgetattr(0)
+        tty.setraw(0)
+        signal.signal(signal.SIGWINCH, lambda *_: copy_winsize(0, proxy.master))
+    try:
+        return proxy.run()
+    finally:
+        if saved is not None:
+            try:
+                termios.tcsetattr(0, termios.TCSAFLUSH, saved)
+            except termios.error:
+                # The terminal is gone; there is no mode left to restore
+                pass
@@ -0,0 +1,243 @@
+"""Detect whether Claude is actually waiting for input
+
+Two independent signals, both sampled or event-driven, without spawning
+any process:
+
+- `CpuReadiness` samples utime + stime of the watched processes and their
+  descendants from /proc and reports "waiting" once CPU usage stayed near
+  zero for a whole window
+- `TranscriptReadiness` watches the session transcript directory with
+  inotify and reports "waiting" once no file was written for a while
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import time
+from collections import deque
+
+from .process_watcher import read_children, read_cpu_ticks
+
+logger = logging.getLogger(__name__)
+
+READINESS_MODES = ('off', 'cpu', 'transcript', 'both')
+DEFAULT_TRANSCRIPT_DIR = '~/.claude/projects'
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+INOTIFY_EVENT = struct.Struct('iIII')
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+
+class CpuReadiness:
+    """Near-zero CPU over `window` seconds means Claude is waiting"""
+
+    name = 'cpu'
+
+    def __init__(self, watcher, threshold=0.03, window=5.0, proc_root='/proc',
+                 clock=time.monotonic, max_descendants=256, pattern=None):
+        self.watcher = watcher
+        self.pattern = pattern
+        self.threshold = threshold
+        self.window = window
+        self.proc_root = proc_root
+        self.clock = clock
+        self.max_descendants = max_descendants
+        self.ticks_per_second = os.sysconf('SC_CLK_TCK')
+        self._samples = deque()
+        self.last_usage = None
+        # Baseline, so the first ready() a window or more from now can answer
+        self.sample()
+
+    def _tree(self, pids):
+        """The given PIDs plus their descendants (tools Claude is running)"""
+        seen = []
+        stack = list(pids)
+        while stack and len(seen) < self.max_descendants:
+            pid = stack.pop()
+            if pid in seen:
+                continue
+            seen.append(pid)
+            stack.extend(read_children(self.proc_root, pid))
+        return seen
+
+    def sample(self):
+        """Record CPU ticks of the process tree; returns {pid: ticks}"""
+        ticks = {}
+        pids = self.watcher.pids if self.pattern is None else self.watcher.pids_for(self.pattern)
+        for pid in self._tree(pids):
+            value = read_cpu_ticks(self.proc_root, pid)
+            if value is not None:
+                ticks[pid] = value
+        now = self.clock()
+        self._samples.append((now, ticks))
+        return ticks
+
+    def usage_since(self, then, old, now, new):
+        """Average CPUs used between two samples"""
+        used = 0
+        for pid, value in new.items():
+            # Processes started in between count in full
+            used += value - old.get(pid, 0)
+        elapsed = now - then
+        return used / self.ticks_per_second / elapsed if elapsed > 0 else None
+
+    def ready(self):
+        self.sample()
+        now, new = self._samples[-1]
+        # Newest sample that is at least one window old
+        base = None
+        while self._samples and self._samples[0][0] <= now - self.window:
+            base = self._samples.popleft()
+        if base is None:
+            return False
+        self._samples.appendleft(base)
+        self.last_usage = self.usage_since(base[0], base[1], now, new)
+        return self.last_usage is not None and self.last_usage <= self.threshold
+
+    def close(self):
+        pass
+
+
+class Inotify:
+    """Thin ctypes wrapper around the Linux inotify API"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths = {}
+
+    def add_watch(self, path, mask):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.paths[wd] = path
+        return wd
+
+    def read_events(self):
+        """Return pending (path, mask, name) events without blocking"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + INOTIFY_EVENT.size <= len(data):
+                wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+                offset += length
+                events.append((self.paths.get(wd), mask, name))
+        return events
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class TranscriptReadiness:
+    """No transcript writes for `quiet` seconds means Claude is waiting"""
+
+    name = 'transcript'
+
+    def __init__(self, path=DEFAULT_TRANSCRIPT_DIR, quiet=10.0, clock=time.monotonic):
+        self.path = os.path.expanduser(path)
+        self.quiet = quiet
+        self.clock = clock
+        self.inotify = Inotify()
+        for directory, _, _ in os.walk(self.path):
+            self.inotify.add_watch(directory, WATCH_MASK)
+        if not self.inotify.paths:
+            self.inotify.close()
+            raise FileNotFoundError(f"Transcript directory not found: {self.path}")
+        self.last_write = clock()
+
+    def _written_at(self, path):
+        """Monotonic time of the file's last modification"""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return self.clock()
+        return mtime - time.time() + self.clock()
+
+    def poll(self):
+        """Drain pending inotify events and update last_write"""
+        for directory, mask, name in self.inotify.read_events():
+            if directory is None:
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if mask & IN_CREATE and mask & IN_ISDIR:
+                try:
+                    self.inotify.add_watch(path, WATCH_MASK)
+                except OSError as e:
+                    logger.debug("Cannot watch %s: %s", path, e)
+            written = min(self._written_at(path), self.clock())
+            if written > self.last_write:
+                self.last_write = written
+        return self.last_write
+
+    def ready(self):
+        return self.clock() - self.poll() >= self.quiet
+
+    def close(self):
+        self.inotify.close()
+
+
+class ReadinessDetector:
+    """All configured parts must agree that Claude is waiting"""
+
+    def __init__(self, parts=()):
+        self.parts = list(parts)
+
+    def ready(self):
+        # Evaluate every part so each keeps its samples up to date
+        results = [part.ready() for part in self.parts]
+        return all(results)
+
+    def close(self):
+        for part in self.parts:
+            part.close()
+
+
+def open_transcript(path=DEFAULT_TRANSCRIPT_DIR, quiet=10.0):
+    """Return a TranscriptReadiness, or None with a warning if it cannot run"""
+    try:
+        return TranscriptReadiness(path, quiet=quiet)
+    except OSError as e:
+        logger.warning("Transcript readiness disabled: %s", e)
+        return None
+
+
+def create_readiness(mode, watcher, transcript_dir=DEFAULT_TRANSCRIPT_DIR,
+                     cpu_threshold=0.03, cpu_window=5.0, quiet=10.0, pattern=None,
+                     transcript=None):
+    """Build a detector; parts that cannot run here are left out
+
+    Pass `transcript` to share one inotify watch between several detectors.
+    """
+    if mode not in READINESS_MODES:
+        raise ValueError(f"Unknown readiness mode: {mode}")
+    parts = []
+    if mode in ('cpu', 'both'):
+        parts.append(CpuReadiness(watcher, threshold=cpu_threshold, window=cpu_window,
+                                  pattern=pattern))
+    if mode in ('transcript', 'both'):
+        transcript = transcript or open_transcript(transcript_dir, quiet)
+        if transcript is not None:
+            parts.append(transcript)
+    return ReadinessDetector(parts)
@@ -0,0 +1,146 @@
+"""Terminal status renderer
+
+Draws the banner once with ANSI sequences instead of `os.system('clear')`
+and updates the status line in place. Every status field has a fixed
+column, so a frame only rewrites the fields that changed, in one buffered
+write. When stdout is not a terminal (e.g. under systemd) nothing is
+written at all.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import sys
+
+CLEAR_SCREEN = '\033[2J\033[H'
+CLEAR_LINE = '\r\033[2K'
+
+SPINNER_CHARS = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
+BAR_LENGTH = 20
+
+# (name, width) in display order; each field starts at a fixed column
+STATUS_FIELDS = (
+    ('icon', 2),
+    ('label', 12),
+    ('idle', 16),
+    ('claude', 21),
+    ('bar', BAR_LENGTH + 2),
+    ('mode', 20),
+)
+
+
+def progress_bar(progress, length=BAR_LENGTH):
+    """Return a bar of `length` cells filled to `progress` (0..1)"""
+    filled = int(min(max(progress, 0.0), 1.0) * length)
+    return "█" * filled + "░" * (length - filled)
+
+
+def banner_lines(idle_timeout, screen_width, screen_height, target_x, target_y, log_target):
+    """Startup banner shown at the top of the terminal"""
+    return [
+        "",
+        "=" * 60,
+        "    ╔═══════════════════════════════╗",
+        "               Auto-Clicker          ",
+        "    ╚═══════════════════════════════╝",
+        "  © 2026 Sergii Sliusar <powerjet777@gmail.com>",
+        "  Auto-clicker for Claude",
+        f"  Idle timeout: {idle_timeout} seconds",
+        f"  Screen size: {screen_width}x{screen_height}",
+        f"  Target: ({target_x}, {target_y}) | Log: {log_target}",
+        "  Press Ctrl+C to stop",
+        "=" * 60,
+        "",
+        "",
+    ]
+
+
+class StatusRenderer:
+    """Diff-based writer for the banner and the status line"""
+
+    def __init__(self, stream=None, enabled=None):
+        self.stream = stream or sys.stdout
+        if enabled is None:
+            isatty = getattr(self.stream, 'isatty', None)
+            enabled = bool(isatty and isatty())
+        self.enabled = enabled
+        self.spinner_index = 0
+        self.columns = {}
+        column = 1
+        for name, width in STATUS_FIELDS:
+            self.columns[name] = (column, width)
+            column += width
+        self._shown = {}
+        self.writes = 0
+
+    def _write(self, data):
+        if not data:
+            return
+        self.stream.write(data)
+        self.stream.flush()
+        self.writes += 1
+
+    def banner(self, lines):
+        """Clear the screen, draw the banner and forget the status line"""
+        if not self.enabled:
+            return
+        self._shown = {}
+        self._write(CLEAR_SCREEN + "\n".join(lines))
+
+    def frame(self, **fields):
+        """Write only the fields whose text differs from the last frame"""
+        if not self.enabled:
+            return
+        out = []
+        for name, _ in STATUS_FIELDS:
+            text = fields.get(name, '')
+            if self._shown.get(name) == text:
+                continue
+            column, width = self.columns[name]
+            out.append(f"\033[{column}G{text[:width].ljust(width)}")
+            self._shown[name] = text
+        self._write(''.join(out))
+
+    def next_spinner(self):
+        spinner = SPINNER_CHARS[self.spinner_index]
+        self.spinner_index = (self.spinner_index + 1) % len(SPINNER_CHARS)
+        return spinner
+
+    def waiting(self, idle_time, idle_timeout, claude_running, paused=False, mode=''):
+        """Spinner frame while counting down to the next click
+
+        claude_running is a bool or a status word such as 'busy'; mode
+        describes where the timeout comes from (adaptive mode).
+        """
+        if isinstance(claude_running, bool):
+            claude_running = 'running' if claude_running else 'not found'
+        self.frame(
+            icon="⏸" if paused else self.next_spinner(),
+            label="Paused" if paused else "Waiting...",
+            idle=f"Idle: {idle_time:.1f}/{idle_timeout}s",
+            claude=f"| Claude: {claude_running}",
+            bar=f"[{progress_bar(idle_time / idle_timeout if idle_timeout else 1.0)}]",
+            mode=mode,
+        )
+
+    def clicked(self, idle_time):
+        """Frame shown right after a click"""
+        self.frame(
+            icon="✓",
+            label="CLICKED!",
+            idle=f"Idle: {idle_time:.1f}s",
+            claude="| Claude: running",
+            bar=f"[{progress_bar(1.0)}]",
+        )
+
+    def message(self, text):
+        """Replace the whole status line with a free-form message"""
+        if not self.enabled:
+            return
+        self._shown = {}
+        self._write(CLEAR_LINE + text)
+
+    def line(self, text):
+        """Print a message on its own line below the status line"""
+        if not self.enabled:
+            return
+        self._shown = {}
+        self._write("\n" + text + "\n")
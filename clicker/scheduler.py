@@ -0,0 +1,308 @@
+"""Deadline-driven idle scheduler
+
+Input callbacks only record a monotonic timestamp; they never wake the
+main loop. The loop sleeps until `last_activity + idle_timeout` and, when
+it wakes up, samples the idle sources, re-reads the timestamp and goes
+back to sleep if the user was active in the meantime.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import heapq
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ActivityTracker:
+    """Remember when the user was last active"""
+
+    def __init__(self, clock=time.monotonic, sources=(), on_resume=None, resume_gap=5.0):
+        self.clock = clock
+        self.last_activity = clock()
+        self.suppressed = False
+        self.sources = list(sources)
+        self.ignore_before = None
+        # Called with the quiet time when activity follows >= resume_gap seconds of quiet
+        self.on_resume = on_resume
+        self.resume_gap = resume_gap
+
+    def _advance(self, when):
+        gap = when - self.last_activity
+        self.last_activity = when
+        if self.on_resume is not None and gap >= self.resume_gap:
+            self.on_resume(gap)
+
+    def touch(self, *args):
+        """Record user activity; accepts and ignores listener arguments"""
+        if not self.suppressed:
+            self._advance(self.clock())
+
+    # pynput callback signatures
+    on_move = on_click = on_scroll = on_press = touch
+
+    def reset(self):
+        """Record activity even while suppressed"""
+        self.last_activity = self.clock()
+
+    @contextmanager
+    def suppress(self):
+        """Ignore activity generated by our own synthetic input"""
+        self.suppressed = True
+        try:
+            yield
+        finally:
+            self.suppressed = False
+            self.ignore_before = self.clock()
+
+    def sync(self):
+        """Pull the newest activity timestamp from every idle source"""
+        for source in self.sources:
+            last = source.last_activity()
+            if last is None or last <= self.last_activity:
+                continue
+            if self.ignore_before is not None and last <= self.ignore_before:
+                continue
+            self._advance(last)
+
+    def idle_time(self):
+        """Seconds since the last recorded activity"""
+        self.sync()
+        return self.clock() - self.last_activity
+
+
+class IdleScheduler:
+    """Sleep until the idle deadline instead of polling every second"""
+
+    def __init__(self, tracker, idle_timeout, sleep=None):
+        self.tracker = tracker
+        self.idle_timeout = idle_timeout
+        self.not_before = None
+        self.wakeups = 0
+        # How long after the deadline the last wait_until_idle() returned
+        self.lateness = 0.0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._interrupted = False
+        self.paused = False
+        self._sleep = sleep or self._wait
+
+    @property
+    def clock(self):
+        return self.tracker.clock
+
+    def deadline(self):
+        """Monotonic time at which the idle condition will be met"""
+        deadline = self.tracker.last_activity + self.idle_timeout
+        if self.not_before is not None and self.not_before > deadline:
+            return self.not_before
+        return deadline
+
+    def defer(self, seconds):
+        """Do not fire again for at least `seconds`"""
+        self.not_before = self.clock() + seconds
+
+    def set_timeout(self, idle_timeout):
+        """Change the idle timeout and re-evaluate the deadline"""
+        self.idle_timeout = idle_timeout
+        self.wake()
+
+    def wake(self):
+        """Interrupt the current sleep so the deadline is recomputed"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def pause(self):
+        """Never reach the deadline until resume() is called"""
+        self.paused = True
+        self.wake()
+
+    def resume(self):
+        self.paused = False
+        self.wake()
+
+    def interrupt(self):
+        """Make the current or next wait_until_idle() return None once"""
+        with self._cond:
+            self._interrupted = True
+            self._cond.notify_all()
+
+    def stop(self):
+        """Make wait_until_idle() return None as soon as possible"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    def sync(self):
+        """Pull new activity from the idle sources"""
+        self.tracker.sync()
+
+    def _wait(self, seconds):
+        with self._cond:
+            if not self._stopped and not self._interrupted:
+                self._cond.wait(seconds)
+
+    def wait_until_idle(self, max_wait=None):
+        """Block until the deadline passes and return the idle time
+
+        Returns None if `max_wait` seconds elapsed first, or the scheduler
+        was stopped or interrupted. Activity during the sleep only moves
+        the deadline; it is noticed when the current sleep ends. While
+        paused the deadline is never reached.
+        """
+        start = self.clock()
+        while not self._stopped:
+            if self._interrupted:
+                self._interrupted = False
+                return None
+            self.sync()
+            now = self.clock()
+            deadline = float('inf') if self.paused else self.deadline()
+            if now >= deadline:
+                self.lateness = now - deadline
+                return self._fire(now)
+            delay = deadline - now
+            if max_wait is not None:
+                remaining = start + max_wait - now
+                if remaining <= 0:
+                    return None
+                delay = min(delay, remaining)
+            if delay == float('inf'):
+                # Paused without a refresh interval: sleep until woken
+                delay = None
+            self.wakeups += 1
+            self._sleep(delay)
+        return None
+
+    def _fire(self, now):
+        """Deadline reached: return what wait_until_idle() hands to the caller"""
+        self.not_before = None
+        return now - self.tracker.last_activity
+
+
+class Target:
+    """One Claude session: where to click, what to watch, how long to wait
+
+    `position` is (x, y) on `monitor` (default: the whole screen), see
+    Topology.resolve(); negative values count from the right/bottom edge,
+    with a `corner` they are offsets from it. `image` (searched in
+    `region`) or a ready `locator` optionally finds the point on screen
+    instead. `display` names the X display the session is on.
+    """
+
+    def __init__(self, name, position=(-400, -100), match='claude', idle_timeout=20,
+                 image=None, region=None, locator=None, readiness=None, monitor=None,
+                 corner=None, sequence=None, display=None):
+        self.name = name
+        self.display = display
+        # Activity of that display; None = the scheduler's tracker
+        self.tracker = None
+        self.position = tuple(position)
+        self.monitor = monitor
+        self.corner = corner
+        self.point = self.position
+        self.image = image
+        self.region = region
+        self.match = match
+        self.idle_timeout = idle_timeout
+        self.locator = locator
+        self.readiness = readiness
+        # Name of the action sequence; compiled into `actions` at startup
+        self.sequence = sequence
+        self.actions = None
+        self.not_before = None
+        self.running = False
+        self.clicks = 0
+
+    def __repr__(self):
+        return f"Target({self.name!r}, {self.position}, match={self.match!r})"
+
+
+class TargetScheduler(IdleScheduler):
+    """Deadline scheduler for several targets sharing one ActivityTracker
+
+    Targets sit in a heap keyed by their next due time. User activity can
+    only move due times later, so a key is a lower bound: the top entry
+    is re-keyed when it turns out to be stale, the rest are left alone.
+    wait_until_idle() sets `current` to the target that fired. deadline()
+    and firing set `idle_timeout` to the timeout of the target concerned;
+    peek() only looks. A target on another display counts idle time on
+    that display's tracker.
+    """
+
+    def __init__(self, tracker, targets, sleep=None):
+        self.targets = list(targets)
+        if not self.targets:
+            raise ValueError("At least one target is required")
+        super().__init__(tracker, self.targets[0].idle_timeout, sleep=sleep)
+        self.current = None
+        self._heap = []
+        self._rebuild()
+
+    def tracker_for(self, target):
+        return target.tracker or self.tracker
+
+    def track(self, target, tracker):
+        """Measure the idle time of `target` on `tracker`"""
+        target.tracker = tracker
+        self._rebuild()
+
+    def sync(self):
+        trackers = []
+        for target in self.targets:
+            tracker = self.tracker_for(target)
+            if tracker not in trackers:
+                trackers.append(tracker)
+                tracker.sync()
+
+    def due(self, target):
+        """Monotonic time at which `target` may fire"""
+        due = self.tracker_for(target).last_activity + target.idle_timeout
+        if target.not_before is not None and target.not_before > due:
+            return target.not_before
+        return due
+
+    def _rebuild(self):
+        self._heap = [(self.due(t), i, t) for i, t in enumerate(self.targets)]
+        heapq.heapify(self._heap)
+
+    def peek(self):
+        """Return (target, due) of the next target to fire"""
+        while True:
+            key, index, target = self._heap[0]
+            due = self.due(target)
+            if due <= key:
+                return target, due
+            heapq.heapreplace(self._heap, (due, index, target))
+
+    def deadline(self):
+        """Due time of the next target; `idle_timeout` becomes that target's"""
+        target, due = self.peek()
+        self.idle_timeout = target.idle_timeout
+        return due
+
+    def defer(self, seconds, target=None):
+        """Do not fire `target` (default: the current one) for at least `seconds`"""
+        target = target or self.current or self.peek()[0]
+        target.not_before = self.clock() + seconds
+        # An explicit change may move the key earlier: re-key everything
+        self._rebuild()
+
+    def rearm(self, target):
+        """Target was clicked: wait its full idle timeout before the next click"""
+        self.defer(target.idle_timeout, target)
+
+    def set_timeout(self, idle_timeout, target=None):
+        """Change the idle timeout of one target (default: all of them)"""
+        for t in [target] if target else self.targets:
+            t.idle_timeout = idle_timeout
+        self._rebuild()
+        super().set_timeout(idle_timeout)
+
+    def _fire(self, now):
+        self.current = self.peek()[0]
+        self.idle_timeout = self.current.idle_timeout
+        return now - self.tracker_for(self.current).last_activity
@@ -0,0 +1,431 @@
+"""Deterministic simulation of the clicker loop on a virtual clock
+
+The real `Clicker`, `ActivityTracker` and `IdleScheduler` run against a
+virtual clock; the scheduler's sleep advances the clock and replays the
+trace events that fall into the slept interval. Process watcher,
+readiness, idle source, indicator and input backend are fakes, so a day
+of operation runs in well under a second.
+
+A trace is a text file with one `SECONDS KIND` event per line, seconds
+counted from the start of the run, `#` starts a comment:
+
+    0 claude-start
+    12.5 move
+    40 key
+    300 claude-busy
+    420 claude-waiting
+
+    clicker sim run day.trace --timeout 20
+    clicker sim record day.trace
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import argparse
+import bisect
+import random
+import sys
+import time
+
+ACTIVITY_KINDS = ('move', 'click', 'scroll', 'key')
+PROCESS_KINDS = ('claude-start', 'claude-exit', 'claude-busy', 'claude-waiting')
+KINDS = ACTIVITY_KINDS + PROCESS_KINDS
+DAY = 24 * 3600.0
+# Recorded events of one kind closer together than this are dropped
+RECORD_RESOLUTION = 0.1
+
+
+class TraceEvent:
+    """One timestamped event of a trace"""
+
+    __slots__ = ('time', 'kind')
+
+    def __init__(self, time, kind):
+        if kind not in KINDS:
+            raise ValueError(f"unknown event {kind!r}, expected one of: {', '.join(KINDS)}")
+        self.time = float(time)
+        self.kind = kind
+
+    @property
+    def activity(self):
+        return self.kind in ACTIVITY_KINDS
+
+    def __eq__(self, other):
+        return (self.time, self.kind) == (other.time, other.kind)
+
+    def __repr__(self):
+        return f"TraceEvent({self.time}, {self.kind!r})"
+
+
+def parse_trace(lines):
+    """Events from trace lines, sorted by time; raises ValueError"""
+    events = []
+    for number, line in enumerate(lines, 1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        try:
+            seconds, kind = line.split()
+            events.append(TraceEvent(float(seconds), kind))
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}") from None
+    events.sort(key=lambda event: event.time)
+    return events
+
+
+def load_trace(path):
+    with open(path) as f:
+        return parse_trace(f)
+
+
+def save_trace(path, events):
+    with open(path, 'w') as f:
+        f.write("# seconds kind\n")
+        for event in events:
+            f.write(f"{event.time:.3f} {event.kind}\n")
+
+
+def synthetic_day(seed=0, start=8 * 3600.0, end=19 * 3600.0):
+    """A reproducible working day: bursts of input, breaks and busy periods"""
+    rng = random.Random(seed)
+    events = [TraceEvent(start - 600, 'claude-start')]
+    now = start
+    while now < end:
+        # A burst of work, then a pause of a few seconds to half an hour
+        burst_end = now + rng.uniform(60, 1200)
+        while now < burst_end:
+            events.append(TraceEvent(round(now, 3), rng.choice(ACTIVITY_KINDS)))
+            now += rng.expovariate(1 / 4.0)
+        if rng.random() < 0.5:
+            busy = now + rng.uniform(0, 10)
+            events.append(TraceEvent(round(busy, 3), 'claude-busy'))
+            events.append(TraceEvent(round(busy + rng.uniform(5, 300), 3), 'claude-waiting'))
+        now += rng.choice((rng.uniform(5, 60), rng.uniform(60, 1800)))
+    events.append(TraceEvent(end + 600, 'claude-exit'))
+    events.sort(key=lambda event: event.time)
+    return events
+
+
+class VirtualClock:
+    """Monotonic clock that only moves when told to"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance_to(self, when):
+        if when > self.now:
+            self.now = when
+
+
+class SimWatcher:
+    """Process watcher whose answer is set by the trace"""
+
+    def __init__(self):
+        self.running = False
+
+    @property
+    def pids(self):
+        return [1] if self.running else []
+
+    def is_running(self, pattern=None):
+        return self.running
+
+
+class SimReadiness:
+    """Readiness detector toggled by claude-busy / claude-waiting"""
+
+    parts = ()
+
+    def __init__(self):
+        self.busy = False
+
+    def ready(self):
+        return not self.busy
+
+    def close(self):
+        pass
+
+
+class SimIdleSource:
+    """Idle source with nothing to report; activity reaches the tracker directly"""
+
+    name = 'simulated'
+
+    def last_activity(self):
+        return None
+
+    def stop(self):
+        pass
+
+
+class SimIndicator:
+    """Indicator that records (time, call) instead of drawing"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = []
+        self.visible = False
+
+    def start(self):
+        self.visible = True
+        return True
+
+    def hide(self):
+        self.visible = False
+        self.calls.append((self.clock(), 'hide'))
+
+    def show(self):
+        self.visible = True
+        self.calls.append((self.clock(), 'show'))
+
+    def move(self, x, y):
+        self.calls.append((self.clock(), 'move', x, y))
+
+    def close(self):
+        self.visible = False
+
+
+class SimResult:
+    """What happened during a simulation run"""
+
+    def __init__(self, fires, clicks, steps, duration, elapsed):
+        # Time each click sequence started, i.e. when the deadline fired
+        self.fires = fires
+        self.clicks = clicks
+        self.steps = steps
+        self.duration = duration
+        # Wall-clock seconds the run took
+        self.elapsed = elapsed
+
+
+class Simulation:
+    """Run the real clicker loop over a trace on a virtual clock"""
+
+    def __init__(self, trace, idle_timeout=20, timings=None, rescan=10.0, ready_retry=2.0,
+                 refresh=0, backend=None, indicator=None, renderer=None, journal=None):
+        from .app import Clicker
+        from .config import Config
+        from .input_backend import ClickTimings, RecordingBackend
+        from .renderer import StatusRenderer
+        from .scheduler import ActivityTracker, IdleScheduler
+
+        self.trace = list(trace)
+        self.clock = VirtualClock()
+        self.end = float('inf')
+        self._next = 0
+        self.watcher = SimWatcher()
+        self.readiness = SimReadiness()
+        self.indicator = indicator or SimIndicator(self.clock)
+        self.backend = backend or RecordingBackend(clock=self.clock)
+        self.tracker = ActivityTracker(clock=self.clock)
+        self.scheduler = IdleScheduler(self.tracker, idle_timeout, sleep=self.sleep)
+        config = Config(idle_timeout=idle_timeout, rescan=rescan, refresh=refresh,
+                        timings=timings or ClickTimings(), readiness='off',
+                        ready_retry=ready_retry, journal=None)
+        self.clicker = Clicker(config, tracker=self.tracker, scheduler=self.scheduler,
+                               watcher=self.watcher, backend=self.backend,
+                               idle_source=SimIdleSource(), indicator=self.indicator,
+                               renderer=renderer or StatusRenderer(enabled=False),
+                               readiness=self.readiness, journal=journal, sleep=self.sleep)
+
+    def apply(self, event):
+        kind = event.kind
+        if kind in ACTIVITY_KINDS:
+            self.tracker.touch()
+        elif kind == 'claude-start':
+            self.watcher.running = True
+        elif kind == 'claude-exit':
+            self.watcher.running = False
+        else:
+            self.readiness.busy = kind == 'claude-busy'
+
+    def replay_until(self, when):
+        """Apply every event up to and including `when` at its own time"""
+        trace = self.trace
+        while self._next < len(trace) and trace[self._next].time <= when:
+            event = trace[self._next]
+            self._next += 1
+            self.clock.advance_to(event.time)
+            self.apply(event)
+        self.clock.advance_to(when)
+
+    def sleep(self, seconds):
+        """Stand-in for every sleep of the loop: replay the slept interval"""
+        if seconds is None:
+            # Waiting to be woken: nothing in the simulation will, so finish
+            seconds = self.end - self.clock()
+        when = self.clock() + seconds
+        if when > self.end:
+            self.replay_until(self.end)
+            self.scheduler.stop()
+        else:
+            self.replay_until(when)
+
+    def run(self, duration=DAY):
+        """Simulate `duration` seconds and return a SimResult"""
+        started = time.perf_counter()
+        self.end = duration
+        self.replay_until(0.0)
+        self.clicker.setup()
+        steps = 0
+        while not self.scheduler.stopped:
+            self.clicker.step()
+            steps += 1
+        calls = self.backend.calls
+        fires = [calls[i - 1][0] for i, call in enumerate(calls) if call[1] == 'click']
+        return SimResult(fires, self.clicker.clicks, steps, duration,
+                         time.perf_counter() - started)
+
+
+def expected_fires(trace, idle_timeout=20, duration=DAY, click_time=1.0, rescan=10.0,
+                   ready_retry=2.0):
+    """Reference model: when the clicker should start a click sequence
+
+    Written from the specification, independently of the scheduler: fire
+    `idle_timeout` after the last activity or click, only while Claude is
+    running and waiting; otherwise look again after `rescan` (not found)
+    or `ready_retry` (busy) seconds.
+    """
+    fires = []
+    last = 0.0
+    not_before = None
+    running = busy = False
+    index = 0
+    while True:
+        deadline = last + idle_timeout
+        if not_before is not None and not_before > deadline:
+            deadline = not_before
+        while index < len(trace) and trace[index].time <= deadline:
+            event = trace[index]
+            index += 1
+            if event.activity:
+                last = max(last, event.time)
+                deadline = max(deadline, last + idle_timeout)
+            elif event.kind in ('claude-start', 'claude-exit'):
+                running = event.kind == 'claude-start'
+            else:
+                busy = event.kind == 'claude-busy'
+        if deadline > duration:
+            return fires
+        not_before = None
+        if not running:
+            not_before = deadline + rescan
+        elif busy:
+            not_before = deadline + ready_retry
+        else:
+            fires.append(deadline)
+            last = deadline + click_time
+
+
+def check_invariants(fires, trace, idle_timeout, tolerance=1e-6):
+    """Descriptions of every broken invariant; empty when all hold
+
+    No click within `idle_timeout` of user activity, clicks only while
+    Claude is running and waiting, and clicks at least `idle_timeout`
+    apart.
+    """
+    problems = []
+    activity = [event.time for event in trace if event.activity]
+    states = [event for event in trace if not event.activity]
+    for n, fire in enumerate(fires):
+        i = bisect.bisect_right(activity, fire)
+        if i and activity[i - 1] > fire - idle_timeout + tolerance:
+            problems.append(f"click at {fire:.3f}s only {fire - activity[i - 1]:.3f}s "
+                            "after activity")
+        running = busy = False
+        for event in states:
+            if event.time > fire:
+                break
+            if event.kind in ('claude-start', 'claude-exit'):
+                running = event.kind == 'claude-start'
+            else:
+                busy = event.kind == 'claude-busy'
+        if not running:
+            problems.append(f"click at {fire:.3f}s while Claude was not running")
+        elif busy:
+            problems.append(f"click at {fire:.3f}s while Claude was busy")
+        if n and fire - fires[n - 1] < idle_timeout - tolerance:
+            problems.append(f"click at {fire:.3f}s only {fire - fires[n - 1]:.3f}s "
+                            "after the previous one")
+    return problems
+
+
+def record(path, resolution=RECORD_RESOLUTION):
+    """Record the user's input with pynput until Ctrl+C"""
+    from pynput import keyboard, mouse
+
+    start = time.monotonic()
+    events = []
+    last = {}
+
+    def add(kind):
+        now = time.monotonic() - start
+        if now - last.get(kind, -resolution) >= resolution:
+            last[kind] = now
+            events.append(TraceEvent(now, kind))
+
+    listeners = [
+        mouse.Listener(on_move=lambda *a: add('move'), on_click=lambda *a: add('click'),
+                       on_scroll=lambda *a: add('scroll')),
+        keyboard.Listener(on_press=lambda *a: add('key')),
+    ]
+    for listener in listeners:
+        listener.start()
+    print(f"Recording input to {path}, press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for listener in listeners:
+            listener.stop()
+    events.insert(0, TraceEvent(0, 'claude-start'))
+    save_trace(path, events)
+    return events
+
+
+def build_parser(prog=None):
+    parser = argparse.ArgumentParser(prog=prog,
+                                     description='Replay or record input traces offline')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='Run the clicker loop over a trace')
+    run.add_argument('trace', nargs='?', help='Trace file (default: a synthetic day)')
+    run.add_argument('--seed', type=int, default=0, help='Seed of the synthetic day')
+    run.add_argument('--timeout', type=float, default=20, metavar='SECONDS',
+                     help='Idle timeout (default: 20)')
+    run.add_argument('--duration', type=float, default=DAY, metavar='SECONDS',
+                     help='Simulated time (default: one day)')
+    save = commands.add_parser('record', help='Record your input into a trace file')
+    save.add_argument('trace')
+    return parser
+
+
+def main(argv=None, prog=None):
+    """Entry point of `clicker sim`; returns the exit status"""
+    args = build_parser(prog).parse_args(argv)
+    if args.command == 'record':
+        record(args.trace)
+        return 0
+    try:
+        trace = load_trace(args.trace) if args.trace else synthetic_day(args.seed)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    simulation = Simulation(trace, idle_timeout=args.timeout)
+    result = simulation.run(args.duration)
+    expected = expected_fires(trace, args.timeout, args.duration,
+                              simulation.clicker.config.timings.total())
+    problems = check_invariants(result.fires, trace, args.timeout)
+    print(f"{len(trace)} events, {args.duration:.0f}s simulated in "
+          f"{result.elapsed * 1000:.0f} ms ({result.steps} steps)")
+    print(f"{result.clicks} clicks, {len(expected)} expected")
+    for problem in problems:
+        print(f"  {problem}")
+    mismatch = len(expected) != len(result.fires) or any(
+        abs(a - b) > 1e-6 for a, b in zip(expected, result.fires))
+    if mismatch:
+        print("Click times differ from the reference model")
+    return 1 if problems or mismatch else 0
@@ -0,0 +1,498 @@
+"""`clicker soak`: weeks of the loop in minutes, watching for leaks
+
+The real `Clicker` loop runs on the virtual clock of `clicker sim` over
+an endless generated trace (bursts of input, pauses past the timeout,
+busy periods, Claude restarts), ticking once per `refresh` second. The
+parts that hold OS resources stay real: the `Indicator` handle spawns a
+stand-in indicator process that quits every `crash_every` commands, so
+the respawn path runs hundreds of times, the journal is a real
+memory-mapped file and the status line is really rendered (into
+/dev/null). The input backend only counts and puts the pointer into a
+corner every `fail_safe_every` clicks to exercise the fail-safe branch.
+
+Every `sample_every` clicks traced Python memory (tracemalloc), RSS,
+open fds, threads and child/zombie processes are sampled. After the
+warm-up the least-squares slope of each one's floor (so a child not
+reaped yet is a spike, not a trend), per 1000 clicks, must stay under
+its limit; otherwise the run fails. The JSON report holds the
+samples, slopes and the allocation sites that grew the most.
+
+    clicker soak --cycles 20000 --report soak.json
+    clicker soak --limit fds=0 --limit python_kib=16
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from .input_backend import InputBackend
+from .sim import SimIndicator, Simulation, TraceEvent
+
+# Largest allowed growth per 1000 clicks
+DEFAULT_LIMITS = {
+    'python_kib': 64.0,
+    'rss_kib': 2048.0,
+    'fds': 0.5,
+    'threads': 0.5,
+    'children': 0.5,
+    'zombies': 0.5,
+}
+METRICS = tuple(DEFAULT_LIMITS)
+DEFAULT_CYCLES = 2000
+DEFAULT_SAMPLE_EVERY = 50
+DEFAULT_WARMUP = 0.2
+DEFAULT_CRASH_EVERY = 50
+DEFAULT_FAIL_SAFE_EVERY = 97
+TOP_ALLOCATIONS = 10
+# Real seconds given to exiting children before the final sample
+SETTLE = 0.1
+# The harness's own samples and tracemalloc's bookkeeping are not the clicker's
+HARNESS_ALLOCATIONS = (tracemalloc.Filter(False, __file__),
+                       tracemalloc.Filter(False, tracemalloc.__file__))
+
+# Stand-in for indicator.py: reads commands like the real one, no window
+FAKE_INDICATOR = """import sys
+count = 0
+for line in sys.stdin:
+    count += 1
+    if line.strip() == 'quit' or count == {crash_every}:
+        break
+"""
+
+
+def soak_trace(seed=0, idle_timeout=20):
+    """Endless trace: bursts of input, pauses past the timeout, busy periods"""
+    rng = random.Random(seed)
+    now = 0.0
+    yield TraceEvent(now, 'claude-start')
+    while True:
+        burst_end = now + rng.uniform(1, 30)
+        while now < burst_end:
+            yield TraceEvent(now, rng.choice(('move', 'click', 'scroll', 'key')))
+            now += rng.expovariate(1 / 2.0)
+        # Mostly long enough for one or two clicks
+        pause = idle_timeout + rng.uniform(1, idle_timeout * 1.5)
+        roll = rng.random()
+        if roll < 0.1:
+            yield TraceEvent(now, 'claude-busy')
+            yield TraceEvent(now + rng.uniform(1, pause), 'claude-waiting')
+        elif roll < 0.12:
+            yield TraceEvent(now, 'claude-exit')
+            yield TraceEvent(now + rng.uniform(1, pause), 'claude-start')
+        now += pause
+
+
+class SoakBackend(InputBackend):
+    """Counts input instead of recording it, so the harness itself stays flat"""
+
+    name = 'soak'
+
+    def __init__(self, size=(1920, 1080), fail_safe_every=DEFAULT_FAIL_SAFE_EVERY):
+        self._size = size
+        self.pointer = (100, 100)
+        self.fail_safe_every = fail_safe_every
+        self.moves = self.clicks = self.presses = 0
+        self.fail_safes = 0
+        self.attempts = 0
+
+    def size(self):
+        return self._size
+
+    def position(self):
+        return self.pointer
+
+    def move(self, x, y):
+        self.fail_safe_check()
+        self.moves += 1
+        self.pointer = (x, y)
+
+    def click(self):
+        self.attempts += 1
+        if self.fail_safe_every and self.attempts % self.fail_safe_every == 0:
+            # The user parked the pointer in a corner
+            self.pointer = (0, 0)
+        self.fail_safe_check()
+        self.clicks += 1
+
+    def press(self, key):
+        self.fail_safe_check()
+        self.presses += 1
+
+    def fail_safe_check(self):
+        try:
+            super().fail_safe_check()
+        except Exception:
+            self.fail_safes += 1
+            self.pointer = (100, 100)
+            raise
+
+
+class SoakIndicator(SimIndicator):
+    """Counts calls instead of keeping them, so it does not grow with the run"""
+
+    def __init__(self):
+        super().__init__(clock=None)
+        self.count = 0
+
+    def hide(self):
+        self.visible = False
+        self.count += 1
+
+    def show(self):
+        self.visible = True
+        self.count += 1
+
+    def move(self, x, y):
+        self.count += 1
+
+
+class SoakSimulation(Simulation):
+    """Simulation that pulls its events from a generator"""
+
+    def __init__(self, events, **kwargs):
+        super().__init__([], **kwargs)
+        self.events = iter(events)
+        self.pending = next(self.events, None)
+
+    def replay_until(self, when):
+        while self.pending is not None and self.pending.time <= when:
+            event = self.pending
+            self.pending = next(self.events, None)
+            self.clock.advance_to(event.time)
+            self.apply(event)
+        self.clock.advance_to(when)
+
+
+def proc_status(field, pid='self'):
+    """Integer value of a /proc/PID/status line, None if missing"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def child_processes(pid=None):
+    """(children, zombies) of `pid` from a /proc scan"""
+    pid = pid or os.getpid()
+    children = zombies = 0
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses
+        fields = stat[stat.rfind(')') + 2:].split()
+        if int(fields[1]) == pid:
+            children += 1
+            zombies += fields[0] == 'Z'
+    return children, zombies
+
+
+def traced_snapshot():
+    """tracemalloc snapshot without the harness, None while not tracing"""
+    if not tracemalloc.is_tracing():
+        return None
+    return tracemalloc.take_snapshot().filter_traces(HARNESS_ALLOCATIONS)
+
+
+def sample_resources(snapshot=None):
+    """Current value of every tracked resource"""
+    children, zombies = child_processes()
+    rss = proc_status('VmRSS')
+    threads = proc_status('Threads')
+    return {
+        'python_kib': sum(trace.size for trace in snapshot.traces) / 1024
+        if snapshot is not None else 0.0,
+        'rss_kib': float(rss or 0),
+        'fds': len(os.listdir('/proc/self/fd')),
+        'threads': threads if threads is not None else threading.active_count(),
+        'children': children,
+        'zombies': zombies,
+    }
+
+
+def slope(xs, ys):
+    """Least-squares slope of ys over xs; 0 for fewer than two points"""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if not sxx:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+
+
+def floor(values):
+    """Each value lowered to the smallest one after it
+
+    A leak raises the floor for good; a child that exited but is not
+    reaped yet or a burst of allocations only makes a spike.
+    """
+    result = list(values)
+    for i in range(len(result) - 2, -1, -1):
+        result[i] = min(result[i], result[i + 1])
+    return result
+
+
+def trends(samples, warmup=DEFAULT_WARMUP):
+    """Growth per 1000 clicks of every metric's floor, ignoring the warm-up samples
+
+    The last sample (the settled one of a run) has nothing after it to
+    tell a spike from growth, so it only lowers the floor of the ones
+    before.
+    """
+    steady = samples[int(len(samples) * warmup):]
+    clicks = [sample['clicks'] / 1000 for sample in steady][:-1]
+    return {name: slope(clicks, floor(sample[name] for sample in steady)[:-1])
+            for name in METRICS}
+
+
+def check_limits(slopes, limits):
+    """Descriptions of every metric that grew faster than allowed"""
+    return [f"{name} grows {slopes[name]:+.2f} per 1000 clicks (limit {limit})"
+            for name, limit in limits.items() if slopes.get(name, 0.0) > limit]
+
+
+def allocation_growth(first, last, top=TOP_ALLOCATIONS):
+    """Source lines whose traced memory grew the most between two snapshots"""
+    stats = last.compare_to(first, 'lineno')
+    return [{'where': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             'size_diff_kib': round(stat.size_diff / 1024, 2), 'count_diff': stat.count_diff}
+            for stat in stats[:top] if stat.size_diff > 0]
+
+
+class SoakResult:
+    """Samples, slopes and verdict of a soak run"""
+
+    def __init__(self, samples, slopes, limits, problems, allocations, counters, elapsed):
+        self.samples = samples
+        self.slopes = slopes
+        self.limits = limits
+        self.problems = problems
+        self.allocations = allocations
+        self.counters = counters
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return not self.problems
+
+    def to_dict(self):
+        return {
+            'ok': self.ok,
+            'problems': self.problems,
+            'slopes_per_1000_clicks': {name: round(value, 4)
+                                       for name, value in self.slopes.items()},
+            'limits': self.limits,
+            'counters': self.counters,
+            'elapsed': round(self.elapsed, 2),
+            'top_allocations': self.allocations,
+            'samples': self.samples,
+        }
+
+
+class Soak:
+    """Drive the real loop for `cycles` clicks and sample resources along the way"""
+
+    def __init__(self, cycles=DEFAULT_CYCLES, idle_timeout=20, refresh=1.0,
+                 sample_every=DEFAULT_SAMPLE_EVERY, warmup=DEFAULT_WARMUP, limits=None,
+                 seed=0, indicator=True, crash_every=DEFAULT_CRASH_EVERY,
+                 fail_safe_every=DEFAULT_FAIL_SAFE_EVERY, backend=None, trace_memory=True):
+        self.cycles = cycles
+        self.idle_timeout = idle_timeout
+        self.refresh = refresh
+        self.sample_every = sample_every
+        self.warmup = warmup
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.seed = seed
+        self.use_indicator = indicator
+        self.crash_every = crash_every
+        self.backend = backend or SoakBackend(fail_safe_every=fail_safe_every)
+        self.trace_memory = trace_memory
+
+    def build(self, workdir):
+        from .indicator import Indicator
+        from .input_backend import ClickTimings
+        from .journal import Journal
+        from .renderer import StatusRenderer
+
+        indicator = SoakIndicator()
+        if self.use_indicator:
+            script = os.path.join(workdir, 'indicator.py')
+            with open(script, 'w') as f:
+                f.write(FAKE_INDICATOR.format(crash_every=self.crash_every))
+            indicator = Indicator(0, 0, script=script)
+        self.sink = open(os.devnull, 'w')
+        self.journal = Journal(os.path.join(workdir, 'soak.journal'), capacity=4096)
+        return SoakSimulation(soak_trace(self.seed, self.idle_timeout),
+                              idle_timeout=self.idle_timeout, timings=ClickTimings(),
+                              refresh=self.refresh, backend=self.backend, indicator=indicator,
+                              renderer=StatusRenderer(self.sink, enabled=True),
+                              journal=self.journal)
+
+    def run(self, progress=None):
+        """Run the soak and return a SoakResult; `progress(sample)` sees every sample"""
+        started = time.perf_counter()
+        workdir = tempfile.mkdtemp(prefix='clicker-soak-')
+        owns_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if owns_tracing:
+            tracemalloc.start()
+        # Fail-safe and indicator restarts log on every cycle; keep the terminal quiet
+        package_logger = logging.getLogger(__package__)
+        level = package_logger.level
+        package_logger.setLevel(logging.ERROR)
+        simulation = None
+        samples = []
+        first = last = None
+        try:
+            simulation = self.build(workdir)
+            clicker = simulation.clicker
+            simulation.end = float('inf')
+            simulation.replay_until(0.0)
+            clicker.setup()
+            ticks = 0
+            next_sample = 0
+            warm = int(self.cycles * self.warmup)
+            while clicker.clicks < self.cycles:
+                clicker.step()
+                ticks += 1
+                if clicker.clicks >= next_sample:
+                    next_sample = clicker.clicks + self.sample_every
+                    snapshot = traced_snapshot()
+                    sample = dict(sample_resources(snapshot), clicks=clicker.clicks,
+                                  ticks=ticks, virtual_seconds=round(simulation.clock(), 1))
+                    samples.append(sample)
+                    if progress is not None:
+                        progress(sample)
+                    if first is None and clicker.clicks >= warm:
+                        first = snapshot
+                    last = snapshot
+            # One more sample once the indicator check of the next pass ran, so a
+            # stand-in that just quit is reaped; it only anchors the floors
+            time.sleep(SETTLE)
+            if hasattr(clicker.indicator, 'alive'):
+                clicker.indicator.alive()
+            samples.append(dict(sample_resources(traced_snapshot()), clicks=clicker.clicks,
+                                ticks=ticks, virtual_seconds=round(simulation.clock(), 1),
+                                settled=True))
+            counters = {
+                'ticks': ticks,
+                'clicks': clicker.clicks,
+                'virtual_days': round(simulation.clock() / 86400, 2),
+                'fail_safes': self.backend.fail_safes if hasattr(self.backend, 'fail_safes')
+                else None,
+                'indicator_restarts': clicker.indicator.restarts
+                if hasattr(clicker.indicator, 'restarts') else None,
+                'journal_records': self.journal.count,
+            }
+        finally:
+            if simulation is not None:
+                simulation.clicker.close()
+                self.sink.close()
+            package_logger.setLevel(level)
+            if owns_tracing:
+                tracemalloc.stop()
+            shutil.rmtree(workdir, ignore_errors=True)
+        slopes = trends(samples, self.warmup)
+        allocations = allocation_growth(first, last) if first is not None else []
+        return SoakResult(samples, slopes, self.limits, check_limits(slopes, self.limits),
+                          allocations, counters, time.perf_counter() - started)
+
+
+def parse_limit(text):
+    """Parse 'NAME=SLOPE' into a (name, float) pair"""
+    name, _, value = text.partition('=')
+    if name not in DEFAULT_LIMITS:
+        raise argparse.ArgumentTypeError(
+            f"unknown metric {name!r}, expected one of: {', '.join(METRICS)}")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected {name}=SLOPE, got {text!r}") from None
+
+
+def build_parser(prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog, description='Run the clicker loop for thousands of click cycles on a '
+                               'virtual clock and fail on resource leaks')
+    parser.add_argument('--cycles', type=int, default=DEFAULT_CYCLES, metavar='CLICKS',
+                        help=f'Click cycles to run (default: {DEFAULT_CYCLES})')
+    parser.add_argument('--timeout', type=float, default=20, metavar='SECONDS',
+                        help='Idle timeout (default: 20)')
+    parser.add_argument('--refresh', type=float, default=1.0, metavar='SECONDS',
+                        help='Virtual seconds per loop tick (default: 1)')
+    parser.add_argument('--sample-every', type=int, default=DEFAULT_SAMPLE_EVERY,
+                        metavar='CLICKS',
+                        help=f'Clicks between samples (default: {DEFAULT_SAMPLE_EVERY})')
+    parser.add_argument('--warmup', type=float, default=DEFAULT_WARMUP, metavar='FRACTION',
+                        help='Leading part of the run left out of the slopes '
+                             f'(default: {DEFAULT_WARMUP})')
+    parser.add_argument('--limit', type=parse_limit, action='append', default=[],
+                        metavar='NAME=SLOPE',
+                        help='Largest growth per 1000 clicks; repeatable (defaults: ' +
+                             ', '.join(f'{k}={v}' for k, v in DEFAULT_LIMITS.items()) + ')')
+    parser.add_argument('--crash-every', type=int, default=DEFAULT_CRASH_EVERY,
+                        metavar='COMMANDS',
+                        help='Indicator stand-in quits after this many commands, 0 = never '
+                             f'(default: {DEFAULT_CRASH_EVERY})')
+    parser.add_argument('--fail-safe-every', type=int, default=DEFAULT_FAIL_SAFE_EVERY,
+                        metavar='CLICKS',
+                        help='Pointer parked in a corner every N click attempts, 0 = never '
+                             f'(default: {DEFAULT_FAIL_SAFE_EVERY})')
+    parser.add_argument('--no-indicator', action='store_true',
+                        help='Run without the indicator process')
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help='Skip Python allocation tracing (faster, no python_kib)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the generated trace')
+    parser.add_argument('--report', metavar='PATH', help='Write the JSON trend report to PATH')
+    return parser
+
+
+def main(argv=None, prog=None):
+    """Entry point of `clicker soak`; returns 1 when a leak was detected"""
+    args = build_parser(prog).parse_args(argv)
+    soak = Soak(cycles=args.cycles, idle_timeout=args.timeout, refresh=args.refresh,
+                sample_every=args.sample_every, warmup=args.warmup, limits=dict(args.limit),
+                seed=args.seed, indicator=not args.no_indicator, crash_every=args.crash_every,
+                fail_safe_every=args.fail_safe_every, trace_memory=not args.no_tracemalloc)
+
+    def progress(sample):
+        print(f"{sample['clicks']:>8} clicks {sample['ticks']:>10} ticks  "
+              f"py {sample['python_kib']:>8.0f} KiB  rss {sample['rss_kib']:>8.0f} KiB  "
+              f"fds {sample['fds']:>3}  threads {sample['threads']:>2}  "
+              f"children {sample['children']:>2}  zombies {sample['zombies']:>2}")
+    result = soak.run(progress)
+    counters = result.counters
+    print(f"{counters['clicks']} clicks, {counters['ticks']} ticks, "
+          f"{counters['virtual_days']} virtual days in {result.elapsed:.1f}s")
+    print("Growth per 1000 clicks: " + ', '.join(
+        f"{name} {value:+.2f}" for name, value in result.slopes.items()))
+    for problem in result.problems:
+        print(f"  LEAK: {problem}")
+    if args.report:
+        try:
+            with open(args.report, 'w') as f:
+                json.dump(result.to_dict(), f, indent=2)
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        print(f"Report written to {args.report}")
+    return 0 if result.ok else 1
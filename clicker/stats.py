@@ -0,0 +1,145 @@
+"""`clicker stats`: summarize the event journal
+
+The journal is mapped with numpy.memmap as a structured array, so the
+per-hour histograms and latency percentiles are a few vectorized passes
+even over millions of records. Requires NumPy; without it `clicker
+stats` prints an error instead of summarizing.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import argparse
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from .journal import EVENTS, HEADER_SIZE, RECORD, read_header
+
+RECORD_FIELDS = [
+    ('time', '<f8'),
+    ('event', 'u1'),
+    ('pad', 'u1'),
+    ('target', '<u2'),
+    ('idle', '<f4'),
+    ('latency', '<f4'),
+]
+RECORD_DTYPE = np.dtype(RECORD_FIELDS) if np is not None else None
+assert RECORD_DTYPE is None or RECORD_DTYPE.itemsize == RECORD.size
+
+PERCENTILES = (50, 90, 99, 99.9)
+BAR_WIDTH = 40
+
+
+def load(path):
+    """Return the journal records, oldest first"""
+    capacity, count = read_header(path)
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE,
+                        shape=(capacity,))
+    if count <= capacity:
+        return records[:count]
+    slot = count % capacity
+    return np.concatenate((records[slot:], records[:slot]))
+
+
+def event_code(name):
+    return EVENTS.index(name)
+
+
+def select(records, event=None, since=None):
+    """Records of one event type and/or newer than `since` (Unix seconds)"""
+    mask = np.ones(len(records), dtype=bool)
+    if event is not None:
+        mask &= records['event'] == event_code(event)
+    if since is not None:
+        mask &= records['time'] >= since
+    return records[mask]
+
+
+def hourly_counts(records, utc_offset=0):
+    """Return (hour start times, counts) for every hour between first and last record"""
+    if len(records) == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+    hours = np.floor((records['time'] + utc_offset) / 3600).astype(np.int64)
+    first = hours.min()
+    counts = np.bincount(hours - first)
+    starts = (first + np.arange(len(counts))) * 3600 - utc_offset
+    return starts, counts
+
+
+def hour_of_day_counts(records, utc_offset=0):
+    """Counts per local hour of day (0-23)"""
+    hours = np.floor((records['time'] + utc_offset) / 3600).astype(np.int64) % 24
+    return np.bincount(hours, minlength=24)
+
+
+def latency_percentiles(records, percentiles=PERCENTILES):
+    """Latency percentiles in milliseconds, or None without records"""
+    if len(records) == 0:
+        return None
+    return np.percentile(records['latency'].astype(np.float64) * 1000, percentiles)
+
+
+def histogram_lines(labels, counts, width=BAR_WIDTH):
+    peak = max(int(counts.max()), 1) if len(counts) else 1
+    for label, count in zip(labels, counts):
+        yield f"{label}  {int(count):>7}  {'█' * int(round(count / peak * width))}"
+
+
+def build_parser(prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description='Summarize the clicker event journal')
+    parser.add_argument('journal', nargs='?', default='clicker.journal',
+                        help='Journal file (default: clicker.journal)')
+    parser.add_argument('--event', choices=EVENTS[1:], default='click',
+                        help='Event type for the histogram (default: click)')
+    parser.add_argument('--days', type=float, metavar='N',
+                        help='Only records of the last N days (default: all)')
+    parser.add_argument('--hour-of-day', action='store_true',
+                        help='Fold the histogram into 24 hours of the day')
+    return parser
+
+
+def main(argv=None, prog=None):
+    """Entry point of `clicker stats`; returns the exit status"""
+    args = build_parser(prog).parse_args(argv)
+    if np is None:
+        print("Error: clicker stats requires NumPy (pip install numpy)", file=sys.stderr)
+        return 1
+    try:
+        records = load(args.journal)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    since = time.time() - args.days * 86400 if args.days else None
+    records = select(records, since=since)
+    utc_offset = time.localtime().tm_gmtoff
+
+    print(f"{args.journal}: {len(records)} records")
+    for code, name in enumerate(EVENTS[1:], 1):
+        print(f"  {name:<14}{int(np.count_nonzero(records['event'] == code)):>10}")
+
+    events = select(records, event=args.event)
+    print(f"\n{args.event} per hour")
+    if args.hour_of_day:
+        counts = hour_of_day_counts(events, utc_offset)
+        labels = [f"{hour:02d}:00" for hour in range(24)]
+    else:
+        starts, counts = hourly_counts(events, utc_offset)
+        labels = [time.strftime('%Y-%m-%d %H:00', time.localtime(t)) for t in starts]
+    for line in histogram_lines(labels, counts):
+        print(f"  {line}")
+
+    values = latency_percentiles(select(records, event='click'))
+    if values is not None:
+        print("\nclick latency (ms)")
+        for p, value in zip(PERCENTILES, values):
+            print(f"  p{p:<6g}{value:>10.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
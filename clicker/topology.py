@@ -0,0 +1,220 @@
+"""Monitor layout cached until the X server reports a change
+
+`RandRTopology` asks RandR for the geometry of every monitor once and
+subscribes to screen, CRTC and output change events. `poll()` only
+drains events the X connection has already received, so the main loop
+pays no round trip unless a monitor was plugged, unplugged, rotated or
+moved. Without RandR (or a display) `StaticTopology` uses the backend's
+screen size for one monitor.
+
+Click positions are resolved against a monitor or the whole screen:
+
+    -400,-100                  400 px from the right, 100 px from the bottom
+    HDMI-1:200,150             relative to the top-left corner of HDMI-1
+    primary:bottom-right,400,100   400/100 px in from the primary's corner
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Corner -> which edge offsets are measured from (0 = left/top, 1 = right/bottom)
+CORNERS = {
+    'top-left': (0, 0),
+    'top-right': (1, 0),
+    'bottom-left': (0, 1),
+    'bottom-right': (1, 1),
+    'center': None,
+}
+
+
+class Monitor:
+    """One output's rectangle in root-window coordinates"""
+
+    def __init__(self, name, x, y, width, height, primary=False):
+        self.name = name
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.primary = primary
+
+    def key(self):
+        return (self.name, self.x, self.y, self.width, self.height, self.primary)
+
+    def __eq__(self, other):
+        return isinstance(other, Monitor) and self.key() == other.key()
+
+    def __repr__(self):
+        primary = ', primary' if self.primary else ''
+        return f"Monitor({self.name!r}, {self.width}x{self.height}+{self.x}+{self.y}{primary})"
+
+
+def parse_position(text):
+    """Parse '[MONITOR:]X,Y' or '[MONITOR:]CORNER[,DX,DY]' into (monitor, corner, (x, y))
+
+    Raises ValueError.
+    """
+    monitor, _, rest = text.rpartition(':')
+    parts = [p.strip() for p in rest.split(',')]
+    corner = None
+    if parts[0] in CORNERS:
+        corner = parts.pop(0)
+        parts = parts or ['0', '0']
+    try:
+        x, y = (int(p) for p in parts)
+    except ValueError:
+        raise ValueError(f"expected [MONITOR:]X,Y or [MONITOR:]CORNER[,DX,DY], got {text!r}")
+    return monitor or None, corner, (x, y)
+
+
+def format_position(monitor, corner, position):
+    """Inverse of parse_position()"""
+    text = f"{position[0]},{position[1]}"
+    if corner:
+        text = f"{corner},{text}"
+    return f"{monitor}:{text}" if monitor else text
+
+
+class Topology:
+    """Resolve positions against cached monitors"""
+
+    def __init__(self):
+        self.monitors = []
+        self.size = (0, 0)
+
+    def find(self, name):
+        """Monitor by name ('primary' = the primary one), or None"""
+        for monitor in self.monitors:
+            if monitor.name == name or (name == 'primary' and monitor.primary):
+                return monitor
+        if name == 'primary' and self.monitors:
+            return self.monitors[0]
+        return None
+
+    def resolve(self, position, monitor=None, corner=None):
+        """Screen point for `position` on `monitor` (None = whole screen)
+
+        Without a corner negative values count from the right/bottom edge;
+        with one, (x, y) are offsets from that corner towards the inside.
+        A monitor that is gone falls back to the primary one.
+        """
+        area = Monitor('screen', 0, 0, *self.size)
+        if monitor is not None:
+            found = self.find(monitor)
+            if found is None:
+                logger.warning("Monitor %s not connected, using the primary monitor", monitor)
+                found = self.find('primary') or area
+            area = found
+        x, y = position
+        if corner == 'center':
+            x, y = area.width // 2 + x, area.height // 2 + y
+        elif corner is not None:
+            right, bottom = CORNERS[corner]
+            x = area.width - x if right else x
+            y = area.height - y if bottom else y
+        else:
+            x = x + area.width if x < 0 else x
+            y = y + area.height if y < 0 else y
+        return area.x + x, area.y + y
+
+    def poll(self):
+        """True if the layout changed since the last call"""
+        return False
+
+    def close(self):
+        pass
+
+
+class StaticTopology(Topology):
+    """One monitor covering a fixed screen size"""
+
+    name = 'static'
+
+    def __init__(self, size):
+        super().__init__()
+        self.size = tuple(size)
+        self.monitors = [Monitor('screen', 0, 0, *self.size, primary=True)]
+
+
+class RandRTopology(Topology):
+    """Monitors from XRandR, refreshed on RandR change notifications"""
+
+    name = 'randr'
+
+    def __init__(self, display_name=None):
+        super().__init__()
+        from Xlib import display
+        from Xlib.ext import randr
+
+        self._randr = randr
+        self.display = display.Display(display_name)
+        if not self.display.has_extension('RANDR'):
+            self.display.close()
+            raise RuntimeError("X server has no RandR extension")
+        self._first_event = self.display.query_extension('RANDR').first_event
+        self.root = self.display.screen().root
+        self.root.xrandr_select_input(randr.RRScreenChangeNotifyMask
+                                      | randr.RRCrtcChangeNotifyMask
+                                      | randr.RROutputChangeNotifyMask)
+        self.changes = 0
+        self.refresh()
+
+    def query_monitors(self):
+        root = self.root
+        if hasattr(root, 'xrandr_get_monitors'):
+            # RandR 1.5: logical monitors, including user-defined ones
+            return [Monitor(self.display.get_atom_name(m.name), m.x, m.y,
+                            m.width_in_pixels, m.height_in_pixels, bool(m.primary))
+                    for m in root.xrandr_get_monitors().monitors]
+        resources = root.xrandr_get_screen_resources_current()
+        primary = root.xrandr_get_output_primary().output
+        monitors = []
+        for crtc in resources.crtcs:
+            info = self.display.xrandr_get_crtc_info(crtc, resources.config_timestamp)
+            if not info.mode or not info.outputs:
+                continue
+            output = info.outputs[0]
+            name = self.display.xrandr_get_output_info(output,
+                                                       resources.config_timestamp).name
+            monitors.append(Monitor(name, info.x, info.y, info.width, info.height,
+                                    output == primary))
+        return monitors
+
+    def refresh(self):
+        """Query monitors and root size (round trips; only on change)"""
+        geometry = self.root.get_geometry()
+        self.size = (geometry.width, geometry.height)
+        self.monitors = self.query_monitors() or [
+            Monitor('screen', 0, 0, *self.size, primary=True)]
+
+    def poll(self):
+        randr = self._randr
+        notified = False
+        # pending_events() reads what already arrived; it sends no request
+        while self.display.pending_events():
+            event = self.display.next_event()
+            if event.type - self._first_event in (randr.RRScreenChangeNotify, randr.RRNotify):
+                notified = True
+        if not notified:
+            return False
+        before = (self.size, self.monitors)
+        self.refresh()
+        if (self.size, self.monitors) == before:
+            return False
+        self.changes += 1
+        return True
+
+    def close(self):
+        self.display.close()
+
+
+def create_topology(backend, display_name=None):
+    """RandR topology for X backends, the backend's screen size otherwise"""
+    if backend.name in ('xtest', 'pyautogui'):
+        try:
+            return RandRTopology(display_name)
+        except Exception as e:
+            logger.info("RandR not available (%s), monitor layout is fixed", e)
+    return StaticTopology(backend.size())
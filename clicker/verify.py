@@ -0,0 +1,149 @@
+"""Check that a click changed something on screen, back off if not
+
+A small region around the target is grabbed right before and shortly
+after the click and reduced to a difference hash: the grayscale region
+is averaged down to `hash_size` x (`hash_size` + 1) cells, and two bits
+per cell say whether it is clearly brighter or clearly darker than its
+left neighbour. Flat areas, which dominate a terminal, hash to zero
+instead of to noise. Hashes that differ in no more than `threshold`
+bits mean the click had no visible effect (cursor blinks and
+anti-aliasing stay below it). The indicator window is blanked out of
+both grabs, so an overlay that was still on screen for one of them
+does not count as a change.
+
+After an ineffective click the next attempt waits twice as long, up to
+`max_backoff`, and is skipped without touching the input at all while
+the region still hashes like it did after the failed click.
+
+Requires NumPy, and Pillow to grab the screen.
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+import logging
+
+import numpy as np
+
+from .locator import grab_screen, to_gray
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZE = (300, 80)
+DEFAULT_THRESHOLD = 3
+DEFAULT_DELAY = 0.3
+DEFAULT_MAX_BACKOFF = 600.0
+# Grey levels two neighbouring cells must differ by to count as an edge
+EDGE_MARGIN = 4.0
+
+
+def dhash(image, hash_size=16):
+    """Difference hash of an image as a (2, hash_size, hash_size) bool array"""
+    gray = to_gray(image)
+    height, width = gray.shape
+    if height < hash_size or width < hash_size + 1:
+        raise ValueError(f"region {width}x{height} is smaller than the hash")
+    rows = np.linspace(0, height, hash_size + 1).astype(int)[:-1]
+    cols = np.linspace(0, width, hash_size + 2).astype(int)[:-1]
+    sums = np.add.reduceat(np.add.reduceat(gray, rows, axis=0), cols, axis=1)
+    cells = sums / np.outer(np.diff(np.append(rows, height)), np.diff(np.append(cols, width)))
+    diff = cells[:, 1:] - cells[:, :-1]
+    return np.stack((diff > EDGE_MARGIN, diff < -EDGE_MARGIN))
+
+
+def blank(gray, region, box):
+    """Copy of the grayscale grab of `region` with the part under `box` black"""
+    left = max(box[0] - region[0], 0)
+    top = max(box[1] - region[1], 0)
+    right = min(box[0] + box[2] - region[0], gray.shape[1])
+    bottom = min(box[1] + box[3] - region[1], gray.shape[0])
+    gray = gray.copy()
+    if left < right and top < bottom:
+        gray[top:bottom, left:right] = 0
+    return gray
+
+
+def distance(a, b):
+    """Number of differing hash bits"""
+    return int(np.count_nonzero(a != b))
+
+
+class VerifyState:
+    """Failures of one target in a row and the hash after the last one"""
+
+    def __init__(self):
+        self.failures = 0
+        self.failed_hash = None
+
+
+class ClickVerifier:
+    """Compare region hashes around the target before and after a click"""
+
+    def __init__(self, size=DEFAULT_SIZE, threshold=DEFAULT_THRESHOLD, delay=DEFAULT_DELAY,
+                 max_backoff=DEFAULT_MAX_BACKOFF, hash_size=16, grab=grab_screen):
+        self.size = size
+        self.threshold = threshold
+        self.delay = delay
+        self.max_backoff = max_backoff
+        self.hash_size = hash_size
+        self.grab = grab
+        self.states = {}
+        self.last_distance = None
+
+    def state(self, key):
+        if key not in self.states:
+            self.states[key] = VerifyState()
+        return self.states[key]
+
+    def region(self, point):
+        width, height = self.size
+        return (max(point[0] - width // 2, 0), max(point[1] - height // 2, 0), width, height)
+
+    def capture(self, point, exclude=None):
+        """Hash of the region around `point`, or None if it cannot be grabbed
+
+        `exclude` is a screen rectangle (left, top, width, height) left out
+        of the hash, such as the indicator window.
+        """
+        region = self.region(point)
+        try:
+            gray = to_gray(self.grab(region))
+            if exclude is not None:
+                gray = blank(gray, region, exclude)
+            return dhash(gray, self.hash_size)
+        except Exception as e:
+            logger.debug("Could not grab the region to verify the click: %s", e)
+            return None
+
+    def unchanged(self, current, key=0):
+        """True if the region looks as it did after the last ineffective click"""
+        failed = self.state(key).failed_hash
+        return (current is not None and failed is not None
+                and distance(current, failed) <= self.threshold)
+
+    def check(self, before, after, key=0):
+        """Record the outcome of a click; False if it had no visible effect
+
+        Without both hashes the click counts as effective.
+        """
+        state = self.state(key)
+        if before is None or after is None:
+            self.last_distance = None
+            return True
+        self.last_distance = distance(before, after)
+        if self.last_distance > self.threshold:
+            state.failures = 0
+            state.failed_hash = None
+            return True
+        state.failures += 1
+        state.failed_hash = after
+        return False
+
+    def skip(self, key=0):
+        """The attempt was skipped because nothing changed; counts as a failure"""
+        self.state(key).failures += 1
+
+    def backoff(self, idle_timeout, key=0):
+        """Delay before the next attempt, or None for the normal idle timeout"""
+        failures = self.state(key).failures
+        if failures < 1:
+            return None
+        return min(idle_timeout * 2 ** failures, self.max_backoff)
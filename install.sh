@@ -46,13 +46,8 @@ echo ""
 
 # Make scripts executable
 echo "Making scripts executable..."
-chmod +x clicker.py
-if [ -f "indicator.py" ]; then
-    chmod +x indicator.py
-    echo "✓ clicker.py and indicator.py are now executable"
-else
-    echo "✓ clicker.py is now executable"
-fi
+chmod +x clicker.py clicker/indicator.py
+echo "✓ clicker.py and clicker/indicator.py are now executable"
 
 echo ""
 echo "============================================================"
@@ -5,8 +5,10 @@ Pytest configuration and fixtures for POWERJET Auto-Clicker
 """
 
 import pytest
+import subprocess
 import sys
 import os
+import time
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -46,3 +48,118 @@ def spinner_characters():
 def progress_bar_length():
     """Progress bar length"""
     return 20
+
+
+class FakeWatcher:
+    """Process watcher stand-in
+
+    `running` is True/False for every pattern or the set of running patterns.
+    """
+
+    pids = []
+
+    def __init__(self, running=True):
+        self.running = running if isinstance(running, bool) else set(running)
+        self.calls = []
+
+    def is_running(self, pattern=None):
+        self.calls.append(pattern)
+        if isinstance(self.running, bool):
+            return self.running
+        return pattern in self.running
+
+    def pids_for(self, pattern):
+        return []
+
+
+class FakeIdleSource:
+    """Idle source that never reports activity"""
+
+    name = 'fake'
+
+    def __init__(self):
+        self.stopped = False
+
+    def last_activity(self):
+        return None
+
+    def stop(self):
+        self.stopped = True
+
+
+class FakeReadiness:
+    """Readiness detector with a settable answer"""
+
+    def __init__(self, ready=True):
+        self.parts = []
+        self.answer = ready
+        self.checks = 0
+        self.closed = False
+
+    def ready(self):
+        self.checks += 1
+        return self.answer
+
+    def close(self):
+        self.closed = True
+
+
+class FakeIndicator:
+    """Indicator that records its commands and positions"""
+
+    def __init__(self):
+        self.calls = []
+        self.moves = []
+
+    def start(self):
+        return True
+
+    def hide(self):
+        self.calls.append('hide')
+
+    def show(self):
+        self.calls.append('show')
+
+    def move(self, x, y):
+        self.calls.append(('move', x, y))
+        self.moves.append((x, y))
+
+    def close(self):
+        self.calls.append('close')
+
+
+class XvfbMixin:
+    """Runs a local Xvfb server per display around a TestCase class
+
+    Set DISPLAY for one 800x600 screen, or DISPLAYS to map display names
+    to Xvfb screen specs. Put it before unittest.TestCase in the bases.
+    """
+
+    DISPLAY = None
+    DISPLAYS = None
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        screens = cls.DISPLAYS or {cls.DISPLAY: '800x600x24'}
+        cls.servers = [subprocess.Popen(['Xvfb', name, '-screen', '0', screen],
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                       for name, screen in screens.items()]
+        deadline = time.monotonic() + 10
+        for name in screens:
+            while not os.path.exists(f'/tmp/.X11-unix/X{name[1:]}'):
+                if time.monotonic() > deadline:
+                    cls.stop_servers()
+                    raise RuntimeError("Xvfb did not start")
+                time.sleep(0.05)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stop_servers()
+        super().tearDownClass()
+
+    @classmethod
+    def stop_servers(cls):
+        for server in cls.servers:
+            server.terminate()
+            server.wait()
@@ -0,0 +1,231 @@
+"""
+Unit tests for action sequences and condition waits
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from clicker import ActivityTracker, Clicker, Config
+from clicker.actions import (BUILTIN_SEQUENCES, compile_sequence, load_sequences,
+                             pick_sequence)
+from clicker.app import main
+from clicker.engine import MultiClicker, parse_target
+from clicker.input_backend import ClickTimings, FailSafeError, RecordingBackend
+from clicker.renderer import StatusRenderer
+from clicker.topology import StaticTopology
+from tests.conftest import FakeIdleSource, FakeReadiness, FakeWatcher
+
+
+class FakeClock:
+    """Clock advanced only by the fake sleep"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class LaggingBackend(RecordingBackend):
+    """Pointer arrives only after a few position() queries"""
+
+    def __init__(self, lag):
+        super().__init__()
+        self.lag = lag
+        self.target = self.pointer
+
+    def move(self, x, y):
+        self.fail_safe_check()
+        self._record('move', x, y)
+        self.target = (x, y)
+
+    def position(self):
+        if self.lag:
+            self.lag -= 1
+            return self.pointer
+        self.pointer = self.target
+        return self.pointer
+
+
+class FakeImage:
+    def __init__(self, data):
+        self.data = data
+
+    def tobytes(self):
+        return self.data
+
+
+class TestCompile(unittest.TestCase):
+    """Test sequences are validated once, with the step named in errors"""
+
+    def test_builtins_compile(self):
+        """Test every built-in sequence is valid"""
+        library = load_sequences()
+        self.assertEqual(set(library), set(BUILTIN_SEQUENCES))
+
+    def test_errors(self):
+        """Test malformed steps raise ValueError naming the step"""
+        bad = [
+            [],
+            [{'move': 'nowhere'}],
+            ['click', {'jump': 1}],
+            [{'click': 5}],
+            [{'type': ''}],
+            [{'sleep': -1}],
+            ['click', {'wait': 'moon-phase'}],
+            ['click', {'wait': 'pointer-at', 'colour': 'red'}],
+            [{'wait': 'cpu-up'}],
+            ['click', {'wait': 'region-changed', 'region': ['a', 0, 1, 1]}],
+            ['click', {'wait': 'region-changed', 'region': [0, 0, 0, 1]}],
+        ]
+        for steps in bad:
+            with self.assertRaisesRegex(ValueError, "sequence 'x'"):
+                compile_sequence('x', steps)
+
+    def test_type_maps_characters(self):
+        """Test typed text becomes key names"""
+        backend = RecordingBackend()
+        compile_sequence('x', [{'type': 'y \n'}]).run(backend, (10, 10), sleep=lambda s: None)
+        self.assertEqual(backend.actions(), [('press', 'y'), ('press', 'space'),
+                                             ('press', 'enter')])
+
+    def test_file(self):
+        """Test a file adds sequences and unknown names list the known ones"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'actions.json')
+            with open(path, 'w') as f:
+                json.dump({'menu': [{'move': 'target', 'offset': [0, 40]}, 'click']}, f)
+            library = load_sequences(path)
+        self.assertIn('menu', library)
+        self.assertIn('yes', library)
+        with self.assertRaisesRegex(ValueError, 'known: enter, menu'):
+            pick_sequence(library, 'nope')
+
+
+class TestWaits(unittest.TestCase):
+    """Test waits end as soon as their condition holds"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def run_sequence(self, steps, backend=None, **kwargs):
+        backend = backend or RecordingBackend()
+        ctx = compile_sequence('x', steps).run(backend, (500, 400), sleep=self.clock.sleep,
+                                              clock=self.clock, **kwargs)
+        return backend, ctx
+
+    def test_pointer_at_ends_early(self):
+        """Test the move settle lasts only until the pointer arrived"""
+        backend, ctx = self.run_sequence(
+            [{'move': 'target'}, {'wait': 'pointer-at', 'timeout': 1, 'poll': 0.01}, 'click',
+             {'move': 'back'}], backend=LaggingBackend(lag=3))
+        self.assertTrue(ctx.waits[0][1])
+        # A couple of polls instead of the full second
+        self.assertLess(ctx.elapsed, 0.05)
+        self.assertEqual(backend.actions(), [('move', 500, 400), ('click',), ('move', 100, 100)])
+
+    def test_timeout(self):
+        """Test an unmet condition gives up after its timeout and the sequence goes on"""
+        backend, ctx = self.run_sequence(
+            [{'move': 'target'}, {'wait': 'pointer-at', 'timeout': 0.3}, 'click'],
+            backend=LaggingBackend(lag=1000))
+        self.assertFalse(ctx.waits[0][1])
+        self.assertAlmostEqual(ctx.elapsed, 0.3)
+        self.assertEqual(backend.actions()[-1], ('click',))
+
+    def test_region_changed(self):
+        """Test the baseline is taken before the preceding input step"""
+        frames = iter([b'before', b'before', b'before', b'after'])
+        grabs = []
+
+        def grab(region):
+            grabs.append(region)
+            return FakeImage(next(frames))
+        backend, ctx = self.run_sequence(
+            [{'move': 'target'}, 'click', {'sleep': 0.1},
+             {'wait': 'region-changed', 'size': [100, 20], 'poll': 0.05}], grab=grab)
+        self.assertTrue(ctx.waits[0][1])
+        self.assertAlmostEqual(ctx.waits[0][2], 0.1)
+        self.assertEqual(grabs[0], (450, 390, 100, 20))
+
+    def test_cpu_up(self):
+        """Test the wait ends once the process tree used CPU"""
+        def busy_sleep(seconds):
+            end = time.process_time() + 0.05
+            while time.process_time() < end:
+                pass
+        ctx = compile_sequence('x', [{'key': 'enter'}, {'wait': 'cpu-up', 'timeout': 5}]).run(
+            RecordingBackend(), (10, 10), sleep=busy_sleep, pids=lambda: [os.getpid()])
+        condition, met, seconds = ctx.waits[0]
+        self.assertTrue(met)
+        self.assertLess(seconds, 5)
+
+    def test_fail_safe_stops(self):
+        """Test the fail-safe aborts the sequence like the classic click"""
+        backend = RecordingBackend(position=(0, 0))
+        with self.assertRaises(FailSafeError):
+            self.run_sequence([{'move': 'target'}, 'click'], backend=backend)
+
+
+class TestClickerActions(unittest.TestCase):
+    """Test the clicker runs the configured sequence"""
+
+    def make(self, cls, *args, **kwargs):
+        self.now = 0.0
+        tracker = ActivityTracker(clock=lambda: self.now)
+        self.backend = RecordingBackend(clock=lambda: self.now)
+        clicker = cls(Config(timings=ClickTimings(0, 0, 0), indicator=False), *args,
+                      tracker=tracker, watcher=FakeWatcher(), backend=self.backend,
+                      idle_source=FakeIdleSource(), renderer=StatusRenderer(enabled=False),
+                      readiness=FakeReadiness(), topology=StaticTopology((1920, 1080)),
+                      sleep=self.sleep, **kwargs)
+        clicker.setup()
+        return clicker
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def test_sequence_replaces_click(self):
+        """Test the press-1 sequence is clicked instead of click + Enter"""
+        library = load_sequences()
+        clicker = self.make(Clicker, actions=library['press-1'])
+        self.assertTrue(clicker.click(20.0))
+        self.assertEqual(self.backend.actions(), [
+            ('move', 1520, 980), ('click',), ('press', '1'), ('move', 100, 100)])
+
+    def test_target_sequence(self):
+        """Test each target runs its own sequence or the default one"""
+        library = load_sequences()
+        config = Config()
+        first = parse_target({'name': 'a', 'position': [10, 10], 'sequence': 'yes'}, 1, config)
+        second = parse_target({'name': 'b', 'position': [20, 20], 'idle_timeout': 40}, 2,
+                              config)
+        self.assertEqual(first.sequence, 'yes')
+        first.actions = pick_sequence(library, first.sequence)
+        clicker = self.make(MultiClicker, [first, second])
+        clicker.click(20.0)
+        self.assertIn(('press', 'y'), self.backend.actions())
+        clicker.select(second)
+        self.assertIsNone(clicker.actions)
+
+    def test_unknown_sequence_on_command_line(self):
+        """Test an unknown --sequence stops startup with status 2"""
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(main(['--sequence', 'nope']), 2)
+        self.assertIn('unknown action sequence', err.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
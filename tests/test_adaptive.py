@@ -0,0 +1,205 @@
+"""
+Unit tests for the adaptive idle timeout
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from clicker import ActivityTracker, Clicker, Config, IdleScheduler
+from clicker.adaptive import AdaptiveTimeout, P2Quantile
+from clicker.config import parse_args
+from clicker.input_backend import ClickTimings, RecordingBackend
+from clicker.renderer import StatusRenderer
+from clicker.topology import StaticTopology
+from tests.conftest import FakeIdleSource, FakeReadiness, FakeWatcher
+
+
+def exact_quantile(samples, p):
+    ordered = sorted(samples)
+    return ordered[int(p * (len(ordered) - 1))]
+
+
+class TestP2Quantile(unittest.TestCase):
+    """Test the streaming quantile estimate"""
+
+    def test_matches_exact_quantile(self):
+        """Test the estimate is close to the sorted-sample quantile"""
+        rng = random.Random(1)
+        for p in (0.5, 0.9, 0.95):
+            samples = [rng.expovariate(1 / 15) for _ in range(5000)]
+            estimator = P2Quantile(p)
+            for x in samples:
+                estimator.add(x)
+            exact = exact_quantile(samples, p)
+            self.assertAlmostEqual(estimator.value(), exact, delta=exact * 0.05)
+
+    def test_few_samples(self):
+        """Test the first five samples give a nearest-rank quantile"""
+        estimator = P2Quantile(0.9)
+        self.assertIsNone(estimator.value())
+        for x in (3, 1, 2):
+            estimator.add(x)
+        self.assertEqual(estimator.value(), 3)
+
+    def test_constant_memory(self):
+        """Test only five markers are kept however many samples arrive"""
+        estimator = P2Quantile(0.9)
+        for i in range(10000):
+            estimator.add(i % 97)
+        self.assertEqual(len(estimator.heights), 5)
+
+    def test_invalid(self):
+        """Test quantiles outside (0, 1) are rejected"""
+        with self.assertRaises(ValueError):
+            P2Quantile(1.5)
+
+
+class TestAdaptiveTimeout(unittest.TestCase):
+    """Test learning, censoring by clicks and persistence"""
+
+    def feed(self, adaptive, pauses):
+        now = 0.0
+        for pause in pauses:
+            adaptive.resumed(now, now + pause)
+            now += pause + 1
+
+    def test_learning_then_clamped(self):
+        """Test no timeout before enough pauses, then the clamped percentile"""
+        adaptive = AdaptiveTimeout(percentile=90, minimum=5, maximum=60)
+        self.feed(adaptive, [8, 9, 10, 11])
+        self.assertIsNone(adaptive.timeout())
+        self.assertEqual(adaptive.label(), '| learning 4/5')
+        self.feed(adaptive, [12] * 20)
+        self.assertEqual(adaptive.timeout(), 12.0)
+        self.feed(adaptive, [1] * 1000)
+        self.assertEqual(adaptive.timeout(), 5)
+
+    def test_click_counts_once_per_pause(self):
+        """Test repeated clicks and the return after them are one long pause"""
+        adaptive = AdaptiveTimeout(percentile=90, minimum=5, maximum=60)
+        adaptive.click(100.0, 120.0)
+        adaptive.click(120.0, 140.0)
+        adaptive.resumed(140.0, 150.0)
+        self.assertEqual((adaptive.pauses, adaptive.clicked), (1, 1))
+        self.assertEqual(adaptive.estimate(), 60)
+        # The next pause starts with fresh activity and is counted
+        adaptive.resumed(151.0, 160.0)
+        self.assertEqual(adaptive.pauses, 2)
+
+    def test_frequent_clicks_raise_timeout(self):
+        """Test the timeout grows when too many pauses end in a click"""
+        adaptive = AdaptiveTimeout(percentile=90, minimum=5, maximum=60)
+        self.feed(adaptive, [10] * 50)
+        before = adaptive.timeout()
+        now = 1000.0
+        for _ in range(20):
+            adaptive.click(now, now + before)
+            now += before + 30
+        self.assertGreater(adaptive.timeout(), before)
+
+    def test_save_and_load(self):
+        """Test the learned state survives a restart"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'adaptive.json')
+            adaptive = AdaptiveTimeout.load(path, percentile=80)
+            self.assertEqual(adaptive.pauses, 0)
+            self.feed(adaptive, [4, 6, 8, 10, 12, 14, 16])
+            adaptive.save()
+            self.assertFalse(adaptive.dirty)
+            loaded = AdaptiveTimeout.load(path, percentile=80)
+            self.assertEqual(loaded.pauses, 7)
+            self.assertEqual(loaded.timeout(), adaptive.timeout())
+            self.assertEqual(os.listdir(tmp), ['adaptive.json'])
+            # Learned for another percentile: start over
+            self.assertEqual(AdaptiveTimeout.load(path, percentile=95).pauses, 0)
+
+    def test_corrupt_state(self):
+        """Test an unreadable state file raises ValueError"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'adaptive.json')
+            for content in ('{', json.dumps({'version': 1, 'percentile': 90})):
+                with open(path, 'w') as f:
+                    f.write(content)
+                with self.assertRaises(ValueError):
+                    AdaptiveTimeout.load(path)
+
+    def test_invalid_range(self):
+        """Test a minimum above the maximum is rejected"""
+        with self.assertRaises(ValueError):
+            AdaptiveTimeout(minimum=30, maximum=10)
+
+    def test_command_line(self):
+        """Test the adaptive options reach the config"""
+        config = parse_args(['--adaptive', '--adaptive-percentile', '75',
+                             '--adaptive-min', '3', '--adaptive-max', '40'])
+        self.assertTrue(config.adaptive)
+        self.assertEqual((config.adaptive_percentile, config.adaptive_min,
+                          config.adaptive_max), (75, 3, 40))
+        self.assertFalse(parse_args([]).adaptive)
+
+
+class TestClickerAdaptive(unittest.TestCase):
+    """Test the clicker learns from the tracker and applies the timeout"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.tracker = ActivityTracker(clock=lambda: self.now)
+        self.adaptive = AdaptiveTimeout(percentile=90, minimum=5, maximum=60)
+        config = Config(timings=ClickTimings(0, 0, 0), indicator=False)
+        self.clicker = Clicker(config, tracker=self.tracker,
+                               scheduler=IdleScheduler(self.tracker, 20, sleep=self.sleep),
+                               watcher=FakeWatcher(), backend=RecordingBackend(),
+                               idle_source=FakeIdleSource(), indicator=None,
+                               renderer=StatusRenderer(enabled=False),
+                               readiness=FakeReadiness(),
+                               topology=StaticTopology((1920, 1080)), adaptive=self.adaptive,
+                               sleep=lambda seconds: None)
+        self.clicker.setup()
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def pause(self, seconds):
+        self.now += seconds
+        self.tracker.touch()
+
+    def test_pauses_set_timeout(self):
+        """Test pauses between activity become the idle timeout"""
+        for _ in range(10):
+            self.pause(8)
+        self.assertEqual(self.clicker.idle_timeout, 20)
+        self.clicker.apply_adaptive()
+        self.assertEqual(self.clicker.idle_timeout, 8)
+        self.assertEqual(self.clicker.status()['adaptive']['pauses'], 10)
+
+    def test_click_is_censored(self):
+        """Test a click and the return after it count as one pause"""
+        self.clicker.step()
+        self.assertEqual(self.clicker.clicks, 1)
+        self.pause(10)
+        self.assertEqual((self.adaptive.pauses, self.adaptive.clicked), (1, 1))
+
+    def test_manual_timeout_wins(self):
+        """Test `ctl set-timeout` stops the learned timeout from being applied"""
+        for _ in range(10):
+            self.pause(8)
+        self.clicker.do_set_timeout(30)
+        self.clicker.apply_adaptive()
+        self.assertEqual(self.clicker.idle_timeout, 30)
+
+    def test_state_saved_on_close(self):
+        """Test close() writes what was learned"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.adaptive.path = os.path.join(tmp, 'adaptive.json')
+            self.pause(8)
+            self.clicker.close()
+            self.assertEqual(AdaptiveTimeout.load(self.adaptive.path).pauses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Unit tests for the benchmark suite and its regression check
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+spec = importlib.util.spec_from_file_location(
+    'bench_suite', os.path.join(ROOT, 'benchmarks', 'bench_suite.py'))
+bench_suite = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bench_suite)
+
+
+def results(**values):
+    return {'results': {name.replace('_', '.'): {'value': value, 'unit': 'us'}
+                        for name, value in values.items()}}
+
+
+class TestCompare(unittest.TestCase):
+    """Test the threshold-based regression check"""
+
+    def test_slower_than_threshold(self):
+        """Test only results over the allowed slowdown are reported"""
+        baseline = results(render_frame=10.0, click_sequence=10.0)
+        current = results(render_frame=12.0, click_sequence=13.0)
+        self.assertEqual(bench_suite.compare(baseline, current, 0.25),
+                         [('click.sequence', 10.0, 13.0)])
+
+    def test_noise_floor_and_new_results(self):
+        """Test tiny values and results missing from the baseline never fail"""
+        baseline = results(activity_touch=0.1)
+        current = results(activity_touch=0.3, render_frame=50.0)
+        self.assertEqual(bench_suite.compare(baseline, current, 0.25), [])
+
+
+class TestSuite(unittest.TestCase):
+    """Test a quick run writes comparable JSON"""
+
+    def test_json_round_trip(self):
+        """Test --json output is accepted by --compare"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.json')
+            argv = ['-b', 'render', 'click', 'activity', '--quick']
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(bench_suite.main(argv + ['--json', path]), 0)
+                with open(path) as f:
+                    data = json.load(f)
+                self.assertEqual(bench_suite.main(argv + ['--compare', path,
+                                                          '--threshold', '100']), 0)
+        self.assertEqual(sorted(data['results']),
+                         ['activity.cpu_at_1khz', 'activity.evdev_sample', 'activity.touch',
+                          'click.sequence', 'render.bytes_per_frame', 'render.frame'])
+        self.assertIn('python', data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,7 @@ import os
 
 # Add parent directory to path to import clicker module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from tests.conftest import FakeIdleSource, FakeReadiness, FakeWatcher
 
 
 class TestClickerArguments(unittest.TestCase):
@@ -294,5 +295,130 @@ class TestClickSequence(unittest.TestCase):
         self.assertEqual(mock_sleep.call_count, 3)
 
 
+class TestConfig(unittest.TestCase):
+    """Test the real argument parser of the clicker package"""
+
+    def test_default_timeout(self):
+        """Test default idle timeout is 20 seconds"""
+        from clicker.config import parse_args
+        self.assertEqual(parse_args([]).idle_timeout, 20)
+
+    def test_fast_mode(self):
+        """Test -f with and without a value"""
+        from clicker.config import parse_args
+        self.assertEqual(parse_args(['-f']).idle_timeout, 1)
+        self.assertEqual(parse_args(['-f', '10']).idle_timeout, 10)
+
+    def test_timings(self):
+        """Test settle delays end up in the click timings"""
+        from clicker.config import parse_args
+        config = parse_args(['--move-settle', '0', '--click-settle', '0.1'])
+        self.assertEqual(config.timings.move_settle, 0)
+        self.assertEqual(config.timings.click_settle, 0.1)
+        self.assertEqual(config.timings.enter_settle, 0.2)
+
+    def test_bad_match_pattern(self):
+        """Test --match must be a valid regex"""
+        import contextlib
+        import io
+        from clicker.config import parse_args
+        self.assertEqual(parse_args(['--match', 'claude|codex']).match, 'claude|codex')
+        with contextlib.redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit):
+            parse_args(['--match', '('])
+        self.assertIn('bad regex', stderr.getvalue())
+
+
+class TestClickerLoop(unittest.TestCase):
+    """Test the real Clicker loop with fake components"""
+
+    def setUp(self):
+        from clicker import ActivityTracker, Clicker, Config, IdleScheduler
+        from clicker.input_backend import ClickTimings, RecordingBackend
+        from clicker.renderer import StatusRenderer
+
+        self.now = 0.0
+        clock = lambda: self.now
+        self.tracker = ActivityTracker(clock=clock)
+        self.scheduler = IdleScheduler(self.tracker, 20, sleep=self.sleep)
+        self.backend = RecordingBackend(clock=clock)
+        self.watcher = FakeWatcher()
+        self.readiness = FakeReadiness()
+        config = Config(timings=ClickTimings(0, 0, 0), indicator=False)
+        self.clicker = Clicker(config, tracker=self.tracker, scheduler=self.scheduler,
+                               watcher=self.watcher, backend=self.backend,
+                               idle_source=FakeIdleSource(), readiness=self.readiness,
+                               renderer=StatusRenderer(enabled=False))
+        self.clicker.setup()
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def test_target_from_screen_size(self):
+        """Test the target is derived from the backend's screen size"""
+        self.assertEqual(self.clicker.target, (1520, 980))
+
+    def test_clicks_after_idle_timeout(self):
+        """Test one step sleeps to the deadline and clicks"""
+        self.clicker.step()
+        self.assertEqual(self.now, 20)
+        self.assertEqual(self.clicker.clicks, 1)
+        self.assertIn(('press', 'enter'), self.backend.actions())
+
+    def test_no_click_without_claude(self):
+        """Test nothing is clicked when Claude is not running"""
+        self.watcher.running = False
+        self.clicker.step()
+        self.assertEqual(self.clicker.clicks, 0)
+        self.assertEqual(self.backend.calls, [])
+
+    def test_no_click_while_claude_busy(self):
+        """Test a busy Claude defers the click until it is ready"""
+        self.readiness.answer = False
+        self.clicker.step()
+        self.assertEqual(self.clicker.clicks, 0)
+        self.assertTrue(self.clicker.claude_busy)
+        self.readiness.answer = True
+        self.clicker.step()
+        self.assertEqual(self.clicker.clicks, 1)
+        self.assertEqual(self.now, 22)
+
+    def test_click_is_journaled(self):
+        """Test clicks and process changes are written to the journal"""
+        import tempfile
+        from clicker.journal import Journal
+        from clicker.stats import load
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'clicker.journal')
+            self.clicker.journal = Journal(path, capacity=16)
+            self.clicker.step()
+            self.watcher.running = False
+            self.clicker.step()
+            self.clicker.journal.close()
+            records = load(path)
+            self.assertEqual(list(records['event']), [1, 4])
+            self.assertEqual(float(records[0]['idle']), 20)
+
+    def test_metrics(self):
+        """Test the loop updates tick, scan and click metrics"""
+        from clicker.metrics import ClickerMetrics
+        metrics = self.clicker.metrics = ClickerMetrics()
+        self.clicker.step()
+        self.assertEqual(metrics.ticks.value, 1)
+        self.assertEqual(metrics.tick_lateness.sum, 0)
+        self.assertEqual(metrics.scans.count, 1)
+        self.assertEqual(metrics.clicks.value, 1)
+        self.assertEqual(metrics.click_latency.count, 1)
+        self.backend.pointer = (0, 0)
+        self.clicker.step()
+        self.assertEqual(metrics.fail_safes.value, 1)
+
+    def test_fail_safe_skips_click(self):
+        """Test the fail-safe skips the click and resets the idle timer"""
+        self.backend.pointer = (0, 0)
+        self.clicker.step()
+        self.assertEqual(self.clicker.clicks, 0)
+        self.assertEqual(self.tracker.idle_time(), 0)
+
+
 if __name__ == '__main__':
     unittest.main()
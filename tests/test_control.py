@@ -0,0 +1,206 @@
+"""
+Unit tests for the Unix-socket control plane
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from clicker import ActivityTracker, Clicker, Config, IdleScheduler
+from clicker.control import CommandQueue, ControlServer, main, parse_request, request
+from clicker.input_backend import ClickTimings, RecordingBackend
+from clicker.renderer import StatusRenderer
+from tests.conftest import FakeIdleSource, FakeReadiness, FakeWatcher
+
+
+class TestParseRequest(unittest.TestCase):
+    """Test the line and JSON request formats"""
+
+    def test_words(self):
+        """Test plain word requests and argument conversion"""
+        self.assertEqual(parse_request('status\n'), ('status', []))
+        self.assertEqual(parse_request('set-timeout 30'), ('set-timeout', [30.0]))
+        self.assertEqual(parse_request('retarget 800 -1'), ('retarget', [800, -1]))
+
+    def test_json(self):
+        """Test JSON object requests"""
+        self.assertEqual(parse_request('{"command": "retarget", "args": [1, 2]}'),
+                         ('retarget', [1, 2]))
+
+    def test_invalid(self):
+        """Test unknown commands and bad arguments raise ValueError"""
+        for line in ('', 'reboot', 'set-timeout', 'set-timeout soon', 'retarget 1',
+                     '{"command": "pause", "args": 5}', '[1]', '{"command": ["status"]}',
+                     'set-timeout nan', 'set-timeout inf',
+                     '{"command": "set-timeout", "args": [1e999]}'):
+            with self.assertRaises(ValueError):
+                parse_request(line)
+
+
+class TestCommandQueue(unittest.TestCase):
+    """Test handing commands to the main loop"""
+
+    def test_reply_from_main_loop(self):
+        """Test submit() waits for run_pending() on another thread"""
+        interrupts = []
+        commands = CommandQueue(interrupt=lambda: interrupts.append(1))
+        replies = []
+        thread = threading.Thread(
+            target=lambda: replies.append(commands.submit('set-timeout', [5.0])))
+        thread.start()
+        while not interrupts:
+            pass
+        commands.run_pending(lambda name, args: {'idle_timeout': args[0]})
+        thread.join(timeout=2)
+        self.assertEqual(replies, [{'ok': True, 'idle_timeout': 5.0}])
+
+    def test_errors_are_replies(self):
+        """Test an exception becomes an error reply"""
+        commands = CommandQueue()
+        results = []
+        thread = threading.Thread(target=lambda: results.append(commands.submit('pause', [])))
+        thread.start()
+        while not results:
+            commands.run_pending(lambda name, args: 1 / 0)
+        thread.join(timeout=2)
+        self.assertFalse(results[0]['ok'])
+        self.assertIn('division', results[0]['error'])
+
+
+class TestControlServer(unittest.TestCase):
+    """Test a running clicker reconfigured over the socket"""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'clicker.sock')
+        tracker = ActivityTracker()
+        self.backend = RecordingBackend()
+        self.clicker = Clicker(Config(timings=ClickTimings(0, 0, 0), indicator=False),
+                               tracker=tracker, scheduler=IdleScheduler(tracker, 1000),
+                               watcher=FakeWatcher(), backend=self.backend,
+                               idle_source=FakeIdleSource(), readiness=FakeReadiness(),
+                               renderer=StatusRenderer(enabled=False))
+        self.clicker.setup()
+        self.server = ControlServer(self.path, self.clicker.status,
+                                    self.clicker.commands.submit)
+        self.server.start()
+        self.thread = threading.Thread(target=self.clicker.run)
+        self.thread.start()
+
+    def tearDown(self):
+        self.clicker.stop()
+        self.thread.join(timeout=5)
+        self.server.close()
+        shutil.rmtree(self.dir)
+
+    def ctl(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            status = main(['--socket', self.path, '--json'] + list(argv))
+        return status, json.loads(out.getvalue())
+
+    def test_socket_is_private(self):
+        """Test the socket is only accessible to the owner"""
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_status(self):
+        """Test status is answered from in-memory state"""
+        status, reply = self.ctl('status')
+        self.assertEqual(status, 0)
+        self.assertEqual(reply['state'], 'running')
+        self.assertEqual(reply['idle_timeout'], 1000)
+        self.assertEqual(reply['target'], [1520, 980])
+        self.assertEqual(reply['pid'], os.getpid())
+
+    def test_live_reconfiguration(self):
+        """Test pause, resume, set-timeout and retarget change the running loop"""
+        self.assertEqual(self.ctl('pause')[1], {'ok': True})
+        self.assertEqual(self.ctl('status')[1]['state'], 'paused')
+        self.assertIsNone(self.ctl('status')[1]['next_click_in'])
+        self.ctl('resume')
+        self.assertEqual(self.ctl('set-timeout', '500')[1]['idle_timeout'], 500)
+        self.assertEqual(self.clicker.idle_timeout, 500)
+        self.assertEqual(self.ctl('retarget', '10', '20')[1]['target'], [10, 20])
+        self.assertEqual(self.clicker.target, (10, 20))
+
+    def test_non_finite_timeout(self):
+        """Test nan and inf timeouts are refused and the loop keeps its timeout"""
+        for value in ('nan', 'inf', '-inf'):
+            reply = request(self.path, f'set-timeout {value}')
+            self.assertFalse(reply['ok'])
+            self.assertIn('finite', reply['error'])
+        self.assertEqual(self.clicker.idle_timeout, 1000)
+        with self.assertRaises(ValueError):
+            self.clicker.do_set_timeout(float('nan'))
+
+    def test_click_now(self):
+        """Test click-now runs the click sequence on the main loop"""
+        status, reply = self.ctl('click-now')
+        self.assertTrue(reply['clicked'])
+        self.assertIn(['press', 'enter'], [list(a) for a in self.backend.actions()])
+
+    def test_errors(self):
+        """Test invalid values are rejected without stopping the loop"""
+        status, reply = self.ctl('retarget', '99999', '0')
+        self.assertEqual(status, 1)
+        self.assertIn('outside', reply['error'])
+        self.assertTrue(self.thread.is_alive())
+
+    def test_several_requests_per_connection(self):
+        """Test a connection can carry several request lines"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            sock.sendall(b'status\nbogus\n')
+            reader = sock.makefile('r')
+            self.assertTrue(json.loads(reader.readline())['ok'])
+            self.assertFalse(json.loads(reader.readline())['ok'])
+
+    def test_request_too_long(self):
+        """Test an oversized line is refused as a whole and the next one answered"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            sock.sendall(b'status ' * 2000 + b'\nstatus\n')
+            reader = sock.makefile('r')
+            self.assertEqual(json.loads(reader.readline())['error'], 'request too long')
+            self.assertTrue(json.loads(reader.readline())['ok'])
+
+    def test_survives_bad_requests(self):
+        """Test malformed requests and a failing status() leave the server answering"""
+        reply = request(self.path, '{"command": ["status"]}')
+        self.assertFalse(reply['ok'])
+        self.assertIn('command must be a string', reply['error'])
+        status = self.server.status
+        self.server.status = lambda: 1 / 0
+        with self.assertLogs('clicker.control', 'ERROR'):
+            reply = request(self.path, 'status')
+        self.assertIn('ZeroDivisionError', reply['error'])
+        self.server.status = status
+        self.assertEqual(request(self.path, 'status')['state'], 'running')
+
+    def test_second_server_refused(self):
+        """Test a live socket is not taken over by another clicker"""
+        with self.assertRaises(OSError):
+            ControlServer(self.path, dict, None).start()
+        self.assertTrue(request(self.path, 'status')['ok'])
+
+
+class TestClient(unittest.TestCase):
+    """Test the client without a daemon"""
+
+    def test_no_daemon(self):
+        """Test a missing socket is an error with status 1"""
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(main(['--socket', '/nonexistent/clicker.sock', 'status']), 1)
+        self.assertIn('Error', err.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,255 @@
+"""
+Unit tests for several X displays served by one clicker
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import shutil
+import time
+import unittest
+
+import pytest
+
+from clicker.adaptive import AdaptiveTimeout
+from clicker.config import Config
+from clicker.displays import Display, open_display
+from clicker.engine import MultiClicker, parse_target
+from clicker.input_backend import ClickTimings, RecordingBackend
+from clicker.renderer import StatusRenderer
+from clicker.scheduler import ActivityTracker, Target, TargetScheduler
+from clicker.topology import Monitor, StaticTopology
+from tests.conftest import FakeIdleSource, FakeIndicator, FakeReadiness, FakeWatcher, XvfbMixin
+
+
+class ResizableTopology(StaticTopology):
+    """Static layout that reports one change after resize()"""
+
+    def __init__(self, size):
+        super().__init__(size)
+        self.changed = False
+
+    def resize(self, size):
+        self.size = size
+        self.monitors = [Monitor('screen', 0, 0, *size, primary=True)]
+        self.changed = True
+
+    def poll(self):
+        changed, self.changed = self.changed, False
+        return changed
+
+
+class TestTargetsFile(unittest.TestCase):
+    """Test the display key of the targets file"""
+
+    def test_display_key(self):
+        """Test a target can name its X display and bad names are rejected"""
+        target = parse_target({'name': 'xvfb', 'display': ':2'}, 1, Config())
+        self.assertEqual(target.display, ':2')
+        self.assertIsNone(parse_target({}, 1, Config()).display)
+        for bad in (2, 'two'):
+            with self.assertRaisesRegex(ValueError, 'target 1: display'):
+                parse_target({'display': bad}, 1, Config())
+
+
+class TestDefaultDisplay(unittest.TestCase):
+    """Test which display the inherited connections go to"""
+
+    def make(self, displays, default=':0'):
+        targets = [Target(f"t{i}", display=name) for i, name in enumerate(displays)]
+        tracker = ActivityTracker()
+        return MultiClicker(Config(display=default), None, tracker=tracker,
+                            scheduler=TargetScheduler(tracker, targets),
+                            watcher=FakeWatcher(()))
+
+    def test_unnamed_targets_on_default(self):
+        """Test targets without a display are on $DISPLAY or --display"""
+        clicker = self.make([None, ':2'])
+        self.assertEqual(clicker.display_name, ':0')
+        self.assertEqual([t.display for t in clicker.targets], [':0', ':2'])
+
+    def test_unused_default_not_opened(self):
+        """Test the first named display stands in when nothing is on the default"""
+        clicker = self.make([':3', ':2', ':3'])
+        self.assertEqual(clicker.display_name, ':3')
+
+
+class TestMultiDisplay(unittest.TestCase):
+    """Test one loop clicking on two displays with their own activity"""
+
+    def setUp(self):
+        self.now = 0.0
+        clock = lambda: self.now
+        self.tracker = ActivityTracker(clock=clock)
+        self.local = Target('local', position=(-400, -100), match='a', idle_timeout=20,
+                            readiness=FakeReadiness())
+        self.remote = Target('remote', position=(-400, -100), match='b', idle_timeout=30,
+                             readiness=FakeReadiness(), display=':2')
+        self.scheduler = TargetScheduler(self.tracker, [self.local, self.remote],
+                                         sleep=self.sleep)
+        self.backend = RecordingBackend(clock=clock)
+        self.indicator = FakeIndicator()
+        self.remote_backend = RecordingBackend(size=(1280, 800), clock=clock)
+        self.remote_topology = ResizableTopology((1280, 800))
+        self.remote_tracker = ActivityTracker(clock=clock)
+        self.remote_source = FakeIdleSource()
+        self.remote_indicator = FakeIndicator()
+        self.remote_display = Display(':2', self.remote_backend, self.remote_topology,
+                                      self.remote_source, self.remote_tracker,
+                                      self.remote_indicator)
+        config = Config(timings=ClickTimings(0, 0, 0), display=':0')
+        self.clicker = MultiClicker(config, None, tracker=self.tracker,
+                                    scheduler=self.scheduler, watcher=FakeWatcher({'a', 'b'}),
+                                    backend=self.backend, idle_source=FakeIdleSource(),
+                                    indicator=self.indicator,
+                                    topology=StaticTopology((1920, 1080)),
+                                    renderer=StatusRenderer(enabled=False),
+                                    displays={':2': self.remote_display})
+        self.clicker.setup()
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def clicks(self, backend):
+        return backend.actions().count(('click',))
+
+    def test_positions_on_own_screen(self):
+        """Test each target is resolved against its display's geometry"""
+        self.assertEqual(self.local.point, (1520, 980))
+        self.assertEqual(self.remote.point, (880, 700))
+        self.assertEqual(set(self.clicker.displays), {':0', ':2'})
+
+    def test_clicks_go_to_own_display(self):
+        """Test each click is sent through the connection of its display"""
+        self.clicker.step()
+        self.clicker.step()
+        self.clicker.step()
+        self.assertEqual(self.clicks(self.backend), 2)
+        self.assertEqual(self.clicks(self.remote_backend), 1)
+        self.assertIn(('move', 880, 700), self.remote_backend.actions())
+        self.assertNotIn(('move', 880, 700), self.backend.actions())
+        self.assertEqual(self.remote_indicator.calls.count('hide'), 1)
+        self.assertEqual(self.indicator.calls.count('hide'), 2)
+
+    def test_activity_is_per_display(self):
+        """Test typing on one display does not postpone the other one's clicks"""
+        self.now = 15
+        self.tracker.touch()
+        self.clicker.step()
+        self.assertEqual(self.now, 30)
+        self.assertEqual(self.remote.clicks, 1)
+        self.assertEqual(self.local.clicks, 0)
+        self.remote_tracker.touch()
+        self.clicker.step()
+        self.assertEqual(self.now, 35)
+        self.assertEqual(self.local.clicks, 1)
+
+    def test_own_activity_suppressed_per_display(self):
+        """Test the clicker's moves on a display are not taken for user input there"""
+        self.clicker.step()
+        self.clicker.step()
+        self.assertEqual(self.now, 30)
+        self.assertEqual(self.remote.clicks, 1)
+
+    def test_adaptive_sees_clicked_display(self):
+        """Test the adaptive estimator gets the activity of the display clicked on"""
+        pauses = []
+
+        class RecordingAdaptive(AdaptiveTimeout):
+            def click(self, start, restart):
+                pauses.append((start, restart))
+                super().click(start, restart)
+
+        self.clicker.adaptive = RecordingAdaptive()
+        self.now = 5
+        self.remote_tracker.touch()
+        self.clicker.step()
+        self.assertEqual(self.local.clicks, 1)
+        self.assertEqual(pauses, [(0, 0)])
+
+    def test_resume_on_every_display(self):
+        """Test a return to an extra display reaches the adaptive estimator"""
+        pauses = []
+
+        class RecordingAdaptive(AdaptiveTimeout):
+            def resumed(self, start, end):
+                pauses.append((start, end))
+                super().resumed(start, end)
+
+        self.clicker.adaptive = RecordingAdaptive()
+        self.clicker.hook_resume()
+        self.now = 12
+        self.remote_tracker.touch()
+        self.now = 16
+        self.tracker.touch()
+        self.assertEqual(pauses, [(0, 12), (0, 16)])
+
+    def test_layout_change_on_one_display(self):
+        """Test a resized display moves only its own target and indicator"""
+        self.remote_topology.resize((1024, 768))
+        self.assertTrue(self.clicker.check_layout())
+        self.assertEqual(self.remote.point, (624, 668))
+        self.assertEqual(self.local.point, (1520, 980))
+        self.clicker.select(self.remote)
+        self.assertIn(('move', 624, 668), self.remote_indicator.calls)
+        self.assertEqual(self.clicker.screen, (1024, 768))
+
+    def test_status_names_displays(self):
+        """Test status() tells which display each session is on"""
+        displays = [t['display'] for t in self.clicker.status()['targets']]
+        self.assertEqual(displays, [':0', ':2'])
+
+    def test_close_closes_every_display(self):
+        """Test closing releases the extra display and restores the default one"""
+        self.clicker.select(self.remote)
+        self.clicker.close()
+        self.assertTrue(self.remote_source.stopped)
+        self.assertIn('close', self.remote_indicator.calls)
+        self.assertIn('close', self.indicator.calls)
+        self.assertIs(self.clicker.backend, self.backend)
+        self.assertEqual(self.clicker.displays, {})
+
+
+@pytest.mark.integration
+@unittest.skipUnless(shutil.which('Xvfb'), 'Xvfb not installed')
+class TestXvfbDisplays(XvfbMixin, unittest.TestCase):
+    """Test one clicker against two local Xvfb servers"""
+
+    DISPLAYS = {':93': '800x600x24', ':94': '1024x768x24'}
+
+    def test_open_display(self):
+        """Test every display gets its own geometry, pointer and idle counter"""
+        displays = [open_display(name) for name in self.DISPLAYS]
+        try:
+            self.assertEqual([d.topology.size for d in displays], [(800, 600), (1024, 768)])
+            displays[0].backend.move(10, 20)
+            displays[1].backend.move(300, 400)
+            self.assertEqual(displays[0].backend.position(), (10, 20))
+            self.assertEqual(displays[1].backend.position(), (300, 400))
+            self.assertIsNotNone(displays[1].idle_source.last_activity())
+        finally:
+            for display in displays:
+                display.close()
+
+    def test_one_loop_two_servers(self):
+        """Test one process clicks a session on each server from one loop"""
+        targets = [Target(name, position=(-100, -100), match=name, idle_timeout=0.2,
+                          readiness=FakeReadiness(), display=name) for name in self.DISPLAYS]
+        tracker = ActivityTracker()
+        clicker = MultiClicker(Config(timings=ClickTimings(0, 0, 0), indicator=False,
+                                      refresh=0, display=':93'),
+                               None, tracker=tracker, scheduler=TargetScheduler(tracker, targets),
+                               watcher=FakeWatcher(set(self.DISPLAYS)),
+                               renderer=StatusRenderer(enabled=False))
+        try:
+            clicker.setup()
+            self.assertEqual([t.point for t in targets], [(700, 500), (924, 668)])
+            deadline = time.monotonic() + 5
+            while min(t.clicks for t in targets) < 1 and time.monotonic() < deadline:
+                clicker.step()
+            self.assertEqual([t.clicks for t in targets], [1, 1])
+        finally:
+            clicker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Unit tests for the multi-target engine
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from clicker.config import Config
+from clicker.engine import MultiClicker, load_targets
+from clicker.input_backend import ClickTimings, RecordingBackend
+from clicker.renderer import StatusRenderer
+from clicker.scheduler import ActivityTracker, Target, TargetScheduler
+from tests.conftest import FakeIdleSource, FakeIndicator, FakeReadiness, FakeWatcher
+
+
+class FakeVerifier:
+    """Every click is ineffective; records the timeouts backed off from"""
+    delay = 0
+
+    def __init__(self):
+        self.timeouts = []
+
+    def capture(self, point, exclude=None):
+        return None
+
+    def unchanged(self, before, key):
+        return False
+
+    def check(self, before, after, key):
+        return False
+
+    def backoff(self, timeout, key):
+        self.timeouts.append((key, timeout))
+        return None
+
+    def state(self, key):
+        return type('State', (), {'failures': 1})()
+
+
+class TestLoadTargets(unittest.TestCase):
+    """Test reading the targets file"""
+
+    def setUp(self):
+        self.config = Config(idle_timeout=15, match='claude')
+        fd, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def write(self, data):
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+
+    def test_defaults_from_config(self):
+        """Test missing fields fall back to the config"""
+        self.write([{'name': 'a', 'position': [100, -50]}, {'match': 'other'}])
+        a, b = load_targets(self.path, self.config)
+        self.assertEqual((a.name, a.position, a.match, a.idle_timeout),
+                         ('a', (100, -50), 'claude', 15))
+        self.assertEqual((b.name, b.match), ('target2', 'other'))
+
+    def test_image_target(self):
+        """Test image and region are kept for the locator"""
+        self.write([{'image': 'prompt.png', 'region': [0, 0, 800, 600]}])
+        target, = load_targets(self.path, self.config)
+        self.assertEqual((target.image, target.region), ('prompt.png', (0, 0, 800, 600)))
+
+    def test_invalid_files(self):
+        """Test bad content raises ValueError"""
+        for data in ([], {'name': 'a'}, [{'colour': 'red'}], [{'position': [1]}],
+                     [{'name': 'a'}, {'name': 'a'}]):
+            self.write(data)
+            with self.assertRaises(ValueError):
+                load_targets(self.path, self.config)
+
+    def test_bad_field_types(self):
+        """Test wrongly typed fields raise ValueError naming the entry"""
+        cases = [
+            ({'position': 5}, 'position'),
+            ({'position': ['1', 2]}, 'position'),
+            ({'region': 7}, 'region'),
+            ({'region': [0, 0, 800, True]}, 'region'),
+            ({'idle_timeout': None}, 'idle_timeout'),
+            ({'idle_timeout': -5}, 'idle_timeout'),
+            ({'idle_timeout': 'soon'}, 'idle_timeout'),
+            ({'match': '('}, 'match'),
+            ({'match': 3}, 'match'),
+        ]
+        for entry, field in cases:
+            self.write([{'name': 'ok'}, entry])
+            with self.assertRaisesRegex(ValueError, f'target 2: .*{field}'):
+                load_targets(self.path, self.config)
+
+
+class TestMultiClicker(unittest.TestCase):
+    """Test one daemon clicking several targets"""
+
+    def setUp(self):
+        self.now = 0.0
+        clock = lambda: self.now
+        self.tracker = ActivityTracker(clock=clock)
+        self.left = Target('left', position=(100, -100), match='a', idle_timeout=10,
+                           readiness=FakeReadiness())
+        self.right = Target('right', position=(-100, 100), match='b', idle_timeout=20,
+                            readiness=FakeReadiness())
+        self.scheduler = TargetScheduler(self.tracker, [self.left, self.right],
+                                         sleep=self.sleep)
+        self.backend = RecordingBackend(clock=clock)
+        self.watcher = FakeWatcher({'a', 'b'})
+        self.indicator = FakeIndicator()
+        config = Config(timings=ClickTimings(0, 0, 0))
+        self.clicker = MultiClicker(config, None, tracker=self.tracker,
+                                    scheduler=self.scheduler, watcher=self.watcher,
+                                    backend=self.backend, idle_source=FakeIdleSource(),
+                                    indicator=self.indicator,
+                                    renderer=StatusRenderer(enabled=False))
+        self.clicker.setup()
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def clicked_points(self):
+        return [tuple(args) for name, *args in self.backend.actions() if name == 'move']
+
+    def test_positions_relative_to_screen(self):
+        """Test negative coordinates count from the right/bottom edge"""
+        self.assertEqual(self.left.point, (100, 980))
+        self.assertEqual(self.right.point, (1820, 100))
+
+    def test_targets_fire_in_due_order(self):
+        """Test each target is clicked at its own timeout"""
+        self.clicker.step()
+        self.assertEqual(self.now, 10)
+        self.clicker.step()
+        self.assertEqual(self.now, 20)
+        self.assertEqual(self.left.clicks, 2)
+        self.assertEqual(self.right.clicks, 0)
+        self.assertIn((100, 980), self.clicked_points())
+
+    def test_both_targets_clicked(self):
+        """Test the slower target still fires while the faster one keeps clicking"""
+        for _ in range(4):
+            self.clicker.step()
+        self.assertEqual(self.right.clicks, 1)
+        self.assertIn((1820, 100), self.clicked_points())
+        self.assertIn('b', self.watcher.calls)
+
+    def test_missing_session_is_deferred(self):
+        """Test a target without its process does not block the others"""
+        self.watcher.running = {'b'}
+        for _ in range(3):
+            self.clicker.step()
+        self.assertEqual(self.now, 20)
+        self.assertEqual(self.left.clicks, 0)
+        self.assertEqual(self.right.clicks, 1)
+
+    def test_busy_session_is_deferred(self):
+        """Test a busy target is retried without clicking"""
+        self.left.readiness.answer = False
+        self.clicker.step()
+        self.assertEqual(self.left.clicks, 0)
+        self.assertTrue(self.clicker.claude_busy)
+
+    def test_indicator_follows_next_target(self):
+        """Test the single indicator moves to the next due target"""
+        self.left.not_before = 100
+        self.scheduler.set_timeout(10, self.left)
+        self.clicker.step()
+        self.assertEqual(self.right.clicks, 1)
+        self.assertIn((1820, 100), self.indicator.moves)
+
+    def test_bookkeeping_uses_clicked_target(self):
+        """Test verify backoff gets the timeout of the clicked target, not the next one"""
+        self.right.idle_timeout = 15
+        self.scheduler.set_timeout(15, self.right)
+        verifier = self.clicker.verifier = FakeVerifier()
+        with self.assertLogs('clicker', 'WARNING'):
+            self.clicker.step()
+            self.clicker.step()
+        self.assertEqual(verifier.timeouts, [(0, 10), (1, 15)])
+
+    def test_close_closes_every_readiness(self):
+        """Test closing the daemon releases per-target resources"""
+        self.clicker.close()
+        self.assertTrue(self.left.readiness.closed)
+        self.assertTrue(self.right.readiness.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Unit tests for the idle sources
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import pytest
+
+from clicker.idle_source import (EV_REL, INPUT_EVENT, EvdevIdleSource, PynputIdleSource,
+                                 create_idle_source)
+from clicker.scheduler import ActivityTracker
+from tests.conftest import XvfbMixin
+
+EV_SYN = 0
+
+
+class TestEvdevIdleSource(unittest.TestCase):
+    """Test evdev sampling through a FIFO standing in for /dev/input"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'event0')
+        os.mkfifo(self.path)
+        self.source = EvdevIdleSource(paths=[self.path])
+        self.source.start()
+        self.writer = os.open(self.path, os.O_WRONLY)
+
+    def tearDown(self):
+        os.close(self.writer)
+        self.source.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def write_event(self, timestamp, ev_type=EV_REL):
+        sec = int(timestamp)
+        usec = int((timestamp - sec) * 1e6)
+        os.write(self.writer, INPUT_EVENT.pack(sec, usec, ev_type, 0, 1))
+
+    def test_no_events(self):
+        """Test nothing is known before the first event"""
+        self.assertIsNone(self.source.last_activity())
+
+    def test_newest_event_wins(self):
+        """Test draining keeps the newest input timestamp"""
+        # A FIFO cannot switch clocks, so events carry wall-clock time
+        now = time.time()
+        self.write_event(now - 5)
+        self.write_event(now - 2)
+        self.write_event(now - 1, ev_type=EV_SYN)
+        last = self.source.last_activity()
+        self.assertAlmostEqual(time.monotonic() - last, 2, delta=0.1)
+
+    def test_value_kept_between_samples(self):
+        """Test an empty sample keeps the previous timestamp"""
+        self.write_event(time.time())
+        first = self.source.last_activity()
+        self.assertEqual(self.source.last_activity(), first)
+
+    def test_no_devices(self):
+        """Test starting without readable devices fails"""
+        source = EvdevIdleSource(paths=[os.path.join(self.tmpdir, 'missing')])
+        with self.assertRaises(RuntimeError):
+            source.start()
+
+
+class TestPynputIdleSource(unittest.TestCase):
+    """Test the callback-based fallback"""
+
+    def test_touch_records_time(self):
+        """Test listener callbacks only store a timestamp"""
+        clock = iter([42.0]).__next__
+        source = PynputIdleSource(clock=clock)
+        self.assertIsNone(source.last_activity())
+        source.touch(10, 20)
+        self.assertEqual(source.last_activity(), 42.0)
+
+
+class FixedSource:
+    def __init__(self, last):
+        self.last = last
+
+    def last_activity(self):
+        return self.last
+
+
+class TestTrackerSync(unittest.TestCase):
+    """Test the tracker sampling idle sources"""
+
+    def setUp(self):
+        self.now = 100.0
+        self.tracker = ActivityTracker(clock=lambda: self.now)
+
+    def test_newer_source_time_adopted(self):
+        """Test a newer source timestamp moves last activity"""
+        self.tracker.sources.append(FixedSource(105.0))
+        self.now = 110.0
+        self.assertEqual(self.tracker.idle_time(), 5.0)
+
+    def test_older_source_time_ignored(self):
+        """Test a stale source never moves activity backwards"""
+        self.tracker.sources.append(FixedSource(50.0))
+        self.assertEqual(self.tracker.idle_time(), 0.0)
+
+    def test_suppressed_input_ignored(self):
+        """Test activity caused by our own input is not adopted"""
+        source = FixedSource(None)
+        self.tracker.sources.append(source)
+        self.now = 120.0
+        with self.tracker.suppress():
+            source.last = 120.0
+        self.now = 130.0
+        self.assertEqual(self.tracker.idle_time(), 30.0)
+
+
+class TestCreateIdleSource(unittest.TestCase):
+    """Test idle source selection"""
+
+    def test_unknown(self):
+        """Test an unknown idle source is rejected"""
+        with self.assertRaises(ValueError):
+            create_idle_source('crystal-ball')
+
+
+@pytest.mark.integration
+@unittest.skipUnless(shutil.which('Xvfb'), 'Xvfb not installed')
+class TestXScreenSaverIdleSource(XvfbMixin, unittest.TestCase):
+    """Test the X server idle counter against a local Xvfb display"""
+
+    DISPLAY = ':97'
+
+    def test_idle_counter_and_reset(self):
+        """Test idle grows without input and resets on XTEST motion"""
+        from clicker.input_backend import XTestBackend
+
+        source = create_idle_source('xscreensaver', self.DISPLAY)
+        try:
+            time.sleep(0.3)
+            self.assertGreaterEqual(source.idle_ms(), 200)
+            backend = XTestBackend(self.DISPLAY)
+            backend.move(400, 300)
+            backend.close()
+            self.assertLess(source.idle_ms(), 200)
+            self.assertAlmostEqual(source.last_activity(), time.monotonic(), delta=0.3)
+        finally:
+            source.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
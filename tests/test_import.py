@@ -0,0 +1,50 @@
+"""
+Import-time tests for the clicker package
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Only imported once a real backend is chosen
+HEAVY_MODULES = ('numpy', 'Xlib', 'pyautogui', 'pynput', 'tkinter')
+
+
+class TestImport(unittest.TestCase):
+    """Test that importing clicker is cheap and side-effect free"""
+
+    def test_no_heavy_imports(self):
+        """Test importing the package and the loop pulls in no GUI or NumPy module"""
+        code = ("import sys, clicker, clicker.app\n"
+                f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                env=dict(os.environ, PYTHONPATH=ROOT))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+
+    @pytest.mark.integration
+    def test_import_budget(self):
+        """Test the import-time benchmark passes its budgets"""
+        result = subprocess.run(
+            [sys.executable, os.path.join(ROOT, 'benchmarks', 'bench_import.py'), '-n', '3'],
+            capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+    def test_lazy_exports(self):
+        """Test public names resolve from their submodules"""
+        import clicker
+        self.assertEqual(clicker.Clicker.__module__, 'clicker.app')
+        self.assertEqual(clicker.ProcessWatcher.__module__, 'clicker.process_watcher')
+        with self.assertRaises(AttributeError):
+            clicker.does_not_exist
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,286 @@
+"""
+Unit tests for the persistent visual indicator
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from clicker import ActivityTracker, Clicker, Config, IdleScheduler
+from clicker.indicator import Indicator, ProgressSegment, parse_command, read_commands
+from clicker.input_backend import ClickTimings, RecordingBackend
+from clicker.renderer import StatusRenderer
+from tests.conftest import FakeIdleSource, FakeReadiness, FakeWatcher, XvfbMixin
+
+# Stand-in for indicator.py that records every command it receives
+FAKE_INDICATOR = '''
+import sys
+with open(sys.argv[0] + '.log', 'a') as log:
+    log.write('start %s %s\\n' % (sys.argv[1], sys.argv[2]))
+    log.flush()
+    for line in sys.stdin:
+        log.write(line)
+        log.flush()
+        if line.strip() == 'quit':
+            break
+'''
+
+
+class TestParseCommand(unittest.TestCase):
+    """Test the indicator command protocol"""
+
+    def test_simple_commands(self):
+        """Test commands without arguments"""
+        self.assertEqual(parse_command('hide\n'), ('hide', ()))
+        self.assertEqual(parse_command('show'), ('show', ()))
+        self.assertEqual(parse_command('quit'), ('quit', ()))
+        self.assertEqual(parse_command('countdown'), ('countdown', ()))
+        self.assertEqual(parse_command('sync'), ('sync', ()))
+
+    def test_move(self):
+        """Test move takes two integer coordinates"""
+        self.assertEqual(parse_command('move 10 20'), ('move', (10, 20)))
+
+    def test_invalid(self):
+        """Test malformed commands are rejected"""
+        for line in ('', 'jump', 'move 1', 'move a b', 'hide now'):
+            self.assertIsNone(parse_command(line))
+
+
+class TestIndicatorHandle(unittest.TestCase):
+    """Test the clicker-side indicator handle"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.script = os.path.join(self.tmpdir, 'fake_indicator.py')
+        with open(self.script, 'w') as f:
+            f.write(FAKE_INDICATOR)
+        self.indicator = Indicator(100, 200, self.script)
+
+    def tearDown(self):
+        self.indicator.close()
+        shutil.rmtree(self.tmpdir)
+
+    def read_log(self):
+        with open(self.script + '.log') as f:
+            return f.read().split('\n')[:-1]
+
+    def wait_for_exit(self):
+        self.indicator.process.wait(timeout=5)
+
+    def test_commands_reuse_one_process(self):
+        """Test hide/show/move go to the same long-lived process"""
+        self.assertTrue(self.indicator.start())
+        pid = self.indicator.process.pid
+        self.indicator.hide()
+        self.indicator.show()
+        self.indicator.move(5, 6)
+        self.assertEqual(self.indicator.process.pid, pid)
+        self.indicator.close()
+        self.assertEqual(self.read_log(),
+                         ['start 100 200', 'hide', 'show', 'move 5 6', 'quit'])
+
+    def test_sync_gives_up(self):
+        """Test sync returns False when the process never confirms"""
+        self.indicator.start()
+        self.indicator.hide()
+        self.assertFalse(self.indicator.sync(timeout=0.1))
+        self.indicator.close()
+        self.assertEqual(self.read_log(), ['start 100 200', 'hide', 'sync', 'quit'])
+
+    def test_box(self):
+        """Test the screen rectangle follows the indicator"""
+        self.assertEqual(self.indicator.box(), (80, 180, 40, 40))
+        self.indicator.start()
+        self.indicator.move(5, 6)
+        self.assertEqual(self.indicator.box(), (-15, -14, 40, 40))
+
+    def test_restart_only_when_dead(self):
+        """Test a dead process is restarted on the next command"""
+        self.indicator.start()
+        self.indicator.process.kill()
+        self.wait_for_exit()
+        self.indicator.show()
+        self.assertTrue(self.indicator.alive())
+        self.assertEqual(self.indicator.restarts, 1)
+
+    def test_missing_script(self):
+        """Test a missing script disables the indicator"""
+        indicator = Indicator(0, 0, os.path.join(self.tmpdir, 'missing.py'))
+        self.assertFalse(indicator.start())
+        self.assertFalse(indicator.hide())
+
+    def test_close_is_idempotent(self):
+        """Test closing twice is harmless"""
+        self.indicator.start()
+        self.indicator.close()
+        self.indicator.close()
+        self.assertFalse(self.indicator.alive())
+
+    def test_progress_segment_passed_to_process(self):
+        """Test the shape renderer gets a countdown segment, removed on close"""
+        self.indicator.start()
+        args = self.indicator.process.args
+        path = self.indicator.progress.path
+        self.assertEqual(args[4:], ['--renderer', 'auto', '--progress', path])
+        self.indicator.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_countdown_start_wakes_overlay(self):
+        """Test only a countdown following none is sent to the sleeping overlay"""
+        self.indicator.start()
+        inf = float('inf')
+        for start, deadline in ((0, inf), (0, 10), (0, 20), (5, inf), (5, 25)):
+            self.indicator.publish(start, deadline)
+        self.indicator.close()
+        self.assertEqual(self.read_log(), ['start 100 200', 'countdown', 'countdown', 'quit'])
+
+    def test_unchanged_countdown_not_rewritten(self):
+        """Test publishing the same countdown again leaves the segment alone"""
+        self.indicator.start()
+        progress = self.indicator.progress
+        with patch.object(progress, 'publish', wraps=progress.publish) as publish:
+            for start, deadline in ((0, 10), (0, 10), (0, 20), (0, 20)):
+                self.indicator.publish(start, deadline)
+        self.assertEqual(publish.call_count, 2)
+        self.assertEqual(progress.read(), (0, 20))
+
+    def test_tk_has_no_ring(self):
+        """Test the Tk renderer gets no countdown segment"""
+        indicator = Indicator(1, 2, self.script, renderer='tk')
+        indicator.start()
+        try:
+            self.assertIsNone(indicator.progress)
+            self.assertEqual(indicator.process.args[4:], ['--renderer', 'tk'])
+        finally:
+            indicator.close()
+
+
+class TestReadCommands(unittest.TestCase):
+    """Test command lines are assembled from partial reads"""
+
+    def test_partial_lines(self):
+        """Test commands split across reads and end of input"""
+        read_fd, write_fd = os.pipe()
+        buffer = bytearray()
+        try:
+            os.write(write_fd, b'hide\nmo')
+            self.assertEqual(read_commands(read_fd, buffer), [('hide', ())])
+            os.write(write_fd, b've 3 4\nbogus\n')
+            self.assertEqual(read_commands(read_fd, buffer), [('move', (3, 4))])
+            os.close(write_fd)
+            self.assertIsNone(read_commands(read_fd, buffer))
+        finally:
+            os.close(read_fd)
+
+
+class TestProgressSegment(unittest.TestCase):
+    """Test the shared-memory countdown"""
+
+    def setUp(self):
+        self.writer = ProgressSegment.create()
+        self.reader = ProgressSegment(self.writer.path)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+
+    def test_fraction(self):
+        """Test the reader sees the published countdown"""
+        self.assertIsNone(self.reader.fraction(5.0))
+        self.writer.publish(100.0, 120.0)
+        self.assertEqual(self.reader.read(), (100.0, 120.0))
+        self.assertEqual(self.reader.fraction(105.0), 0.25)
+        self.assertEqual(self.reader.fraction(130.0), 1.0)
+        self.assertEqual(self.reader.fraction(90.0), 0.0)
+
+    def test_paused(self):
+        """Test an infinite deadline means no ring"""
+        self.writer.publish(100.0, float('inf'))
+        self.assertIsNone(self.reader.fraction(105.0))
+
+    def test_reader_is_read_only(self):
+        """Test the indicator process cannot write the segment"""
+        with self.assertRaises(TypeError):
+            self.reader.publish(1.0, 2.0)
+
+
+class RingIndicator:
+    def __init__(self):
+        self.progress = ProgressSegment.create()
+
+    def publish(self, start, deadline):
+        self.progress.publish(start, deadline)
+
+    def start(self):
+        return True
+
+    def close(self):
+        self.progress.close()
+
+
+class TestClickerPublishesProgress(unittest.TestCase):
+    """Test the main loop feeds the ring"""
+
+    def test_publish_deadline(self):
+        """Test the countdown is published, and hidden while paused"""
+        now = [50.0]
+        tracker = ActivityTracker(clock=lambda: now[0])
+        indicator = RingIndicator()
+        clicker = Clicker(Config(timings=ClickTimings(0, 0, 0)), tracker=tracker,
+                          scheduler=IdleScheduler(tracker, 20), watcher=FakeWatcher(),
+                          backend=RecordingBackend(), indicator=indicator,
+                          renderer=StatusRenderer(enabled=False), readiness=FakeReadiness(),
+                          idle_source=FakeIdleSource())
+        try:
+            self.assertTrue(clicker.publish_progress())
+            self.assertEqual(indicator.progress.read(), (50.0, 70.0))
+            clicker.scheduler.pause()
+            clicker.publish_progress()
+            self.assertEqual(indicator.progress.read(), (50.0, float('inf')))
+        finally:
+            indicator.close()
+
+
+@pytest.mark.integration
+@unittest.skipUnless(shutil.which('Xvfb'), 'Xvfb not installed')
+class TestShapeOverlay(XvfbMixin, unittest.TestCase):
+    """Test the Shape-extension overlay against a local Xvfb display"""
+
+    DISPLAY = ':96'
+
+    def test_overlay_runs_commands_and_ring(self):
+        """Test the overlay maps, follows commands and quits"""
+        import clicker.indicator
+        progress = ProgressSegment.create()
+        progress.publish(time.monotonic(), time.monotonic() + 1)
+        process = subprocess.Popen(
+            [sys.executable, clicker.indicator.__file__, '100', '100', '--renderer', 'shape',
+             '--progress', progress.path],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            env=dict(os.environ, DISPLAY=self.DISPLAY))
+        try:
+            self.assertEqual(process.stdout.readline(), b'ready\n')
+            time.sleep(0.3)
+            process.stdin.write(b'hide\nsync\n')
+            process.stdin.flush()
+            self.assertEqual(process.stdout.readline(), b'synced\n')
+            process.stdin.write(b'move 200 200\nshow\nquit\n')
+            process.stdin.flush()
+            self.assertEqual(process.wait(timeout=5), 0, process.stderr.read())
+        finally:
+            process.kill()
+            progress.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
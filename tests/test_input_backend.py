@@ -0,0 +1,139 @@
+"""
+Unit tests for the input backends and click sequence
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import sys
+import unittest
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from clicker.input_backend import (ClickTimings, FailSafeError, PyAutoGUIBackend,
+                           RecordingBackend, XTestBackend, create_backend, perform_click)
+
+try:
+    from Xlib import X, XK
+except ImportError:  # pragma: no cover - python-xlib is optional
+    X = XK = None
+
+
+class TestClickSequence(unittest.TestCase):
+    """Test the click sequence against the recording backend"""
+
+    def setUp(self):
+        self.backend = RecordingBackend(position=(50, 60))
+        self.sleeps = []
+
+    def test_sequence_order(self):
+        """Test move, click, Enter and move back happen in order"""
+        perform_click(self.backend, 1520, 980, ClickTimings(), sleep=self.sleeps.append)
+        self.assertEqual(self.backend.actions(), [
+            ('move', 1520, 980), ('click',), ('press', 'enter'), ('move', 50, 60)])
+
+    def test_timings_are_explicit(self):
+        """Test only the configured settle delays are slept"""
+        perform_click(self.backend, 10, 10, ClickTimings(0.05, 0.1, 0.0),
+                      sleep=self.sleeps.append)
+        self.assertEqual(self.sleeps, [0.05, 0.1, 0.0])
+
+    def test_returns_latency(self):
+        """Test the elapsed time is returned"""
+        latency = perform_click(self.backend, 10, 10, ClickTimings(0, 0, 0))
+        self.assertGreaterEqual(latency, 0)
+        self.assertLess(latency, 0.5)
+
+    def test_move_back_is_suppressed(self):
+        """Test only the move back runs inside the suppress context"""
+        suppressed = []
+
+        @contextmanager
+        def suppress():
+            suppressed.append(len(self.backend.calls))
+            yield
+
+        perform_click(self.backend, 10, 10, ClickTimings(0, 0, 0), suppress=suppress)
+        self.assertEqual(suppressed, [3])
+
+    def test_fail_safe_in_corner(self):
+        """Test a pointer in a screen corner aborts the sequence"""
+        backend = RecordingBackend(size=(1920, 1080), position=(1919, 0))
+        with self.assertRaises(FailSafeError):
+            perform_click(backend, 10, 10, ClickTimings(0, 0, 0))
+        self.assertEqual(backend.calls, [])
+
+
+class TestBackendSelection(unittest.TestCase):
+    """Test backend construction"""
+
+    def test_unknown_backend(self):
+        """Test an unknown backend name is rejected"""
+        with self.assertRaises(ValueError):
+            create_backend('telepathy')
+
+    def test_pyautogui_pause_disabled(self):
+        """Test the pyautogui backend switches off the implicit PAUSE"""
+        fake = MagicMock(PAUSE=0.1)
+        with patch.dict(sys.modules, {'pyautogui': fake}):
+            PyAutoGUIBackend()
+        self.assertEqual(fake.PAUSE, 0.0)
+
+    def test_pyautogui_fail_safe_translated(self):
+        """Test pyautogui's FailSafeException becomes FailSafeError"""
+        class FakeFailSafe(Exception):
+            pass
+        fake = MagicMock(FailSafeException=FakeFailSafe)
+        fake.click.side_effect = FakeFailSafe("corner")
+        with patch.dict(sys.modules, {'pyautogui': fake}):
+            backend = PyAutoGUIBackend()
+        with self.assertRaises(FailSafeError):
+            backend.click()
+
+    def test_auto_falls_back_to_pyautogui(self):
+        """Test auto uses pyautogui when XTEST cannot connect"""
+        fake = MagicMock()
+        with patch('clicker.input_backend.XTestBackend', side_effect=RuntimeError("no display")), \
+                patch.dict(sys.modules, {'pyautogui': fake}):
+            backend = create_backend('auto')
+        self.assertIsInstance(backend, PyAutoGUIBackend)
+
+
+@unittest.skipIf(X is None, 'python-xlib not installed')
+class TestXTestKeys(unittest.TestCase):
+    """Test key presses through XTEST on a fake keyboard mapping"""
+
+    def setUp(self):
+        # keycode -> keysyms of the unshifted and shifted level
+        self.keymap = {29: (XK.XK_y, XK.XK_Y), 61: (XK.XK_slash, XK.XK_question),
+                       36: (XK.XK_Return, 0), 50: (XK.XK_Shift_L, 0)}
+        display = MagicMock()
+        display.screen.return_value.width_in_pixels = 1920
+        display.screen.return_value.height_in_pixels = 1080
+        display.screen.return_value.root.query_pointer.return_value = MagicMock(root_x=5,
+                                                                                root_y=5)
+        display.keysym_to_keycode.side_effect = lambda keysym: next(
+            (code for code, syms in self.keymap.items() if keysym in syms), 0)
+        display.keycode_to_keysym.side_effect = lambda code, index: self.keymap[code][index]
+        self.events = []
+        with patch('Xlib.display.Display', return_value=display):
+            self.backend = XTestBackend()
+        self.backend._fake = lambda kind, detail=0, **kwargs: self.events.append((kind, detail))
+
+    def test_shift_for_capitals_and_symbols(self):
+        """Test characters on the shifted level are typed with Shift held"""
+        self.backend.press('Y')
+        self.backend.press('?')
+        self.assertEqual(self.events, [
+            (X.KeyPress, 50), (X.KeyPress, 29), (X.KeyRelease, 29), (X.KeyRelease, 50),
+            (X.KeyPress, 50), (X.KeyPress, 61), (X.KeyRelease, 61), (X.KeyRelease, 50)])
+
+    def test_plain_keys_unshifted(self):
+        """Test lower case and named keys are sent without Shift"""
+        self.backend.press('y')
+        self.backend.press('enter')
+        self.assertEqual(self.events, [(X.KeyPress, 29), (X.KeyRelease, 29),
+                                       (X.KeyPress, 36), (X.KeyRelease, 36)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+"""
+Unit tests for the event journal and `clicker stats`
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from clicker.config import parse_args
+from clicker.journal import RECORD, Journal, read_header
+from clicker.scheduler import ActivityTracker
+from clicker.stats import (hour_of_day_counts, hourly_counts, latency_percentiles, load,
+                           main, select)
+
+
+class JournalTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'clicker.journal')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+
+class TestJournal(JournalTestCase):
+    """Test the memory-mapped ring file"""
+
+    def test_append_and_load(self):
+        """Test records come back with all fields"""
+        journal = Journal(self.path, capacity=8)
+        journal.append('click', idle=20.5, latency=0.012, target=2, timestamp=1000.0)
+        journal.append('process-lost', timestamp=1001.0)
+        journal.close()
+        records = load(self.path)
+        self.assertEqual(len(records), 2)
+        first = records[0]
+        self.assertEqual((first['time'], first['event'], first['target']), (1000.0, 1, 2))
+        self.assertAlmostEqual(float(first['idle']), 20.5)
+        self.assertAlmostEqual(float(first['latency']), 0.012, places=6)
+
+    def test_file_size_is_fixed(self):
+        """Test the file is allocated once and never grows"""
+        journal = Journal(self.path, capacity=4)
+        size = os.path.getsize(self.path)
+        for i in range(10):
+            journal.append('click', timestamp=float(i))
+        journal.close()
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertEqual(size, 64 + 4 * RECORD.size)
+
+    def test_ring_keeps_newest_in_order(self):
+        """Test a full ring overwrites the oldest records"""
+        journal = Journal(self.path, capacity=4)
+        for i in range(10):
+            journal.append('click', timestamp=float(i))
+        self.assertEqual(len(journal), 4)
+        journal.close()
+        self.assertEqual(list(load(self.path)['time']), [6.0, 7.0, 8.0, 9.0])
+
+    def test_reopen_appends(self):
+        """Test an existing journal keeps its capacity and count"""
+        Journal(self.path, capacity=4).close()
+        journal = Journal(self.path, capacity=100)
+        journal.append('activity', idle=30)
+        journal.close()
+        self.assertEqual(read_header(self.path), (4, 1))
+
+    def test_rejects_other_files(self):
+        """Test a file that is not a journal raises ValueError"""
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * 100)
+        with self.assertRaises(ValueError):
+            Journal(self.path)
+        with self.assertRaises(ValueError):
+            load(self.path)
+
+    def test_unknown_event(self):
+        """Test an unknown event name is rejected"""
+        journal = Journal(self.path, capacity=4)
+        with self.assertRaises(ValueError):
+            journal.append('explosion')
+        journal.close()
+
+
+class TestStats(JournalTestCase):
+    """Test the NumPy summaries behind `clicker stats`"""
+
+    def setUp(self):
+        super().setUp()
+        journal = Journal(self.path, capacity=64)
+        for i, latency in enumerate((0.010, 0.020, 0.030, 0.040)):
+            journal.append('click', latency=latency, timestamp=3600 * 10 + i)
+        journal.append('click', latency=0.050, timestamp=3600 * 12)
+        journal.append('fail-safe', timestamp=3600 * 12 + 1)
+        journal.close()
+        self.records = load(self.path)
+
+    def test_select(self):
+        """Test filtering by event type and time"""
+        self.assertEqual(len(select(self.records, event='click')), 5)
+        self.assertEqual(len(select(self.records, since=3600 * 12)), 2)
+
+    def test_hourly_counts_include_empty_hours(self):
+        """Test every hour between first and last record gets a bucket"""
+        starts, counts = hourly_counts(select(self.records, event='click'))
+        self.assertEqual(list(counts), [4, 0, 1])
+        self.assertEqual(list(starts), [36000, 39600, 43200])
+
+    def test_hour_of_day(self):
+        """Test records fold into 24 buckets with the UTC offset applied"""
+        counts = hour_of_day_counts(self.records, utc_offset=3600)
+        self.assertEqual(len(counts), 24)
+        self.assertEqual(counts[11], 4)
+        self.assertEqual(counts[13], 2)
+
+    def test_latency_percentiles_in_ms(self):
+        """Test percentiles are computed over click latencies"""
+        p50, = latency_percentiles(select(self.records, event='click'), (50,))
+        self.assertAlmostEqual(p50, 30.0, places=3)
+        self.assertIsNone(latency_percentiles(select(self.records, event='activity')))
+
+    def test_main_prints_summary(self):
+        """Test the stats command prints counts, histogram and percentiles"""
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(main([self.path]), 0)
+        text = out.getvalue()
+        self.assertIn('6 records', text)
+        self.assertIn('click latency (ms)', text)
+        self.assertIn('p99', text)
+
+    def test_clicker_subcommand(self):
+        """Test `clicker stats` is dispatched from the main entry point"""
+        from clicker.app import main as clicker_main
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(clicker_main(['stats', self.path, '--hour-of-day']), 0)
+        self.assertIn('23:00', out.getvalue())
+
+    def test_main_missing_file(self):
+        """Test a missing journal is reported with exit status 1"""
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(main([os.path.join(self.dir, 'missing')]), 1)
+
+    def test_main_without_numpy(self):
+        """Test a missing NumPy is a one-line error, not a traceback"""
+        with patch('clicker.stats.np', None), \
+                contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(main([self.path]), 1)
+        self.assertEqual(err.getvalue(), "Error: clicker stats requires NumPy "
+                                         "(pip install numpy)\n")
+
+    def test_journal_off_by_default(self):
+        """Test no journal file is written unless --journal names one"""
+        self.assertIsNone(parse_args([]).journal)
+        self.assertEqual(parse_args(['--journal', self.path]).journal, self.path)
+
+
+class TestActivityBursts(unittest.TestCase):
+    """Test the tracker reports activity after a quiet period"""
+
+    def test_on_resume_after_gap(self):
+        """Test only activity after resume_gap seconds of quiet is reported"""
+        now = [0.0]
+        gaps = []
+        tracker = ActivityTracker(clock=lambda: now[0], on_resume=gaps.append, resume_gap=5)
+        now[0] = 2
+        tracker.touch()
+        now[0] = 30
+        tracker.touch()
+        self.assertEqual(gaps, [28])
+
+
+if __name__ == '__main__':
+    unittest.main()
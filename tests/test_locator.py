@@ -0,0 +1,148 @@
+"""
+Unit tests for the template-matching target locator
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import time
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+if np is not None:
+    from clicker.locator import Template, TemplateLocator, downscale, to_gray
+
+
+def prompt_image():
+    """Synthetic 'prompt' with a distinctive bright box and a dark notch"""
+    image = np.full((40, 120), 30, dtype=np.uint8)
+    image[8:32, 8:112] = 230
+    image[14:26, 20:44] = 10
+    return image
+
+
+class FakeScreen:
+    """Noisy screen region with the prompt pasted somewhere"""
+
+    def __init__(self, shape=(400, 1200), seed=7):
+        rng = np.random.default_rng(seed)
+        self.noise = rng.integers(0, 256, shape, dtype=np.uint8)
+        self.frame = self.noise.copy()
+        self.grabs = []
+
+    def show_prompt(self, row, col):
+        self.frame = self.noise.copy()
+        prompt = prompt_image()
+        self.frame[row:row + prompt.shape[0], col:col + prompt.shape[1]] = prompt
+
+    def hide_prompt(self):
+        self.frame = self.noise.copy()
+
+    def grab(self, region):
+        self.grabs.append(region)
+        return self.frame
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class TestImageHelpers(unittest.TestCase):
+    """Test grayscale conversion and downscaling"""
+
+    def test_rgb_to_gray(self):
+        """Test RGB(A) arrays are reduced to one channel"""
+        rgba = np.zeros((2, 2, 4), dtype=np.uint8)
+        rgba[..., 1] = 100
+        gray = to_gray(rgba)
+        self.assertEqual(gray.shape, (2, 2))
+        self.assertAlmostEqual(float(gray[0, 0]), 58.7, places=3)
+
+    def test_downscale_block_mean(self):
+        """Test downscaling averages blocks and drops the ragged edge"""
+        gray = np.arange(25, dtype=np.float32).reshape(5, 5)
+        small = downscale(gray, 2)
+        self.assertEqual(small.shape, (2, 2))
+        self.assertEqual(float(small[0, 0]), (0 + 1 + 5 + 6) / 4)
+
+    def test_flat_template_rejected(self):
+        """Test a template without contrast cannot be matched"""
+        with self.assertRaises(ValueError):
+            Template(np.ones((4, 4), dtype=np.float32))
+
+    def test_scores_match_direct_computation(self):
+        """Test vectorized scores equal the single-window score"""
+        rng = np.random.default_rng(1)
+        image = rng.random((30, 40)).astype(np.float32)
+        template = Template(image[5:15, 10:25].copy())
+        scores = template.scores(image)
+        self.assertAlmostEqual(float(scores[5, 10]), 1.0, places=4)
+        self.assertAlmostEqual(float(scores[3, 7]), template.score_at(image, 3, 7), places=4)
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class TestTemplateLocator(unittest.TestCase):
+    """Test locating the prompt on synthetic screens"""
+
+    REGION = (100, 500, 1200, 400)
+
+    def setUp(self):
+        self.screen = FakeScreen()
+        self.locator = TemplateLocator(prompt_image(), self.REGION, scale=4,
+                                       grab=self.screen.grab)
+
+    def test_finds_prompt_center(self):
+        """Test the returned point is the prompt's center in screen coordinates"""
+        self.screen.show_prompt(300, 700)
+        self.assertEqual(self.locator.locate(), (100 + 700 + 60, 500 + 300 + 20))
+        self.assertEqual(self.screen.grabs, [self.REGION])
+
+    def test_offset(self):
+        """Test a click offset relative to the template center"""
+        self.locator.offset = (-50, 5)
+        self.screen.show_prompt(300, 700)
+        self.assertEqual(self.locator.locate(), (810, 825))
+
+    def test_cached_hit_skips_search(self):
+        """Test an unchanged screen is verified without a full search"""
+        self.screen.show_prompt(100, 200)
+        first = self.locator.locate()
+        second = self.locator.locate()
+        self.assertEqual(first, second)
+        self.assertEqual(self.locator.full_searches, 1)
+        self.assertEqual(self.locator.cache_hits, 1)
+
+    def test_moved_prompt_triggers_search(self):
+        """Test a stale cache falls back to a full search"""
+        self.screen.show_prompt(100, 200)
+        self.locator.locate()
+        self.screen.show_prompt(320, 1000)
+        self.assertEqual(self.locator.locate(), (100 + 1000 + 60, 500 + 320 + 20))
+        self.assertEqual(self.locator.full_searches, 2)
+
+    def test_missing_prompt(self):
+        """Test None is returned when the prompt is not visible"""
+        self.screen.show_prompt(100, 200)
+        self.locator.locate()
+        self.screen.hide_prompt()
+        self.assertIsNone(self.locator.locate())
+        self.assertIsNone(self.locator.cached)
+
+    def test_search_is_fast(self):
+        """Test a full-screen search for a prompt-sized template takes milliseconds"""
+        screen = FakeScreen(shape=(1080, 1920))
+        # 300x80, the size of a real prompt line
+        prompt = np.kron(prompt_image(), np.ones((2, 3), dtype=np.uint8))[:, :300]
+        screen.frame[900:980, 1400:1700] = prompt
+        locator = TemplateLocator(prompt, (0, 0, 1920, 1080), scale=4, grab=screen.grab)
+        self.assertEqual(locator.locate(), (1550, 940))
+        durations = []
+        for _ in range(5):
+            locator.cached = None
+            start = time.perf_counter()
+            locator.locate()
+            durations.append(time.perf_counter() - start)
+        self.assertLess(min(durations), 0.03)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Unit tests for the logging pipeline
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from clicker.log_setup import CoalescingHandler, setup_logging, shutdown_logging
+
+
+class ListHandler(logging.Handler):
+    """Collect formatted messages"""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestCoalescingHandler(unittest.TestCase):
+    """Test collapsing of repeated state records"""
+
+    def setUp(self):
+        self.sink = ListHandler()
+        self.handler = CoalescingHandler(self.sink, max_run=100)
+        self.logger = logging.getLogger('test_coalescing')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def waiting(self, idle):
+        self.logger.debug("Waiting. Idle: %.0fs", idle,
+                          extra={'state': 'waiting', 'idle': idle})
+
+    def test_run_collapsed_into_summary(self):
+        """Test a run of waiting records becomes one line"""
+        for idle in range(20):
+            self.waiting(idle)
+        self.logger.debug("Clicked!")
+        self.assertEqual(self.sink.messages, ['20× waiting, idle 0–19s', 'Clicked!'])
+
+    def test_single_record_passes_unchanged(self):
+        """Test a run of one keeps the original message"""
+        self.waiting(3)
+        self.handler.flush()
+        self.assertEqual(self.sink.messages, ['Waiting. Idle: 3s'])
+
+    def test_state_change_breaks_run(self):
+        """Test a different state starts a new run"""
+        self.waiting(1)
+        self.waiting(2)
+        self.logger.debug("x", extra={'state': 'waiting, Claude not found', 'idle': 5})
+        self.logger.debug("y", extra={'state': 'waiting, Claude not found', 'idle': 6})
+        self.handler.flush()
+        self.assertEqual(self.sink.messages, [
+            '2× waiting, idle 1–2s', '2× waiting, Claude not found, idle 5–6s'])
+
+    def test_max_run_flushes(self):
+        """Test very long runs are still reported periodically"""
+        for idle in range(250):
+            self.waiting(idle % 20)
+        self.assertEqual(len(self.sink.messages), 2)
+
+    def test_plain_records_untouched(self):
+        """Test records without state pass straight through"""
+        self.logger.info("Screen size: %sx%s", 1920, 1080)
+        self.assertEqual(self.sink.messages, ['Screen size: 1920x1080'])
+
+
+class TestSetupLogging(unittest.TestCase):
+    """Test queue-based logging setup"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'clicker.log')
+        self.logger = logging.getLogger('test_setup_logging')
+        self.logger.propagate = False
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_queue_listener_writes_file(self):
+        """Test records reach the file through the background listener"""
+        listener = setup_logging('DEBUG', 'file', self.path, logger=self.logger)
+        self.assertIsNotNone(listener)
+        for idle in range(5):
+            self.logger.debug("Waiting", extra={'state': 'waiting', 'idle': idle})
+        self.logger.info("Stopped")
+        shutdown_logging(listener, self.logger)
+        with open(self.path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('5× waiting, idle 0–4s', lines[0])
+        self.assertIn('INFO: Stopped', lines[1])
+
+    def test_level_filters_before_formatting(self):
+        """Test filtered records never format their arguments"""
+        listener = setup_logging('INFO', 'none', logger=self.logger)
+        calls = []
+
+        class Spy:
+            def __str__(self):
+                calls.append(threading.current_thread().name)
+                return 'spy'
+
+        self.logger.debug("value %s", Spy())
+        shutdown_logging(listener, self.logger)
+        self.assertEqual(calls, [])
+
+    def test_sync_mode(self):
+        """Test synchronous mode writes without a listener"""
+        listener = setup_logging('DEBUG', 'file', self.path, use_queue=False,
+                                 logger=self.logger)
+        self.assertIsNone(listener)
+        self.logger.info("hello")
+        shutdown_logging(listener, self.logger)
+        with open(self.path, encoding='utf-8') as f:
+            self.assertIn('hello', f.read())
+
+    def test_unknown_sink(self):
+        """Test an invalid sink is rejected"""
+        with self.assertRaises(ValueError):
+            setup_logging('DEBUG', 'carrier-pigeon', logger=self.logger)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Unit tests for the metrics registry and exporters
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import os
+import shutil
+import tempfile
+import timeit
+import unittest
+import urllib.error
+import urllib.request
+
+from clicker.metrics import (NULL_METRICS, ClickerMetrics, Histogram, MetricsServer, Registry,
+                             TextfileExporter, create_exporters)
+
+
+class TestRegistry(unittest.TestCase):
+    """Test counters, histograms and the text format"""
+
+    def test_counter_and_gauge(self):
+        """Test counters add up and gauges are set"""
+        registry = Registry()
+        counter = registry.counter('demo_total', 'Demo counter')
+        gauge = registry.gauge('demo_value', 'Demo gauge')
+        counter.inc()
+        counter.inc(2)
+        gauge.set(7)
+        text = registry.render()
+        self.assertIn('# TYPE demo_total counter\ndemo_total 3\n', text)
+        self.assertIn('# HELP demo_value Demo gauge\n# TYPE demo_value gauge\ndemo_value 7', text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts include all smaller buckets and +Inf"""
+        histogram = Histogram('demo_seconds', 'Demo', (0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+        samples = dict(histogram.samples())
+        self.assertEqual(samples['demo_seconds_bucket{le="0.1"}'], 2)
+        self.assertEqual(samples['demo_seconds_bucket{le="1.0"}'], 3)
+        self.assertEqual(samples['demo_seconds_bucket{le="+Inf"}'], 4)
+        self.assertEqual(samples['demo_seconds_count'], 4)
+        self.assertAlmostEqual(samples['demo_seconds_sum'], 3.65)
+
+    def test_clicker_metrics_render(self):
+        """Test every loop metric is exported"""
+        metrics = ClickerMetrics()
+        metrics.clicks.inc()
+        metrics.click_latency.observe(0.4)
+        text = metrics.render()
+        for name in ('clicker_ticks_total', 'clicker_tick_lateness_seconds_bucket',
+                     'clicker_process_check_seconds_count', 'clicker_clicks_total 1',
+                     'clicker_fail_safe_total', 'clicker_click_seconds_sum 0.4'):
+            self.assertIn(name, text)
+
+
+class TestNullMetrics(unittest.TestCase):
+    """Test disabled metrics cost next to nothing"""
+
+    def test_null_metrics_accept_calls(self):
+        """Test every member is a no-op and nothing is rendered"""
+        self.assertFalse(NULL_METRICS.enabled)
+        NULL_METRICS.clicks.inc()
+        NULL_METRICS.tick_lateness.observe(1.0)
+        NULL_METRICS.claude_running.set(1)
+        self.assertEqual(NULL_METRICS.render(), '')
+
+    def test_null_metrics_overhead(self):
+        """Test a disabled observe() is no slower than a plain method call"""
+        class Plain:
+            def observe(self, value):
+                pass
+        plain = Plain()
+        null = min(timeit.repeat(lambda: NULL_METRICS.scans.observe(1.0), number=20000, repeat=5))
+        baseline = min(timeit.repeat(lambda: plain.observe(1.0), number=20000, repeat=5))
+        self.assertLess(null, baseline * 3)
+
+
+class TestExporters(unittest.TestCase):
+    """Test the HTTP listener and the textfile writer"""
+
+    def setUp(self):
+        self.metrics = ClickerMetrics()
+        self.metrics.ticks.inc()
+
+    def test_http_listener(self):
+        """Test /metrics is served on localhost and other paths are 404"""
+        server = MetricsServer(self.metrics, 0)
+        server.start()
+        try:
+            url = f'http://127.0.0.1:{server.port}'
+            with urllib.request.urlopen(url + '/metrics', timeout=5) as response:
+                body = response.read().decode()
+                self.assertIn('text/plain', response.headers['Content-Type'])
+            self.assertIn('clicker_ticks_total 1', body)
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(url + '/other', timeout=5)
+        finally:
+            server.close()
+
+    def test_textfile(self):
+        """Test the textfile is written on start and on close"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'clicker.prom')
+            exporter = TextfileExporter(self.metrics, path, interval=60)
+            exporter.start()
+            with open(path) as f:
+                self.assertIn('clicker_ticks_total 1', f.read())
+            self.metrics.ticks.inc()
+            exporter.close()
+            with open(path) as f:
+                self.assertIn('clicker_ticks_total 2', f.read())
+            self.assertEqual(os.listdir(tmp), ['clicker.prom'])
+
+    def test_textfile_gone_on_close(self):
+        """Test a directory removed before close() is logged, not raised"""
+        tmp = tempfile.mkdtemp()
+        exporter = TextfileExporter(self.metrics, os.path.join(tmp, 'clicker.prom'),
+                                    interval=60)
+        exporter.start()
+        shutil.rmtree(tmp)
+        with self.assertLogs('clicker.metrics', 'WARNING'):
+            exporter.close()
+
+    def test_create_exporters(self):
+        """Test exporters are only created for configured outputs"""
+        self.assertEqual(create_exporters(self.metrics), [])
+        kinds = [type(e) for e in create_exporters(self.metrics, 9100, 'x.prom')]
+        self.assertEqual(kinds, [MetricsServer, TextfileExporter])
+
+
+if __name__ == '__main__':
+    unittest.main()
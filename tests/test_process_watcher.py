@@ -0,0 +1,173 @@
+"""
+Unit tests for the /proc process watcher
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from clicker.process_watcher import ProcessWatcher, read_stat
+
+
+class FakeProc:
+    """Minimal /proc tree with cmdline and stat files"""
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp()
+
+    def add(self, pid, cmdline, state='S', starttime=100):
+        path = os.path.join(self.root, str(pid))
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, 'cmdline'), 'wb') as f:
+            f.write(cmdline.replace(' ', '\0').encode() + b'\0')
+        fields = [state] + ['0'] * 18 + [str(starttime)] + ['0'] * 10
+        with open(os.path.join(path, 'stat'), 'w') as f:
+            f.write('%d (some (odd) name) %s\n' % (pid, ' '.join(fields)))
+
+    def remove(self, pid):
+        shutil.rmtree(os.path.join(self.root, str(pid)))
+
+    def cleanup(self):
+        shutil.rmtree(self.root)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProcessWatcher(unittest.TestCase):
+    """Test /proc scanning and cached liveness checks"""
+
+    def setUp(self):
+        self.proc = FakeProc()
+        self.clock = FakeClock()
+        self.watcher = ProcessWatcher(rescan_interval=30, proc_root=self.proc.root,
+                                      clock=self.clock)
+
+    def tearDown(self):
+        self.proc.cleanup()
+
+    def test_read_stat_handles_parentheses_in_comm(self):
+        """Test stat parsing splits after the last parenthesis"""
+        self.proc.add(10, 'node claude', state='R', starttime=555)
+        self.assertEqual(read_stat(self.proc.root, 10), ('R', 555))
+
+    def test_detects_matching_process(self):
+        """Test matching command line is detected"""
+        self.proc.add(10, 'node /usr/bin/claude')
+        self.proc.add(11, 'bash')
+        self.assertTrue(self.watcher.is_running())
+        self.assertEqual(self.watcher.pids, [10])
+
+    def test_no_matching_process(self):
+        """Test nothing is found without a match"""
+        self.proc.add(11, 'bash')
+        self.assertFalse(self.watcher.is_running())
+
+    def test_ignores_own_process_and_zombies(self):
+        """Test own PID and zombie processes are skipped"""
+        self.proc.add(os.getpid(), 'python3 clicker.py --match claude')
+        self.proc.add(12, 'claude', state='Z')
+        self.assertFalse(self.watcher.is_running())
+
+    def test_skips_kernel_threads(self):
+        """Test empty command lines are skipped"""
+        self.proc.add(2, '')
+        self.watcher = ProcessWatcher(pattern='.*', proc_root=self.proc.root,
+                                      clock=self.clock)
+        self.assertFalse(self.watcher.is_running())
+
+    def test_cached_pids_avoid_rescan(self):
+        """Test liveness checks reuse the cache between rescans"""
+        self.proc.add(10, 'claude')
+        self.watcher.is_running()
+        self.clock.now = 5
+        self.assertTrue(self.watcher.is_running())
+        self.assertEqual(self.watcher.scan_count, 1)
+
+    def test_rescan_on_cadence(self):
+        """Test a full scan runs once the rescan interval elapsed"""
+        self.proc.add(10, 'claude')
+        self.watcher.is_running()
+        self.proc.add(20, 'claude --resume')
+        self.clock.now = 30
+        self.watcher.is_running()
+        self.assertEqual(self.watcher.scan_count, 2)
+        self.assertEqual(self.watcher.pids, [10, 20])
+
+    def test_rescan_when_cache_empties(self):
+        """Test exit of the last cached process triggers a rescan"""
+        self.proc.add(10, 'claude')
+        self.watcher.is_running()
+        self.proc.remove(10)
+        self.proc.add(20, 'claude')
+        self.clock.now = 1
+        self.assertTrue(self.watcher.is_running())
+        self.assertEqual(self.watcher.pids, [20])
+
+    def test_pid_reuse_detected(self):
+        """Test a reused PID with a new start time is dropped"""
+        self.proc.add(10, 'claude', starttime=100)
+        self.watcher.is_running()
+        self.proc.add(10, 'vim', starttime=200)
+        self.clock.now = 1
+        self.assertFalse(self.watcher.is_running())
+
+    def test_no_rescan_while_nothing_found(self):
+        """Test an empty result waits for the next cadence"""
+        self.watcher.is_running()
+        self.clock.now = 1
+        self.watcher.is_running()
+        self.assertEqual(self.watcher.scan_count, 1)
+
+    def test_custom_pattern(self):
+        """Test the match pattern is a regular expression"""
+        self.proc.add(10, 'python agent.py')
+        watcher = ProcessWatcher(pattern=r'agent\.py', proc_root=self.proc.root,
+                                 clock=self.clock)
+        self.assertTrue(watcher.is_running())
+
+    def test_several_patterns_one_scan(self):
+        """Test one scan answers for every pattern"""
+        self.proc.add(10, 'claude --project a')
+        self.proc.add(20, 'claude --project b')
+        watcher = ProcessWatcher(pattern=['project a', 'project b', 'project c'],
+                                 proc_root=self.proc.root, clock=self.clock)
+        self.assertTrue(watcher.is_running('project a'))
+        self.assertTrue(watcher.is_running('project b'))
+        self.assertFalse(watcher.is_running('project c'))
+        self.assertEqual(watcher.pids_for('project b'), [20])
+        self.assertEqual(watcher.scan_count, 1)
+
+    def test_pattern_losing_last_process_rescans(self):
+        """Test a session whose process exited triggers an early rescan"""
+        self.proc.add(10, 'claude --project a')
+        self.proc.add(20, 'claude --project b')
+        watcher = ProcessWatcher(pattern=['project a', 'project b'],
+                                 proc_root=self.proc.root, clock=self.clock)
+        watcher.is_running()
+        self.proc.remove(20)
+        self.proc.add(21, 'claude --project b', starttime=200)
+        self.clock.now = 1
+        self.assertTrue(watcher.is_running('project b'))
+        self.assertEqual(watcher.pids_for('project b'), [21])
+        self.assertEqual(watcher.scan_count, 2)
+
+    def test_real_proc(self):
+        """Test scanning the real /proc finds this interpreter"""
+        if not os.path.isdir('/proc/self'):
+            self.skipTest('/proc not available')
+        watcher = ProcessWatcher(pattern='pytest|unittest|python', exclude_pids=set())
+        watcher.exclude_pids.discard(os.getpid())
+        self.assertTrue(watcher.is_running())
+
+
+if __name__ == '__main__':
+    unittest.main()
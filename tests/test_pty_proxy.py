@@ -0,0 +1,198 @@
+"""
+Unit tests for the pseudo-terminal proxy (`clicker run`)
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import contextlib
+import errno
+import io
+import os
+import signal
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+
+from clicker.pty_proxy import OutputBuffer, PtyProxy, main, parse_keys
+
+# Dummy interactive program: one prompt, echoes the answer, gives up after 1.5s
+PROMPT_SCRIPT = textwrap.dedent('''
+    import select, sys
+    print("working...", flush=True)
+    print("Do you want to proceed? (y/n) ", end="", flush=True)
+    ready, _, _ = select.select([sys.stdin], [], [], 1.5)
+    print("answer:", repr(sys.stdin.readline()) if ready else "none", flush=True)
+    sys.exit(3)
+''')
+
+
+class TestOutputBuffer(unittest.TestCase):
+    """Test the bounded rolling buffer and its pattern matching"""
+
+    def test_bounded(self):
+        """Test only the last `size` bytes are kept"""
+        buffer = OutputBuffer([r'x'], size=8)
+        for _ in range(100):
+            buffer.feed(b'0123456789')
+        self.assertEqual(bytes(buffer.data), b'23456789')
+
+    def test_escape_sequences_ignored(self):
+        """Test colour codes and cursor moves inside a prompt do not hide it"""
+        buffer = OutputBuffer([r'Do you want to proceed'])
+        buffer.feed(b'\x1b[1mDo you \x1b[38;5;12mwant\x1b[0m to \x1b]0;title\x07proceed')
+        self.assertEqual(buffer.match(), 'Do you want to proceed')
+        buffer.clear()
+        self.assertIsNone(buffer.match())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline(unittest.TestCase):
+    """Test when keystrokes are due"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.read_end, write_end = os.pipe()
+        self.sink = os.open(os.devnull, os.O_WRONLY)
+        self.proxy = PtyProxy(['true'], idle_timeout=10, stdout=self.sink, clock=self.clock)
+        self.proxy.master = write_end
+
+    def tearDown(self):
+        for fd in (self.read_end, self.proxy.master, self.sink):
+            os.close(fd)
+
+    def test_prompt_then_idle(self):
+        """Test the prompt is matched after output settles and answered after the timeout"""
+        self.proxy.on_output(b'Do you want to proceed?')
+        self.assertAlmostEqual(self.proxy.timeout(self.clock()), 0.2)
+        self.clock.now = 0.2
+        self.proxy.check_prompt(self.clock.now)
+        self.assertEqual(self.proxy.deadline(), 10.2)
+
+    def test_typing_postpones_and_clears(self):
+        """Test user input resets the idle time and forgets the old prompt"""
+        self.proxy.on_output(b'(y/n)')
+        self.proxy.check_prompt(0.2)
+        self.clock.now = 5
+        self.proxy.on_input(b'n')
+        self.assertIsNone(self.proxy.deadline())
+        self.assertEqual(os.read(self.read_end, 10), b'n')
+        self.proxy.on_output(b'n\r\n(y/n)')
+        self.proxy.check_prompt(5.2)
+        self.assertEqual(self.proxy.deadline(), 15.2)
+
+    def test_redraw_keeps_countdown(self):
+        """Test a TUI redrawing the same prompt neither restarts nor repeats the answer"""
+        screen = b'\x1b[H\x1b[2JDo you want to proceed?'
+        self.proxy.on_output(screen)
+        self.proxy.check_prompt(0.2)
+        self.proxy.on_output(screen)
+        self.assertIsNone(self.proxy.deadline())
+        self.proxy.check_prompt(1.2)
+        self.assertEqual(self.proxy.deadline(), 10.2)
+        self.proxy.on_output(screen + b' 1s')
+        self.proxy.check_prompt(2.2)
+        self.assertEqual(self.proxy.deadline(), 12.2)
+        self.proxy.inject(12.2)
+        self.proxy.on_output(screen + b' 1s')
+        self.proxy.check_prompt(13.2)
+        self.assertIsNone(self.proxy.deadline())
+
+    def test_no_prompt_no_deadline(self):
+        """Test ordinary output never schedules keystrokes"""
+        self.proxy.on_output(b'compiling...')
+        self.proxy.check_prompt(0.2)
+        self.assertIsNone(self.proxy.deadline())
+        self.assertIsNone(self.proxy.timeout(0.2))
+
+
+class TestProxy(unittest.TestCase):
+    """Test a real command on a pty with a dummy prompt"""
+
+    def run_proxy(self, **kwargs):
+        with tempfile.TemporaryDirectory() as tmp:
+            script = os.path.join(tmp, 'prompt.py')
+            with open(script, 'w') as f:
+                f.write(PROMPT_SCRIPT)
+            out = os.path.join(tmp, 'out')
+            stdin = os.open(os.devnull, os.O_RDONLY)
+            stdout = os.open(out, os.O_WRONLY | os.O_CREAT)
+            try:
+                proxy = PtyProxy([sys.executable, script], stdin=stdin, stdout=stdout,
+                                 **kwargs)
+                status = proxy.run()
+            finally:
+                os.close(stdin)
+                os.close(stdout)
+            with open(out, 'rb') as f:
+                return proxy, status, f.read()
+
+    def test_answers_prompt(self):
+        """Test the keystrokes reach the command once it waits and the user is idle"""
+        start = time.monotonic()
+        proxy, status, output = self.run_proxy(idle_timeout=0.3, send='y\r')
+        self.assertEqual(status, 3)
+        self.assertIn(b"answer: 'y\\n'", output)
+        self.assertEqual(len(proxy.injections), 1)
+        self.assertLess(proxy.injections[0][1], 0.01)
+        self.assertLess(time.monotonic() - start, 2.5)
+
+    def test_other_output_not_answered(self):
+        """Test nothing is sent when no pattern matches"""
+        proxy, status, output = self.run_proxy(idle_timeout=0.1, patterns=[r'Password:'])
+        self.assertIn(b'answer: none', output)
+        self.assertEqual(proxy.injections, [])
+
+    def test_terminal_gone(self):
+        """Test a lost terminal hangs up the command instead of raising"""
+        stdin = os.open(os.devnull, os.O_RDONLY)
+        sink = os.open(os.devnull, os.O_WRONLY)
+        try:
+            proxy = PtyProxy(['sleep', '30'], stdin=stdin, stdout=sink)
+            proxy.spawn()
+            with self.assertLogs('clicker.pty_proxy', 'INFO'):
+                proxy.hang_up(OSError(errno.EIO, 'Input/output error'))
+            status = proxy.run()
+        finally:
+            os.close(stdin)
+            os.close(sink)
+        self.assertEqual(status, -signal.SIGHUP)
+        self.assertIsNone(proxy.stdout)
+
+    def test_missing_command(self):
+        """Test a command that cannot be started exits with 127"""
+        stdin = os.open(os.devnull, os.O_RDONLY)
+        sink = os.open(os.devnull, os.O_WRONLY)
+        try:
+            status = PtyProxy(['/nonexistent/claude'], stdin=stdin, stdout=sink).run()
+        finally:
+            os.close(stdin)
+            os.close(sink)
+        self.assertEqual(status, 127)
+
+    def test_send_keys(self):
+        """Test --send escapes are decoded and non-ASCII text is kept"""
+        self.assertEqual(parse_keys('y\\r'), 'y\r')
+        self.assertEqual(parse_keys('oui é\\r'), 'oui é\r')
+        self.assertEqual(parse_keys('да\\n'), 'да\n')
+        self.assertEqual(parse_keys('\\u00e9'), 'é')
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(main(['--send', '\\x', '--', 'true']), 2)
+        self.assertIn('Error', err.getvalue())
+
+    def test_command_required(self):
+        """Test `clicker run` without a command is a usage error"""
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main([])
+
+
+if __name__ == '__main__':
+    unittest.main()
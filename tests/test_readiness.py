@@ -0,0 +1,197 @@
+"""
+Unit tests for Claude readiness detection
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from clicker.process_watcher import read_children, read_cpu_ticks
+from clicker.readiness import (CpuReadiness, ReadinessDetector, TranscriptReadiness,
+                               create_readiness)
+
+
+class FakeProc:
+    """Minimal /proc tree with CPU times and children lists"""
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp()
+
+    def set(self, pid, utime, stime=0, children=()):
+        path = os.path.join(self.root, str(pid))
+        os.makedirs(os.path.join(path, 'task', str(pid)), exist_ok=True)
+        fields = ['S'] + ['0'] * 10 + [str(utime), str(stime)] + ['0'] * 30
+        with open(os.path.join(path, 'stat'), 'w') as f:
+            f.write('%d (claude (node)) %s\n' % (pid, ' '.join(fields)))
+        with open(os.path.join(path, 'task', str(pid), 'children'), 'w') as f:
+            f.write(' '.join(str(c) for c in children))
+
+    def cleanup(self):
+        shutil.rmtree(self.root)
+
+
+class FakeWatcher:
+    def __init__(self, pids):
+        self.pids = pids
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCpuReadiness(unittest.TestCase):
+    """Test CPU sampling of the watched process tree"""
+
+    def setUp(self):
+        self.proc = FakeProc()
+        self.clock = FakeClock()
+        self.readiness = CpuReadiness(FakeWatcher({10: 1}), threshold=0.05, window=5,
+                                      proc_root=self.proc.root, clock=self.clock)
+        self.hz = self.readiness.ticks_per_second
+
+    def tearDown(self):
+        self.proc.cleanup()
+
+    def test_read_cpu_ticks(self):
+        """Test utime and stime are summed and a missing process gives None"""
+        self.proc.set(10, 7, 3)
+        self.assertEqual(read_cpu_ticks(self.proc.root, 10), 10)
+        self.assertIsNone(read_cpu_ticks(self.proc.root, 99))
+
+    def test_read_children(self):
+        """Test children are collected from all tasks"""
+        self.proc.set(10, 0, children=(11, 12))
+        self.assertEqual(read_children(self.proc.root, 10), [11, 12])
+
+    def test_not_ready_before_full_window(self):
+        """Test one sample is not enough to call Claude idle"""
+        self.proc.set(10, 100)
+        self.assertFalse(self.readiness.ready())
+        self.clock.now += 2
+        self.assertFalse(self.readiness.ready())
+
+    def test_first_call_after_window(self):
+        """Test the first check a window after start already has a baseline"""
+        self.proc.set(10, 100)
+        readiness = CpuReadiness(FakeWatcher({10: 1}), threshold=0.05, window=5,
+                                 proc_root=self.proc.root, clock=self.clock)
+        self.clock.now += 20
+        self.assertTrue(readiness.ready())
+        self.assertEqual(readiness.last_usage, 0)
+
+    def test_idle_process_is_ready(self):
+        """Test no CPU used over the window means waiting"""
+        self.proc.set(10, 100)
+        self.readiness.ready()
+        self.clock.now += 6
+        self.assertTrue(self.readiness.ready())
+        self.assertEqual(self.readiness.last_usage, 0)
+
+    def test_busy_process_is_not_ready(self):
+        """Test CPU used over the window means working"""
+        self.proc.set(10, 100)
+        self.readiness.ready()
+        self.clock.now += 6
+        self.proc.set(10, 100 + 3 * self.hz)
+        self.assertFalse(self.readiness.ready())
+        self.assertAlmostEqual(self.readiness.last_usage, 0.5)
+
+    def test_busy_child_is_not_ready(self):
+        """Test a tool running in a child process keeps Claude busy"""
+        self.proc.set(10, 100, children=(11,))
+        self.proc.set(11, 0)
+        self.readiness.ready()
+        self.clock.now += 6
+        self.proc.set(11, 2 * self.hz)
+        self.assertFalse(self.readiness.ready())
+
+    def test_compares_against_newest_old_sample(self):
+        """Test an old burst of CPU drops out of the window"""
+        self.proc.set(10, 0)
+        self.readiness.ready()
+        self.clock.now += 3
+        self.proc.set(10, 5 * self.hz)
+        self.readiness.ready()
+        self.clock.now += 6
+        self.assertTrue(self.readiness.ready())
+
+
+class TestTranscriptReadiness(unittest.TestCase):
+    """Test inotify-based transcript write tracking"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.clock = FakeClock()
+        self.readiness = TranscriptReadiness(self.root, quiet=10, clock=self.clock)
+
+    def tearDown(self):
+        self.readiness.close()
+        shutil.rmtree(self.root)
+
+    def write(self, *parts):
+        with open(os.path.join(self.root, *parts), 'a') as f:
+            f.write('{}\n')
+
+    def test_quiet_directory_is_ready(self):
+        """Test no writes for the quiet period means waiting"""
+        self.assertFalse(self.readiness.ready())
+        self.clock.now += 10
+        self.assertTrue(self.readiness.ready())
+
+    def test_write_resets_quiet_period(self):
+        """Test a transcript write marks Claude as working"""
+        self.clock.now += 10
+        self.write('session.jsonl')
+        self.assertFalse(self.readiness.ready())
+        self.assertAlmostEqual(self.readiness.last_write, self.clock.now, delta=1)
+
+    def test_new_subdirectory_is_watched(self):
+        """Test writes in a project directory created later are seen"""
+        os.mkdir(os.path.join(self.root, 'project'))
+        self.readiness.poll()
+        self.clock.now += 10
+        self.write('project', 'session.jsonl')
+        self.assertFalse(self.readiness.ready())
+
+    def test_missing_directory(self):
+        """Test a missing transcript directory raises FileNotFoundError"""
+        with self.assertRaises(FileNotFoundError):
+            TranscriptReadiness(os.path.join(self.root, 'missing'))
+
+
+class TestReadinessDetector(unittest.TestCase):
+    """Test combining readiness parts"""
+
+    def test_all_parts_must_agree(self):
+        """Test the detector is ready only when every part is"""
+        class Part:
+            def __init__(self, answer):
+                self.answer = answer
+                self.calls = 0
+
+            def ready(self):
+                self.calls += 1
+                return self.answer
+
+        yes, no = Part(True), Part(False)
+        self.assertFalse(ReadinessDetector([no, yes]).ready())
+        self.assertEqual(yes.calls, 1)
+        self.assertTrue(ReadinessDetector([yes]).ready())
+        self.assertTrue(ReadinessDetector().ready())
+
+    def test_missing_transcript_dir_is_skipped(self):
+        """Test create_readiness leaves out parts that cannot run"""
+        detector = create_readiness('both', FakeWatcher({}), transcript_dir='/nonexistent/dir')
+        self.assertEqual([part.name for part in detector.parts], ['cpu'])
+        self.assertEqual(create_readiness('off', FakeWatcher({})).parts, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Unit tests for the terminal status renderer
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import io
+import unittest
+
+from clicker.renderer import (CLEAR_SCREEN, SPINNER_CHARS, StatusRenderer,
+                      banner_lines, progress_bar)
+
+
+class FakeTerminal(io.StringIO):
+    """StringIO that claims to be a terminal and counts flushes"""
+
+    def __init__(self, tty=True):
+        super().__init__()
+        self.tty = tty
+        self.flushes = 0
+
+    def isatty(self):
+        return self.tty
+
+    def flush(self):
+        self.flushes += 1
+
+
+class TestProgressBar(unittest.TestCase):
+    """Test progress bar cells"""
+
+    def test_bounds(self):
+        """Test empty, half, full and clamped bars"""
+        self.assertEqual(progress_bar(0.0), "░" * 20)
+        self.assertEqual(progress_bar(0.5), "█" * 10 + "░" * 10)
+        self.assertEqual(progress_bar(1.0), "█" * 20)
+        self.assertEqual(progress_bar(1.5), "█" * 20)
+
+
+class TestStatusRenderer(unittest.TestCase):
+    """Test diff-based status line output"""
+
+    def setUp(self):
+        self.term = FakeTerminal()
+        self.renderer = StatusRenderer(self.term)
+
+    def test_banner_uses_ansi_clear(self):
+        """Test the banner clears the screen with an escape sequence"""
+        lines = banner_lines(20, 1920, 1080, 1520, 980, 'clicker.log')
+        self.renderer.banner(lines)
+        output = self.term.getvalue()
+        self.assertTrue(output.startswith(CLEAR_SCREEN))
+        self.assertIn("Target: (1520, 980) | Log: clicker.log", output)
+
+    def test_one_write_per_frame(self):
+        """Test a frame is a single write and flush"""
+        self.renderer.waiting(5.0, 20, True)
+        self.assertEqual(self.renderer.writes, 1)
+        self.assertEqual(self.term.flushes, 1)
+
+    def test_unchanged_frame_writes_nothing(self):
+        """Test identical frames produce no output"""
+        self.renderer.frame(label="Waiting...", idle="Idle: 1.0/20s")
+        size = len(self.term.getvalue())
+        self.renderer.frame(label="Waiting...", idle="Idle: 1.0/20s")
+        self.assertEqual(len(self.term.getvalue()), size)
+        self.assertEqual(self.renderer.writes, 1)
+
+    def test_only_changed_fields_written(self):
+        """Test a changed field is written at its own column"""
+        self.renderer.waiting(5.0, 20, True)
+        self.term.seek(0)
+        self.term.truncate()
+        self.renderer.spinner_index = 5
+        self.renderer.waiting(5.0, 20, True)
+        output = self.term.getvalue()
+        # Only the spinner changed
+        self.assertEqual(output, "\033[1G" + SPINNER_CHARS[5] + " ")
+        self.assertNotIn("Claude", output)
+
+    def test_field_columns_are_fixed(self):
+        """Test fields are padded so later fields never shift"""
+        self.renderer.frame(icon="✓", label="CLICKED!")
+        self.assertIn("\033[3GCLICKED!    ", self.term.getvalue())
+
+    def test_message_forces_full_redraw(self):
+        """Test a free-form message invalidates the field cache"""
+        self.renderer.waiting(5.0, 20, True)
+        self.renderer.message("⚠ Fail-safe")
+        self.term.seek(0)
+        self.term.truncate()
+        self.renderer.spinner_index = 1
+        self.renderer.waiting(5.0, 20, True)
+        self.assertIn("Claude: running", self.term.getvalue())
+
+    def test_headless_writes_nothing(self):
+        """Test nothing is written when stdout is not a terminal"""
+        term = FakeTerminal(tty=False)
+        renderer = StatusRenderer(term)
+        self.assertFalse(renderer.enabled)
+        renderer.banner(banner_lines(20, 1920, 1080, 1520, 980, 'clicker.log'))
+        renderer.waiting(5.0, 20, True)
+        renderer.clicked(20.0)
+        renderer.message("⚠ Fail-safe")
+        renderer.line("Stopped")
+        self.assertEqual(term.getvalue(), "")
+        self.assertEqual(term.flushes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
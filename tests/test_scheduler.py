@@ -0,0 +1,228 @@
+"""
+Unit tests for the deadline-driven idle scheduler
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import threading
+import time
+import unittest
+
+from clicker.scheduler import ActivityTracker, IdleScheduler, Target, TargetScheduler
+
+
+class FakeClock:
+    """Monotonic clock that only moves when sleep() is called"""
+
+    def __init__(self, start=1000.0):
+        self.now = start
+        self.sleeps = []
+        self.on_sleep = None
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        if self.on_sleep:
+            self.on_sleep(self)
+        self.now += seconds
+
+
+class TestActivityTracker(unittest.TestCase):
+    """Test activity timestamps"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tracker = ActivityTracker(clock=self.clock)
+
+    def test_touch_records_time(self):
+        """Test touch stores the current clock value"""
+        self.clock.now += 5
+        self.tracker.touch()
+        self.assertEqual(self.tracker.last_activity, self.clock.now)
+
+    def test_listener_signatures(self):
+        """Test pynput callback signatures are accepted"""
+        self.clock.now += 1
+        self.tracker.on_move(1, 2)
+        self.tracker.on_click(1, 2, 'left', True)
+        self.tracker.on_scroll(1, 2, 0, 1)
+        self.tracker.on_press('a')
+        self.assertEqual(self.tracker.idle_time(), 0)
+
+    def test_suppress_ignores_activity(self):
+        """Test activity inside suppress() is ignored"""
+        self.clock.now += 5
+        with self.tracker.suppress():
+            self.tracker.on_move(1, 1)
+        self.assertEqual(self.tracker.idle_time(), 5)
+        self.assertFalse(self.tracker.suppressed)
+
+    def test_reset_ignores_suppression(self):
+        """Test reset always records activity"""
+        self.clock.now += 5
+        with self.tracker.suppress():
+            self.tracker.reset()
+        self.assertEqual(self.tracker.idle_time(), 0)
+
+
+class TestIdleScheduler(unittest.TestCase):
+    """Test deadline computation and sleeping"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tracker = ActivityTracker(clock=self.clock)
+        self.scheduler = IdleScheduler(self.tracker, 20, sleep=self.clock.sleep)
+
+    def test_single_sleep_until_deadline(self):
+        """Test an idle user costs exactly one wakeup"""
+        idle = self.scheduler.wait_until_idle()
+        self.assertEqual(idle, 20)
+        self.assertEqual(self.clock.sleeps, [20])
+
+    def test_activity_pushes_deadline(self):
+        """Test activity during the sleep moves the deadline forward"""
+        def user_moves(clock):
+            # The user moves the mouse 15s into the first sleep
+            if len(clock.sleeps) == 1:
+                self.tracker.last_activity = clock.now + 15
+        self.clock.on_sleep = user_moves
+        start = self.clock.now
+        self.scheduler.wait_until_idle()
+        self.assertEqual(self.clock.sleeps, [20, 15])
+        self.assertEqual(self.clock.now, start + 35)
+
+    def test_max_wait_returns_none(self):
+        """Test max_wait bounds the sleep for status refreshes"""
+        self.assertIsNone(self.scheduler.wait_until_idle(max_wait=1))
+        self.assertEqual(self.clock.sleeps, [1])
+
+    def test_already_idle_returns_immediately(self):
+        """Test no sleep happens once the deadline is in the past"""
+        self.clock.now += 25
+        self.assertEqual(self.scheduler.wait_until_idle(), 25)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_defer(self):
+        """Test defer postpones the next firing"""
+        self.clock.now += 25
+        self.scheduler.defer(10)
+        self.assertEqual(self.scheduler.wait_until_idle(), 35)
+        self.assertIsNone(self.scheduler.not_before)
+
+    def test_set_timeout(self):
+        """Test the timeout can be changed live"""
+        self.scheduler.set_timeout(5)
+        self.assertEqual(self.scheduler.wait_until_idle(), 5)
+
+    def test_stop(self):
+        """Test a stopped scheduler returns None"""
+        self.scheduler.stop()
+        self.assertIsNone(self.scheduler.wait_until_idle())
+
+    def test_real_clock_stop_wakes_sleeper(self):
+        """Test stop() interrupts a condition-variable sleep"""
+        scheduler = IdleScheduler(ActivityTracker(), 60)
+        result = []
+        thread = threading.Thread(target=lambda: result.append(scheduler.wait_until_idle()))
+        thread.start()
+        time.sleep(0.05)
+        scheduler.stop()
+        thread.join(timeout=2)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result, [None])
+
+    def test_uses_monotonic_clock(self):
+        """Test the default clock is immune to wall-clock jumps"""
+        self.assertIs(ActivityTracker().clock, time.monotonic)
+
+    def test_pause_and_resume(self):
+        """Test a paused scheduler never fires and resumes with the old deadline"""
+        self.scheduler.pause()
+        self.assertIsNone(self.scheduler.wait_until_idle(max_wait=100))
+        self.assertEqual(self.clock.sleeps, [100])
+        self.scheduler.resume()
+        self.assertEqual(self.scheduler.wait_until_idle(), 100)
+
+    def test_interrupt_returns_once(self):
+        """Test interrupt() makes exactly one wait return None"""
+        self.scheduler.interrupt()
+        self.assertIsNone(self.scheduler.wait_until_idle())
+        self.assertEqual(self.scheduler.wait_until_idle(), 20)
+
+    def test_real_clock_interrupt_wakes_paused_sleeper(self):
+        """Test interrupt() wakes a paused scheduler sleeping without a timeout"""
+        scheduler = IdleScheduler(ActivityTracker(), 60)
+        scheduler.pause()
+        result = []
+        thread = threading.Thread(target=lambda: result.append(scheduler.wait_until_idle()))
+        thread.start()
+        time.sleep(0.05)
+        scheduler.interrupt()
+        thread.join(timeout=2)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result, [None])
+
+
+class TestTargetScheduler(unittest.TestCase):
+    """Test the heap-ordered schedule of several targets"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tracker = ActivityTracker(clock=self.clock)
+        self.fast = Target('fast', idle_timeout=5)
+        self.slow = Target('slow', idle_timeout=20)
+        self.scheduler = TargetScheduler(self.tracker, [self.slow, self.fast],
+                                         sleep=self.clock.sleep)
+
+    def test_fires_earliest_target(self):
+        """Test the target with the shortest timeout fires first"""
+        self.assertEqual(self.scheduler.wait_until_idle(), 5)
+        self.assertIs(self.scheduler.current, self.fast)
+        self.assertEqual(self.scheduler.idle_timeout, 5)
+
+    def test_peek_only_looks(self):
+        """Test peek() leaves idle_timeout alone and deadline() follows the next target"""
+        self.assertEqual(self.scheduler.peek(), (self.fast, 1005))
+        self.assertEqual(self.scheduler.idle_timeout, 20)
+        self.assertEqual(self.scheduler.deadline(), 1005)
+        self.assertEqual(self.scheduler.idle_timeout, 5)
+
+    def test_rearm_lets_next_target_fire(self):
+        """Test a clicked target waits its timeout while others keep counting"""
+        self.scheduler.wait_until_idle()
+        self.scheduler.rearm(self.fast)
+        self.assertEqual(self.scheduler.deadline(), 1010)
+        self.scheduler.defer(30, self.fast)
+        self.assertEqual(self.scheduler.wait_until_idle(), 20)
+        self.assertIs(self.scheduler.current, self.slow)
+
+    def test_activity_rekeys_lazily(self):
+        """Test user activity pushes every target back"""
+        self.clock.now += 3
+        self.tracker.touch()
+        self.assertEqual(self.scheduler.deadline(), 1008)
+        self.assertEqual(self.scheduler.wait_until_idle(), 5)
+        self.assertEqual(self.clock.now, 1008)
+
+    def test_defer_current_target(self):
+        """Test defer() applies to the target that just fired"""
+        self.scheduler.wait_until_idle()
+        self.scheduler.defer(100)
+        self.scheduler.wait_until_idle()
+        self.assertIs(self.scheduler.current, self.slow)
+
+    def test_set_timeout_for_one_target(self):
+        """Test changing one target's timeout reorders the heap"""
+        self.scheduler.set_timeout(2, self.slow)
+        self.scheduler.wait_until_idle()
+        self.assertIs(self.scheduler.current, self.slow)
+
+    def test_requires_targets(self):
+        """Test an empty target list is rejected"""
+        with self.assertRaises(ValueError):
+            TargetScheduler(self.tracker, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Unit tests for the simulation harness and the loop timing it exercises
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from clicker.input_backend import ClickTimings
+from clicker.sim import (DAY, Simulation, TraceEvent, VirtualClock, check_invariants,
+                         expected_fires, load_trace, main, parse_trace, save_trace,
+                         synthetic_day)
+
+TIMINGS = ClickTimings(0.3, 0.5, 0.2)
+
+
+def simulate(trace, duration, idle_timeout=20, **kwargs):
+    return Simulation(trace, idle_timeout=idle_timeout, timings=TIMINGS, **kwargs).run(duration)
+
+
+class TestTrace(unittest.TestCase):
+    """Test the trace file format"""
+
+    def test_parse(self):
+        """Test comments and blank lines are skipped and events are sorted"""
+        trace = parse_trace(['# header', '', '30 key', '0 claude-start  # at startup'])
+        self.assertEqual(trace, [TraceEvent(0, 'claude-start'), TraceEvent(30, 'key')])
+
+    def test_invalid(self):
+        """Test unknown kinds and malformed lines name the line"""
+        for line in ('10 dance', 'ten key', '10'):
+            with self.assertRaisesRegex(ValueError, 'line 1'):
+                parse_trace([line])
+
+    def test_round_trip(self):
+        """Test a saved trace loads back unchanged"""
+        trace = synthetic_day(seed=3)[:50]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'day.trace')
+            save_trace(path, trace)
+            self.assertEqual(load_trace(path), trace)
+
+    def test_synthetic_day_is_reproducible(self):
+        """Test the same seed gives the same day"""
+        self.assertEqual(synthetic_day(seed=7), synthetic_day(seed=7))
+        self.assertNotEqual(synthetic_day(seed=7), synthetic_day(seed=8))
+
+
+class TestVirtualClock(unittest.TestCase):
+    """Test the clock never moves backwards"""
+
+    def test_advance(self):
+        """Test advance_to() ignores earlier times"""
+        clock = VirtualClock()
+        clock.advance_to(5)
+        clock.advance_to(3)
+        self.assertEqual(clock(), 5)
+
+
+class TestSimulatedLoop(unittest.TestCase):
+    """Test click count, timing and invariants of the real loop"""
+
+    def test_idle_clicks_on_time(self):
+        """Test clicks fire exactly idle_timeout after start and after each click"""
+        result = simulate([TraceEvent(0, 'claude-start')], duration=100)
+        self.assertEqual(result.clicks, 4)
+        for fire, expected in zip(result.fires, (20, 41, 62, 83)):
+            self.assertAlmostEqual(fire, expected)
+
+    def test_activity_moves_the_deadline(self):
+        """Test input during the countdown restarts it"""
+        trace = parse_trace(['0 claude-start', '15 move', '30 key'])
+        result = simulate(trace, duration=55)
+        self.assertEqual(len(result.fires), 1)
+        self.assertAlmostEqual(result.fires[0], 50)
+
+    def test_no_click_without_claude(self):
+        """Test nothing is clicked while Claude is not running"""
+        trace = parse_trace(['0 claude-start', '10 claude-exit', '100 claude-start'])
+        result = simulate(trace, duration=115, rescan=10)
+        self.assertEqual(len(result.fires), 1)
+        # Found again at the first rescan after it started
+        self.assertAlmostEqual(result.fires[0], 100)
+
+    def test_busy_defers_click(self):
+        """Test a busy Claude is retried every ready_retry seconds"""
+        trace = parse_trace(['0 claude-start', '5 claude-busy', '27 claude-waiting'])
+        result = simulate(trace, duration=30, ready_retry=2)
+        self.assertEqual(len(result.fires), 1)
+        self.assertAlmostEqual(result.fires[0], 28)
+
+    def test_indicator_hidden_while_clicking(self):
+        """Test the fake indicator is hidden for the click and shown again"""
+        simulation = Simulation([TraceEvent(0, 'claude-start')], timings=TIMINGS)
+        simulation.run(25)
+        self.assertEqual([call[1] for call in simulation.indicator.calls], ['hide', 'show'])
+        hide, show = simulation.indicator.calls
+        self.assertAlmostEqual(show[0] - hide[0], TIMINGS.total())
+
+    def test_day_matches_reference_model(self):
+        """Test a synthetic day runs in under a second and matches the model"""
+        for seed in range(3):
+            trace = synthetic_day(seed)
+            result = simulate(trace, DAY)
+            self.assertLess(result.elapsed, 1.0)
+            expected = expected_fires(trace, 20, DAY, TIMINGS.total())
+            self.assertGreater(len(expected), 100)
+            self.assertEqual(result.clicks, len(expected))
+            for fire, want in zip(result.fires, expected):
+                self.assertAlmostEqual(fire, want, places=6)
+            self.assertEqual(check_invariants(result.fires, trace, 20), [])
+
+    def test_invariants_catch_violations(self):
+        """Test early, active and busy clicks are reported"""
+        trace = parse_trace(['0 claude-start', '50 key', '60 claude-busy'])
+        problems = check_invariants([20, 30, 55, 80], trace, 20)
+        self.assertEqual(len(problems), 3)
+        self.assertIn('after the previous one', problems[0])
+        self.assertIn('after activity', problems[1])
+        self.assertIn('busy', problems[2])
+
+
+class TestCommand(unittest.TestCase):
+    """Test `clicker sim run`"""
+
+    def test_run_synthetic_day(self):
+        """Test the command reports the clicks and exits 0"""
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(main(['run', '--seed', '1', '--duration', '36000']), 0)
+        self.assertIn('clicks', out.getvalue())
+
+    def test_missing_trace(self):
+        """Test a missing trace file is reported with exit status 1"""
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(main(['run', '/nonexistent.trace']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Unit tests for the soak test and its leak detection
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import contextlib
+import io
+import itertools
+import json
+import os
+import tempfile
+import unittest
+
+from clicker.soak import (DEFAULT_LIMITS, Soak, SoakBackend, check_limits, main, slope,
+                          soak_trace, trends)
+
+
+def samples(**series):
+    """Samples every 100 clicks with the given values per metric"""
+    length = len(next(iter(series.values())))
+    rows = []
+    for i in range(length):
+        row = {name: 0 for name in DEFAULT_LIMITS}
+        row.update({name: values[i] for name, values in series.items()})
+        row['clicks'] = i * 100
+        rows.append(row)
+    return rows
+
+
+class TestTrend(unittest.TestCase):
+    """Test slopes and limits"""
+
+    def test_slope(self):
+        """Test the least-squares slope of a noisy line and of too few points"""
+        self.assertAlmostEqual(slope([0, 1, 2, 3], [1, 3, 5, 7]), 2.0)
+        self.assertAlmostEqual(slope([0, 1, 2, 3], [0, 2, 0, 2]), 0.4)
+        self.assertEqual(slope([1], [5]), 0.0)
+
+    def test_warmup_ignored(self):
+        """Test growth during the warm-up does not count"""
+        rows = samples(fds=[3, 6, 8, 8, 8, 8, 8, 8, 8, 8])
+        self.assertAlmostEqual(trends(rows, warmup=0.2)['fds'], 0.0)
+        self.assertGreater(trends(rows, warmup=0)['fds'], 0.5)
+
+    def test_spikes_ignored(self):
+        """Test a value that comes back down is no trend"""
+        rows = samples(zombies=[0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 1])
+        self.assertEqual(trends(rows, warmup=0)['zombies'], 0.0)
+        rows = samples(zombies=[0, 0, 0, 1, 1, 1, 1, 2, 2, 2])
+        self.assertGreater(trends(rows, warmup=0)['zombies'], 0.5)
+
+    def test_limits(self):
+        """Test only metrics over their limit are reported, per 1000 clicks"""
+        rows = samples(fds=list(range(10)), threads=[2] * 10)
+        problems = check_limits(trends(rows, warmup=0), DEFAULT_LIMITS)
+        self.assertEqual(len(problems), 1)
+        self.assertIn('fds grows +10.00 per 1000 clicks', problems[0])
+
+
+class TestTrace(unittest.TestCase):
+    """Test the generated trace"""
+
+    def test_sorted_and_reproducible(self):
+        """Test event times never go backwards and the seed fixes the trace"""
+        events = list(itertools.islice(soak_trace(seed=4), 2000))
+        times = [event.time for event in events]
+        self.assertEqual(times, sorted(times))
+        self.assertEqual(events, list(itertools.islice(soak_trace(seed=4), 2000)))
+        kinds = {event.kind for event in events}
+        self.assertTrue({'claude-busy', 'claude-exit', 'move'} <= kinds)
+
+
+class LeakyBackend(SoakBackend):
+    """Leaks a file descriptor and a kilobyte on every click"""
+
+    def __init__(self):
+        super().__init__()
+        self.fds = []
+        self.hoard = []
+
+    def click(self):
+        super().click()
+        self.fds.append(os.open(os.devnull, os.O_RDONLY))
+        self.hoard.append(bytearray(1024))
+
+    def release(self):
+        for fd in self.fds:
+            os.close(fd)
+
+
+class TestSoak(unittest.TestCase):
+    """Test a short soak over the real loop"""
+
+    def test_clean_run(self):
+        """Test the loop, indicator respawns and fail-safes leak nothing"""
+        # RSS still settles this early; it is only judged on long runs
+        result = Soak(cycles=300, sample_every=25, crash_every=10, fail_safe_every=20,
+                      limits={'rss_kib': float('inf')}).run()
+        self.assertTrue(result.ok, result.problems)
+        counters = result.counters
+        self.assertEqual(counters['clicks'], 300)
+        self.assertGreater(counters['ticks'], 300 * 20)
+        self.assertGreater(counters['indicator_restarts'], 10)
+        self.assertGreater(counters['fail_safes'], 10)
+        self.assertEqual(len(result.samples), 14)
+        self.assertEqual(result.samples[-1]['zombies'], 0)
+        self.assertLessEqual(result.samples[-1]['children'], 1)
+
+    def test_leak_detected(self):
+        """Test a descriptor and memory leak per click fails the run"""
+        backend = LeakyBackend()
+        try:
+            result = Soak(cycles=200, sample_every=20, indicator=False, backend=backend).run()
+        finally:
+            backend.release()
+        self.assertFalse(result.ok)
+        failed = {problem.split()[0] for problem in result.problems}
+        self.assertEqual(failed & {'fds', 'python_kib'}, {'fds', 'python_kib'})
+        self.assertTrue(any('test_soak.py' in allocation['where']
+                            for allocation in result.allocations))
+
+    def test_report(self):
+        """Test `clicker soak --report` writes the trend report"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'soak.json')
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                status = main(['--cycles', '100', '--sample-every', '50', '--no-indicator',
+                               '--report', path])
+            with open(path) as f:
+                report = json.load(f)
+        self.assertEqual(status, 0)
+        self.assertIn('100 clicks', out.getvalue())
+        self.assertTrue(report['ok'])
+        self.assertEqual(set(report['slopes_per_1000_clicks']), set(DEFAULT_LIMITS))
+        self.assertEqual([s['clicks'] for s in report['samples']], [0, 50, 100, 100])
+
+    def test_bad_limit(self):
+        """Test an unknown metric in --limit is a usage error"""
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(['--limit', 'handles=1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+"""
+Unit tests for the display topology and monitor-relative targets
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import shutil
+import unittest
+
+import pytest
+
+from clicker import ActivityTracker, Clicker, Config, IdleScheduler
+from clicker.config import parse_args
+from clicker.engine import parse_target
+from clicker.input_backend import ClickTimings, RecordingBackend
+from clicker.renderer import StatusRenderer
+from clicker.topology import (Monitor, StaticTopology, Topology, create_topology,
+                              format_position, parse_position)
+from tests.conftest import FakeIdleSource, FakeIndicator, FakeReadiness, FakeWatcher, XvfbMixin
+
+LAPTOP = Monitor('eDP-1', 0, 0, 1920, 1080, primary=True)
+EXTERNAL = Monitor('HDMI-1', 1920, 0, 2560, 1440)
+
+
+class FakeTopology(Topology):
+    """Topology whose layout the test changes"""
+
+    def __init__(self, monitors):
+        super().__init__()
+        self.set(monitors)
+        self.changed = False
+        self.polls = 0
+
+    def set(self, monitors):
+        self.monitors = list(monitors)
+        self.size = (max(m.x + m.width for m in monitors),
+                     max(m.y + m.height for m in monitors))
+        self.changed = True
+
+    def poll(self):
+        self.polls += 1
+        changed, self.changed = self.changed, False
+        return changed
+
+
+class TestParsePosition(unittest.TestCase):
+    """Test the [MONITOR:]X,Y and corner syntax"""
+
+    def test_forms(self):
+        """Test plain, monitor and corner positions"""
+        self.assertEqual(parse_position('-400,-100'), (None, None, (-400, -100)))
+        self.assertEqual(parse_position('HDMI-1:200,150'), ('HDMI-1', None, (200, 150)))
+        self.assertEqual(parse_position('primary:bottom-right,400,100'),
+                         ('primary', 'bottom-right', (400, 100)))
+        self.assertEqual(parse_position('center'), (None, 'center', (0, 0)))
+
+    def test_round_trip(self):
+        """Test format_position() is the inverse"""
+        for text in ('-400,-100', 'DP-2:10,20', 'top-right,5,5'):
+            self.assertEqual(format_position(*parse_position(text)), text)
+
+    def test_invalid(self):
+        """Test malformed positions raise ValueError"""
+        for text in ('', 'x,y', '1,2,3', 'HDMI-1:', 'left,1,2'):
+            with self.assertRaises(ValueError):
+                parse_position(text)
+
+    def test_command_line(self):
+        """Test --target is parsed into the config"""
+        config = parse_args(['--target', 'HDMI-1:bottom-left,10,20'])
+        self.assertEqual(config.target, ('HDMI-1', 'bottom-left', (10, 20)))
+        self.assertEqual(parse_args([]).target, (None, None, (-400, -100)))
+
+
+class TestResolve(unittest.TestCase):
+    """Test positions are resolved against monitors"""
+
+    def setUp(self):
+        self.topology = FakeTopology([LAPTOP, EXTERNAL])
+
+    def test_whole_screen(self):
+        """Test negative values count from the edge of the bounding screen"""
+        self.assertEqual(self.topology.size, (4480, 1440))
+        self.assertEqual(self.topology.resolve((-400, -100)), (4080, 1340))
+
+    def test_monitor_relative(self):
+        """Test positions relative to a named monitor"""
+        self.assertEqual(self.topology.resolve((-400, -100), 'HDMI-1'), (4080, 1340))
+        self.assertEqual(self.topology.resolve((-400, -100), 'eDP-1'), (1520, 980))
+        self.assertEqual(self.topology.resolve((10, 10), 'primary'), (10, 10))
+
+    def test_corners(self):
+        """Test corner offsets point inwards"""
+        resolve = self.topology.resolve
+        self.assertEqual(resolve((400, 100), 'HDMI-1', 'bottom-right'), (4080, 1340))
+        self.assertEqual(resolve((5, 5), 'HDMI-1', 'top-left'), (1925, 5))
+        self.assertEqual(resolve((5, 5), 'eDP-1', 'top-right'), (1915, 5))
+        self.assertEqual(resolve((0, 0), 'HDMI-1', 'center'), (3200, 720))
+
+    def test_missing_monitor_uses_primary(self):
+        """Test an unplugged monitor falls back to the primary one"""
+        with self.assertLogs('clicker.topology', 'WARNING'):
+            self.assertEqual(self.topology.resolve((-400, -100), 'DP-3'), (1520, 980))
+
+    def test_static(self):
+        """Test the fallback topology is one monitor of the backend's size"""
+        topology = create_topology(RecordingBackend(size=(800, 600)))
+        self.assertIsInstance(topology, StaticTopology)
+        self.assertEqual(topology.monitors, [Monitor('screen', 0, 0, 800, 600, True)])
+        self.assertFalse(topology.poll())
+
+
+class TestLayoutChange(unittest.TestCase):
+    """Test the clicker follows docking and undocking"""
+
+    def setUp(self):
+        self.now = 0.0
+        tracker = ActivityTracker(clock=lambda: self.now)
+        self.topology = FakeTopology([LAPTOP, EXTERNAL])
+        self.indicator = FakeIndicator()
+        self.backend = RecordingBackend(clock=lambda: self.now)
+        config = Config(timings=ClickTimings(0, 0, 0), target=parse_position('HDMI-1:-400,-100'))
+        self.clicker = Clicker(config, tracker=tracker,
+                               scheduler=IdleScheduler(tracker, 20, sleep=self.sleep),
+                               watcher=FakeWatcher(), backend=self.backend,
+                               idle_source=FakeIdleSource(), indicator=self.indicator,
+                               renderer=StatusRenderer(enabled=False),
+                               readiness=FakeReadiness(), topology=self.topology)
+        self.clicker.setup()
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def test_target_follows_monitor(self):
+        """Test undocking moves the target and indicator without a restart"""
+        self.assertEqual(self.clicker.target, (4080, 1340))
+        self.topology.set([LAPTOP])
+        with self.assertLogs('clicker', 'INFO'):
+            self.clicker.step()
+        self.assertEqual(self.clicker.target, (1520, 980))
+        self.assertEqual(self.indicator.moves, [(1520, 980)])
+        self.assertIn(('move', 1520, 980), self.backend.actions())
+        self.assertEqual(self.clicker.screen, (1920, 1080))
+
+    def test_no_change_is_free(self):
+        """Test an unchanged layout neither re-resolves nor moves anything"""
+        self.topology.poll()
+        self.clicker.step()
+        self.clicker.step()
+        self.assertEqual(self.indicator.moves, [])
+        self.assertEqual(self.topology.polls, 3)
+
+    def test_retarget_survives_layout_change(self):
+        """Test an explicit retarget is not undone by the next change"""
+        self.clicker.do_retarget(100, 200)
+        self.topology.set([LAPTOP, EXTERNAL])
+        self.clicker.check_layout()
+        self.assertEqual(self.clicker.target, (100, 200))
+
+    def test_status_lists_monitors(self):
+        """Test status() names the connected monitors"""
+        self.assertEqual(self.clicker.status()['monitors'], ['eDP-1', 'HDMI-1'])
+
+
+class TestTargetsFile(unittest.TestCase):
+    """Test monitor-relative positions in the targets file"""
+
+    def test_position_string(self):
+        """Test a position string carries monitor and corner"""
+        target = parse_target({'position': 'HDMI-1:bottom-right,400,100'}, 1, Config())
+        self.assertEqual((target.monitor, target.corner, target.position),
+                         ('HDMI-1', 'bottom-right', (400, 100)))
+
+    def test_monitor_key(self):
+        """Test a list position can name its monitor separately"""
+        target = parse_target({'position': [10, 20], 'monitor': 'eDP-1'}, 1, Config())
+        self.assertEqual((target.monitor, target.corner), ('eDP-1', None))
+        with self.assertRaises(ValueError):
+            parse_target({'position': 'HDMI-1:here'}, 1, Config())
+
+
+@pytest.mark.integration
+@unittest.skipUnless(shutil.which('Xvfb'), 'Xvfb not installed')
+class TestRandRTopology(XvfbMixin, unittest.TestCase):
+    """Test the RandR topology against a local Xvfb display"""
+
+    DISPLAY = ':95'
+
+    def test_monitors_and_quiet_poll(self):
+        """Test the layout is read once and poll() is quiet without changes"""
+        from clicker.topology import RandRTopology
+        topology = RandRTopology(self.DISPLAY)
+        try:
+            self.assertEqual(topology.size, (800, 600))
+            self.assertTrue(topology.monitors)
+            self.assertFalse(topology.poll())
+        finally:
+            topology.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
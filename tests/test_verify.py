@@ -0,0 +1,275 @@
+"""
+Unit tests for click verification with region hashes
+
+© 2026 Sergii Sliusar <powerjet777@gmail.com>
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from clicker import ActivityTracker, Clicker, Config, IdleScheduler
+from clicker.indicator import Indicator
+from clicker.input_backend import ClickTimings, RecordingBackend
+from clicker.renderer import StatusRenderer
+from clicker.topology import StaticTopology
+from tests.conftest import FakeIdleSource, FakeReadiness, FakeWatcher
+
+if np is not None:
+    from clicker.verify import ClickVerifier, dhash, distance
+
+
+def prompt_frame(text_columns=6, seed=0):
+    """Synthetic 80x300 terminal region with `text_columns` words of 'text'"""
+    rng = np.random.default_rng(seed)
+    frame = np.full((80, 300, 3), 20, dtype=np.uint8)
+    for i in range(text_columns):
+        frame[30:50, 20 + i * 40:50 + i * 40] = 200
+    # Sensor-like noise that must not count as a change
+    return np.clip(frame + rng.integers(0, 3, frame.shape), 0, 255).astype(np.uint8)
+
+
+class FakeScreen:
+    """Returns the queued frames, repeating the last one"""
+
+    def __init__(self, *frames):
+        self.frames = list(frames)
+        self.regions = []
+
+    def grab(self, region):
+        self.regions.append(region)
+        return self.frames.pop(0) if len(self.frames) > 1 else self.frames[0]
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class TestHash(unittest.TestCase):
+    """Test the difference hash"""
+
+    def test_noise_and_change(self):
+        """Test noise keeps the hash and new text changes it"""
+        a = dhash(prompt_frame(seed=1))
+        self.assertEqual(a.shape, (2, 16, 16))
+        self.assertLessEqual(distance(a, dhash(prompt_frame(seed=2))), 3)
+        self.assertGreater(distance(a, dhash(prompt_frame(text_columns=2))), 3)
+
+    def test_brightness_shift_ignored(self):
+        """Test a uniformly brighter region hashes the same"""
+        frame = prompt_frame()
+        self.assertEqual(distance(dhash(frame), dhash(frame // 2 + 40)), 0)
+
+    def test_too_small(self):
+        """Test regions smaller than the hash are rejected"""
+        with self.assertRaises(ValueError):
+            dhash(np.zeros((8, 8)))
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class TestVerifier(unittest.TestCase):
+    """Test outcome bookkeeping and backoff"""
+
+    def setUp(self):
+        self.verifier = ClickVerifier(max_backoff=300)
+
+    def test_backoff_doubles(self):
+        """Test every ineffective click doubles the wait up to the maximum"""
+        same = dhash(prompt_frame())
+        self.assertIsNone(self.verifier.backoff(20))
+        delays = []
+        for _ in range(5):
+            self.assertFalse(self.verifier.check(same, same))
+            delays.append(self.verifier.backoff(20))
+        self.assertEqual(delays, [40, 80, 160, 300, 300])
+        self.assertTrue(self.verifier.check(same, dhash(prompt_frame(text_columns=1))))
+        self.assertIsNone(self.verifier.backoff(20))
+
+    def test_targets_independent(self):
+        """Test failures are counted per target"""
+        same = dhash(prompt_frame())
+        self.verifier.check(same, same, key=1)
+        self.assertIsNone(self.verifier.backoff(20, key=0))
+        self.assertTrue(self.verifier.unchanged(same, key=1))
+        self.assertFalse(self.verifier.unchanged(same, key=0))
+
+    def test_grab_failure_counts_as_effective(self):
+        """Test a click is not penalized when the screen cannot be grabbed"""
+        def broken(region):
+            raise OSError("no display")
+        verifier = ClickVerifier(grab=broken)
+        self.assertIsNone(verifier.capture((100, 100)))
+        self.assertTrue(verifier.check(None, None))
+
+
+class FakeJournal:
+    def __init__(self):
+        self.events = []
+
+    def append(self, event, idle, latency, target):
+        self.events.append(event)
+
+    def close(self):
+        pass
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class TestClickerVerification(unittest.TestCase):
+    """Test the loop with synthetic frames around the target"""
+
+    def setUp(self):
+        self.now = 0.0
+        tracker = ActivityTracker(clock=lambda: self.now)
+        self.screen = FakeScreen(prompt_frame())
+        self.backend = RecordingBackend(clock=lambda: self.now)
+        self.journal = FakeJournal()
+        config = Config(timings=ClickTimings(0, 0, 0), indicator=False)
+        self.clicker = Clicker(config, tracker=tracker,
+                               scheduler=IdleScheduler(tracker, 20, sleep=self.sleep),
+                               watcher=FakeWatcher(), backend=self.backend,
+                               idle_source=FakeIdleSource(),
+                               renderer=StatusRenderer(enabled=False),
+                               readiness=FakeReadiness(), journal=self.journal,
+                               topology=StaticTopology((1920, 1080)), sleep=self.sleep,
+                               verifier=ClickVerifier(grab=self.screen.grab))
+        self.clicker.setup()
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def clicks(self):
+        return self.backend.actions().count(('click',))
+
+    def test_effective_click(self):
+        """Test a changed region confirms the click and keeps the normal timeout"""
+        self.screen.frames = [prompt_frame(), prompt_frame(text_columns=1)]
+        self.clicker.step()
+        self.assertEqual(self.clicks(), 1)
+        self.assertEqual(self.journal.events[-1], 'click')
+        self.assertEqual(self.screen.regions[0], (1370, 940, 300, 80))
+        self.assertAlmostEqual(self.clicker.next_deadline() - self.now, 20)
+
+    def test_ineffective_backs_off_then_skips(self):
+        """Test an unchanged region backs off and later attempts are skipped"""
+        with self.assertLogs('clicker', 'WARNING'):
+            self.clicker.step()
+        self.assertEqual(self.journal.events[-2:], ['click', 'ineffective'])
+        self.assertAlmostEqual(self.clicker.next_deadline() - self.now, 40)
+        self.clicker.step()
+        self.assertEqual(self.clicks(), 1)
+        self.assertEqual(self.journal.events[-1], 'skipped')
+        self.assertAlmostEqual(self.clicker.next_deadline() - self.now, 80)
+
+    def test_change_after_failure_clicks_again(self):
+        """Test the next attempt clicks once the region changed by itself"""
+        with self.assertLogs('clicker', 'WARNING'):
+            self.clicker.step()
+        self.screen.frames = [prompt_frame(text_columns=3)]
+        with self.assertLogs('clicker', 'WARNING'):
+            self.clicker.step()
+        self.assertEqual(self.clicks(), 2)
+
+
+OVERLAY_INDICATOR = '''
+import sys
+print('ready', flush=True)
+for line in sys.stdin:
+    command = line.strip()
+    if command in ('hide', 'show'):
+        with open(sys.argv[0] + '.state', 'w') as state:
+            state.write(command)
+    elif command == 'sync':
+        print('synced', flush=True)
+    elif command == 'quit':
+        break
+'''
+
+
+class OverlayScreen(FakeScreen):
+    """Draws the indicator into the frames unless its process has hidden it"""
+
+    def __init__(self, state, box, *frames):
+        super().__init__(*frames)
+        self.state = state
+        self.box = box
+        self.visible = []
+
+    def grab(self, region):
+        frame = super().grab(region).copy()
+        try:
+            with open(self.state) as f:
+                visible = f.read() != 'hide'
+        except FileNotFoundError:
+            visible = True
+        self.visible.append(visible)
+        if visible:
+            draw_overlay(frame, region, self.box)
+        return frame
+
+
+def draw_overlay(frame, region, box):
+    """Paint the indicator rectangle `box` into a grab of `region`"""
+    left, top = box[0] - region[0], box[1] - region[1]
+    frame[max(top, 0):top + box[3], max(left, 0):left + box[2]] = 255
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class TestVerificationWithIndicator(unittest.TestCase):
+    """Test the hashes are not fooled by the indicator drawn over the target"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        script = os.path.join(self.tmpdir, 'indicator.py')
+        with open(script, 'w') as f:
+            f.write(OVERLAY_INDICATOR)
+        self.indicator = Indicator(1520, 980, script)
+        self.screen = OverlayScreen(script + '.state', self.indicator.box(), prompt_frame())
+        self.now = 0.0
+        tracker = ActivityTracker(clock=lambda: self.now)
+        self.backend = RecordingBackend(clock=lambda: self.now)
+        self.journal = FakeJournal()
+        self.clicker = Clicker(Config(timings=ClickTimings(0, 0, 0)), tracker=tracker,
+                               scheduler=IdleScheduler(tracker, 20, sleep=self.sleep),
+                               watcher=FakeWatcher(), backend=self.backend,
+                               idle_source=FakeIdleSource(), indicator=self.indicator,
+                               renderer=StatusRenderer(enabled=False),
+                               readiness=FakeReadiness(), journal=self.journal,
+                               topology=StaticTopology((1920, 1080)), sleep=self.sleep,
+                               verifier=ClickVerifier(grab=self.screen.grab))
+        self.clicker.setup()
+
+    def tearDown(self):
+        self.indicator.close()
+        shutil.rmtree(self.tmpdir)
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def test_grabs_wait_for_hide(self):
+        """Test both grabs happen after the indicator process hid the window"""
+        with self.assertLogs('clicker', 'WARNING'):
+            while 'ineffective' not in self.journal.events and self.now < 60:
+                self.clicker.step()
+        self.assertEqual(self.screen.visible, [False, False])
+        self.assertEqual(self.journal.events[-2:], ['click', 'ineffective'])
+
+    def test_overlay_left_out_of_hash(self):
+        """Test an overlay still drawn in one grab does not count as a change"""
+        verifier = self.clicker.verifier
+        point = (1520, 980)
+        region = verifier.region(point)
+        covered = prompt_frame()
+        draw_overlay(covered, region, self.indicator.box())
+        screen = FakeScreen(covered, prompt_frame())
+        verifier.grab = screen.grab
+        before = verifier.capture(point, self.indicator.box())
+        after = verifier.capture(point, self.indicator.box())
+        self.assertFalse(verifier.check(before, after))
+        self.assertGreater(distance(dhash(covered), dhash(prompt_frame())), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()